@@ -4,7 +4,6 @@ from django.core.validators import MinLengthValidator, MaxLengthValidator,\
 from django.utils.translation import ugettext as _
 
 from tally_ho.apps.tally.models.result_form import ResultForm
-from tally_ho.apps.tally.models.station import Station
 
 
 disable_copy_input = {
@@ -74,30 +73,28 @@ class BarcodeForm(forms.Form):
                 raise forms.ValidationError(_(u"Barcodes do not match!"))
 
             try:
-                result_form = ResultForm.objects.get(
+                result_form = ResultForm.objects.select_related(
+                    'center', 'station__sub_constituency').get(
                     barcode=barcode or barcode_scan,
                     tally__id=tally_id)
             except ResultForm.DoesNotExist:
                 raise forms.ValidationError(_(u"Barcode does not exist."))
             else:
+                station = result_form.station
+
                 if result_form.center and not result_form.center.active:
                     raise forms.ValidationError(_(u"Center is disabled."))
                 elif result_form.station_number:
-                    try:
-                        station = Station.objects.get(
-                            station_number=result_form.station_number,
-                            center=result_form.center)
-                    except Station.DoesNotExist:
+                    if station is None:
                         raise forms.ValidationError(
                             _(u"Station does not exist."))
-                    else:
-                        if not station.active:
+                    elif not station.active:
+                        raise forms.ValidationError(
+                            _(u"Station disabled."))
+                    elif station.sub_constituency:
+                        ballot = station.sub_constituency.get_ballot()
+                        if ballot and not ballot.active:
                             raise forms.ValidationError(
-                                _(u"Station disabled."))
-                        elif station.sub_constituency:
-                            ballot = station.sub_constituency.get_ballot()
-                            if ballot and not ballot.active:
-                                raise forms.ValidationError(
-                                    _(u"Race disabled."))
+                                _(u"Race disabled."))
 
             return cleaned_data
@@ -3,7 +3,6 @@ from django.conf import settings
 from django.utils.translation import ugettext as _
 
 from tally_ho.apps.tally.models.center import Center
-from tally_ho.apps.tally.models.station import Station
 from tally_ho.libs.validators import MinLengthValidator
 
 
@@ -76,11 +75,11 @@ class CenterDetailsForm(forms.Form):
             try:
                 center = Center.objects.get(code=center_number,
                                             tally__id=tally_id)
-                valid_station_numbers = [
-                    list(d.values())[0] for d in
-                    center.stations.values('station_number')]
+                station = center.stations.select_related(
+                    'sub_constituency').filter(
+                    station_number=station_number).first()
 
-                if not int(station_number) in valid_station_numbers:
+                if station is None:
                     raise forms.ValidationError(_(
                         u"Invalid Station Number for this Center"))
 
@@ -88,9 +87,6 @@ class CenterDetailsForm(forms.Form):
                     raise forms.ValidationError(_(
                         u"Center is disabled"))
 
-                station = Station.objects.get(center=center,
-                                              station_number=station_number)
-
                 if not station.active:
                     raise forms.ValidationError(_(
                         u"Station is disabled"))
@@ -102,8 +98,4 @@ class CenterDetailsForm(forms.Form):
             except Center.DoesNotExist:
                 raise forms.ValidationError(_(u"Center Number does not exist"))
 
-            except Station.DoesNotExist:
-                raise forms.ValidationError(
-                    _(u"Station Number does not exist"))
-
             return cleaned_data
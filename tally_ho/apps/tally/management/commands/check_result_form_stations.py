@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.utils.translation import ugettext_lazy
+
+from tally_ho.apps.tally.models.result_form import ResultForm
+
+
+class Command(BaseCommand):
+    help = ugettext_lazy("Report the result forms whose station is not the "
+                         "station with their station number in their "
+                         "center, and link them to that station.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help=ugettext_lazy("Only report the result forms with the wrong "
+                               "station, do not link them."))
+        parser.add_argument(
+            '--tally',
+            type=int,
+            default=None,
+            help=ugettext_lazy("The id of the tally to check, default all."))
+
+    def handle(self, *args, **kwargs):
+        tally_id = kwargs['tally']
+        result_forms = ResultForm.objects.all()
+
+        if tally_id:
+            result_forms = result_forms.filter(tally__id=tally_id)
+
+        mismatches = result_forms.station_mismatches().order_by('barcode')
+
+        for barcode, station, expected in mismatches.values_list(
+                'barcode', 'station', 'expected_station_id'):
+            self.stdout.write(self.style.NOTICE(
+                'result form %s: station %s, expected %s' % (
+                    barcode, station, expected)))
+
+        num_mismatches = len(mismatches)
+
+        if kwargs['verify']:
+            self.stdout.write('%s result forms with the wrong station'
+                              % num_mismatches)
+        else:
+            result_forms.filter(
+                pk__in=mismatches.values('pk')).link_stations()
+            self.stdout.write('Linked stations, %s result forms had the '
+                              'wrong station' % num_mismatches)
@@ -1,13 +1,31 @@
 from django.core.management.base import BaseCommand
 from django.utils.translation import ugettext_lazy
 
+from tally_ho.apps.tally.models.tally import Tally
 from tally_ho.libs.views.exports import export_candidate_votes
 
 
 class Command(BaseCommand):
     help = ugettext_lazy("Export candidate votes list.")
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help=ugettext_lazy("Rebuild every row instead of only the rows "
+                               "for ballots and forms changed since the "
+                               "last export."))
+
     def handle(self, *args, **kwargs):
-        export_candidate_votes(save_barcodes=True, output_duplicates=True)
-        export_candidate_votes(save_barcodes=False, output_duplicates=False,
-                               show_disabled_candidates=False)
+        incremental = not kwargs['full']
+
+        for tally in Tally.objects.filter(active=True):
+            export_candidate_votes(save_barcodes=True,
+                                   output_duplicates=True,
+                                   tally_id=tally.id,
+                                   incremental=incremental)
+            export_candidate_votes(save_barcodes=False,
+                                   output_duplicates=False,
+                                   show_disabled_candidates=False,
+                                   tally_id=tally.id,
+                                   incremental=incremental)
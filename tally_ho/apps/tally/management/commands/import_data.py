@@ -2,9 +2,15 @@
 
 from functools import reduce
 import csv
+import logging
+import os
 import re
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy
 
 from tally_ho.apps.tally.models.ballot import Ballot
@@ -14,11 +20,14 @@ from tally_ho.apps.tally.models.office import Office
 from tally_ho.apps.tally.models.result_form import ResultForm
 from tally_ho.apps.tally.models.station import Station
 from tally_ho.apps.tally.models.sub_constituency import SubConstituency
+from tally_ho.libs.models.ballot_metadata import invalidate_ballot_metadata
+from tally_ho.libs.models.copy_loader import copy_insert, copy_supported
 from tally_ho.libs.models.enums.center_type import CenterType
 from tally_ho.libs.models.enums.form_state import FormState
 from tally_ho.libs.models.enums.gender import Gender
 from tally_ho.libs.models.enums.race_type import RaceType
 from tally_ho.libs.permissions.groups import create_permission_groups
+from tally_ho.libs.utils.memoize import memoized_property
 
 BALLOT_ORDER_PATH = 'data/ballot_order.csv'
 CANDIDATES_PATH = 'data/candidates.csv'
@@ -26,8 +35,55 @@ CENTERS_PATH = 'data/centers.csv'
 RESULT_FORMS_PATH = 'data/result_forms.csv'
 STATIONS_PATH = 'data/stations.csv'
 SUB_CONSTITUENCIES_PATH = 'data/sub_constituencies.csv'
+UPLOADED_FILES_PATH = 'data/uploaded/'
 
 SPECIAL_VOTING = 'Special Voting'
+BULK_CREATE_BATCH_SIZE = 1000
+BATCH_BLOCK_SIZE = 100
+MAX_BATCH_BLOCK_SIZE = 10000
+BATCH_TARGET_SECONDS = 2.0
+BALLOT_ORDER_CACHE_TIMEOUT = 60 * 60
+
+# the fields that identify an existing row, as in get_or_create
+SUB_CONSTITUENCY_FIELDS = ['code', 'field_office', 'races',
+                           'ballot_component', 'ballot_general',
+                           'ballot_women', 'number_of_ballots']
+STATION_FIELDS = ['center', 'sub_constituency', 'gender', 'registrants',
+                  'station_number']
+CANDIDATE_FIELDS = ['ballot', 'candidate_id', 'full_name', 'order',
+                    'race_type']
+
+# the number of columns the importers read from the rows of each uploaded
+# file, keyed as the tally files form fields
+FILE_COLUMNS = {
+    'subconst_file': 7,
+    'centers_file': 14,
+    'stations_file': 6,
+    'candidates_file': 19,
+    'ballots_order_file': 2,
+    'result_forms_file': 9,
+}
+
+# the staging table columns of the COPY loaders, foreign keys are staged as
+# the codes, numbers and names in the files
+STATION_STAGING_COLUMNS = [
+    ('center_code', 'integer'),
+    ('sub_constituency_code', 'integer'),
+    ('gender', 'integer'),
+    ('registrants', 'integer'),
+    ('station_number', 'integer'),
+]
+RESULT_FORM_STAGING_COLUMNS = [
+    ('barcode', 'text'),
+    ('ballot_number', 'integer'),
+    ('center_code', 'integer'),
+    ('office_name', 'text'),
+    ('gender', 'integer'),
+    ('name', 'text'),
+    ('serial_number', 'integer'),
+    ('station_number', 'integer'),
+    ('is_replacement', 'boolean'),
+]
 
 
 def empty_string_to(value, default):
@@ -64,6 +120,38 @@ def invalid_line(row):
     return len(row) == reduce(lambda x, y: x + 1 if y == '' else 0, row, 0)
 
 
+def to_int(value):
+    return value if value is None else int(value)
+
+
+def natural_key(instance, fields):
+    """Return the values of fields of a model instance as python values, so
+    that parsed and loaded instances compare equal.
+    """
+    values = []
+
+    for name in fields:
+        field = instance._meta.get_field(name)
+        values.append(field.to_python(getattr(instance, field.attname)))
+
+    return tuple(values)
+
+
+def read_ballot_order(ballot_file):
+    """Return a dictionary of candidate id to ballot order."""
+    id_to_ballot_order = {}
+
+    with ballot_file as f:
+        reader = csv.reader(f)
+        next(reader)  # ignore header
+
+        for row in reader:
+            id_, ballot_number = row
+            id_to_ballot_order[id_] = ballot_number
+
+    return id_to_ballot_order
+
+
 def strip_non_numeric(string):
     """Strip non-numerics and safely convert to float.
 
@@ -75,213 +163,536 @@ def strip_non_numeric(string):
         return None
 
 
-def process_sub_constituency_row(tally, row, command=None, logger=None):
-    if invalid_line(row):
-        next
+class BulkImporter(object):
+    """Import rows of the tally data files in bulk.
+
+    The sub constituencies, ballots, offices, centers and result form
+    barcodes of the tally are loaded into dictionaries once, rows are looked
+    up in these and new objects are inserted in batches with `bulk_create`.
+    Rows that match an existing object are skipped, as with `get_or_create`.
+
+    On PostgreSQL new stations and result forms are loaded with COPY instead
+    of `bulk_create` if `use_copy` is true.
+
+    :param tally: The tally to import into.
+    :param command: A command to write warnings to.
+    :param logger: A logger to write warnings to.
+    :param use_copy: Whether to load with COPY when it is supported, defaults
+        to the IMPORT_USE_COPY setting.
+    """
+    def __init__(self, tally=None, command=None, logger=None,
+                 use_copy=None):
+        self.tally = tally
+        self.command = command
+        self.logger = logger
+        self.use_copy = settings.IMPORT_USE_COPY if use_copy is None\
+            else use_copy
+
+    @property
+    def copy(self):
+        return self.use_copy and copy_supported()
+
+    @property
+    def tally_id(self):
+        return self.tally.pk if self.tally else None
+
+    def warn(self, msg):
+        if self.command:
+            self.command.stdout.write(self.command.style.WARNING(msg))
+        if self.logger:
+            self.logger.warning(msg)
+
+    @memoized_property
+    def ballots(self):
+        return {ballot.number: ballot for ballot in
+                Ballot.objects.filter(tally=self.tally)}
+
+    @memoized_property
+    def sub_constituencies(self):
+        sub_constituencies = {}
+
+        for sc in SubConstituency.objects.filter(
+                tally=self.tally).order_by('-id'):
+            sub_constituencies[sc.code] = sc
+
+        return sub_constituencies
+
+    @memoized_property
+    def offices(self):
+        return {office.name: office for office in
+                Office.objects.filter(tally=self.tally)}
+
+    @memoized_property
+    def centers(self):
+        return {center.code: center for center in
+                Center.objects.filter(tally=self.tally)}
+
+    @memoized_property
+    def barcodes(self):
+        return dict(ResultForm.objects.filter(tally=self.tally).values_list(
+            'barcode', 'pk'))
+
+    def get_ballot(self, number):
+        try:
+            return self.ballots[to_int(number)]
+        except KeyError:
+            raise Ballot.DoesNotExist('Ballot "%s" does not exist' % number)
 
-    row = empty_strings_to_none(row)
+    def get_or_create_ballot(self, number, race_type):
+        ballot = self.ballots.get(number)
 
-    try:
-        code_value, field_office, races, ballot_number_general,\
-            ballot_number_women, number_of_ballots,\
-            ballot_number_component = row[:7]
-
-        code_value = int(code_value)
-        number_of_ballots = number_of_ballots and int(
-            number_of_ballots)
-
-        ballot_component = None
-        ballot_general = None
-        ballot_women = None
-
-        if ballot_number_component:
-            component_race_type = get_component_race_type(
-                ballot_number_component,
-                tally=tally)
-
-            ballot_component, _ = Ballot.objects.get_or_create(
-                number=int(ballot_number_component),
-                race_type=component_race_type,
-                tally=tally)
-
-        if ballot_number_general:
-            ballot_general, _ = Ballot.objects.get_or_create(
-                number=int(ballot_number_general),
-                race_type=RaceType.GENERAL,
-                tally=tally)
-
-        if ballot_number_women:
-            ballot_women, _ = Ballot.objects.get_or_create(
-                number=int(ballot_number_women),
-                race_type=RaceType.WOMEN,
-                tally=tally)
-
-        if number_of_ballots == 2 and not (
-                ballot_general and ballot_women):
-            raise Exception(
-                'Missing ballot data: expected 2 ballots, missing '
-                + ('general' if ballot_number_women else 'women'))
-
-        _, created = SubConstituency.objects.get_or_create(
-            code=code_value,
-            field_office=field_office,
-            races=races,
-            ballot_component=ballot_component,
-            ballot_general=ballot_general,
-            ballot_women=ballot_women,
-            number_of_ballots=number_of_ballots,
-            tally=tally)
+        if ballot is None:
+            ballot = self.ballots[number] = Ballot.objects.create(
+                number=number, race_type=race_type, tally=self.tally)
 
-    except ValueError:
-        msg = 'ValueError when parsing row: %s' % row
-        if command:
-            command.stdout.write(command.style.WARNING(msg))
-        if logger:
-            logger.warning(msg)
+        return ballot
+
+    def get_sub_constituency(self, code):
+        try:
+            return self.sub_constituencies[int(code)]
+        except KeyError:
+            raise SubConstituency.DoesNotExist(
+                'SubConstituency "%s" does not exist' % code)
 
+    def get_or_create_office(self, name, number):
+        office = self.offices.get(name)
 
-def import_sub_constituencies_and_ballots(tally=None, subconst_file=None):
-    file_to_parse = subconst_file if subconst_file else open(
-        SUB_CONSTITUENCIES_PATH, 'rU')
-    elements_processed = 0
+        if office is None:
+            office = self.offices[name] = Office.objects.create(
+                number=number, name=name, tally=self.tally)
 
-    with file_to_parse as f:
-        reader = csv.reader(f)
-        next(reader)  # ignore header
+        return office
 
-        for row in reader:
-            process_sub_constituency_row(tally, row)
+    def import_sub_constituencies(self, rows):
+        """Import sub constituency rows and create their ballots.
+
+        :returns: The number of rows processed.
+        """
+        existing = {natural_key(sc, SUB_CONSTITUENCY_FIELDS) for sc in
+                    self.sub_constituencies.values()}
+        new = []
+        elements_processed = 0
+
+        for row in rows:
             elements_processed += 1
 
-    return elements_processed
+            if invalid_line(row):
+                continue
 
+            row = empty_strings_to_none(row)
 
-def process_center_row(tally, row, command=None, logger=None):
-    if not invalid_line(row):
-        sc_code = row[6]
-        sub_constituency = None
+            try:
+                code_value, field_office, races, ballot_number_general,\
+                    ballot_number_women, number_of_ballots,\
+                    ballot_number_component = row[:7]
 
-        if sc_code == SPECIAL_VOTING:
-            center_type = CenterType.SPECIAL
-        else:
-            sc_code = int(row[6])
-            sub_constituency = SubConstituency.objects.get(
-                code=sc_code,
-                tally=tally)
-            center_type = CenterType.GENERAL
+                code_value = int(code_value)
+                number_of_ballots = number_of_ballots and int(
+                    number_of_ballots)
 
-        try:
-            office_number = int(row[3])
-        except ValueError:
-            office_number = None
-
-        office, _ = Office.objects.get_or_create(
-            number=office_number,
-            name=row[4].strip(),
-            tally=tally)
-
-        Center.objects.get_or_create(
-            region=row[1],
-            code=row[2],
-            office=office,
-            sub_constituency=sub_constituency,
-            name=row[8],
-            mahalla=row[9],
-            village=row[10],
-            center_type=center_type,
-            longitude=strip_non_numeric(row[12]),
-            latitude=strip_non_numeric(row[13]),
-            tally=tally)
+                ballot_component = None
+                ballot_general = None
+                ballot_women = None
 
+                if ballot_number_component:
+                    ballot_component = self.get_or_create_ballot(
+                        int(ballot_number_component),
+                        get_component_race_type(ballot_number_component))
 
-def import_centers(tally=None, centers_file=None):
-    file_to_parse = centers_file if centers_file else open(CENTERS_PATH, 'rU')
+                if ballot_number_general:
+                    ballot_general = self.get_or_create_ballot(
+                        int(ballot_number_general), RaceType.GENERAL)
 
-    with file_to_parse as f:
-        reader = csv.reader(f)
-        next(reader)  # ignore header
+                if ballot_number_women:
+                    ballot_women = self.get_or_create_ballot(
+                        int(ballot_number_women), RaceType.WOMEN)
 
-        for row in reader:
-            process_center_row(tally, row)
+                if number_of_ballots == 2 and not (
+                        ballot_general and ballot_women):
+                    raise Exception(
+                        'Missing ballot data: expected 2 ballots, missing '
+                        + ('general' if ballot_number_women else 'women'))
 
+                sc = SubConstituency(
+                    code=code_value,
+                    field_office=field_office,
+                    races=to_int(races),
+                    ballot_component=ballot_component,
+                    ballot_general=ballot_general,
+                    ballot_women=ballot_women,
+                    number_of_ballots=number_of_ballots,
+                    tally=self.tally)
+            except ValueError:
+                self.warn('ValueError when parsing row: %s' % row)
+                continue
 
-def process_station_row(tally, row, command=None, logger=None):
-    center_code, center_name, sc_code, station_number, gender,\
-        registrants = row[0:6]
+            key = natural_key(sc, SUB_CONSTITUENCY_FIELDS)
 
-    try:
-        center = Center.objects.get(code=center_code, tally=tally)
-    except Center.DoesNotExist:
-        center, created = Center.objects.get_or_create(
-            code=center_code,
-            name=center_name,
-            tally=tally)
+            if key not in existing:
+                existing.add(key)
+                new.append(sc)
 
-    try:
-        # attempt to convert SC to a number
-        sc_code = int(float(sc_code))
-        sub_constituency = SubConstituency.objects.get(
-            code=sc_code, tally=tally)
-    except (SubConstituency.DoesNotExist, ValueError):
-        # FIXME What to do if SubConstituency does not exist
-        sub_constituency = None
-        msg = 'SubConstituency "%s" does not exist' % sc_code
-        if command:
-            command.stdout.write(command.style.WARNING(msg))
-        if logger:
-            logger.warning(msg)
-
-    gender = getattr(Gender, gender.upper())
-
-    _, created = Station.objects.get_or_create(
-        tally=tally,
-        center=center,
-        sub_constituency=sub_constituency,
-        gender=gender,
-        registrants=empty_string_to(registrants, None),
-        station_number=station_number)
+        for sc in SubConstituency.objects.bulk_create(
+                new, batch_size=BULK_CREATE_BATCH_SIZE):
+            self.sub_constituencies.setdefault(sc.code, sc)
 
+        invalidate_ballot_metadata(self.tally_id)
 
-def import_stations(command, tally=None, stations_file=None):
-    file_to_parse = stations_file if stations_file else open(
-        STATIONS_PATH, 'rU')
+        return elements_processed
 
-    with file_to_parse as f:
+    def import_centers(self, rows):
+        """Import center rows and create their offices.
+
+        :returns: The number of rows processed.
+        """
+        new = []
+        elements_processed = 0
+
+        for row in rows:
+            elements_processed += 1
+
+            if invalid_line(row):
+                continue
+
+            sc_code = row[6]
+            sub_constituency = None
+
+            if sc_code == SPECIAL_VOTING:
+                center_type = CenterType.SPECIAL
+            else:
+                sub_constituency = self.get_sub_constituency(sc_code)
+                center_type = CenterType.GENERAL
+
+            try:
+                office_number = int(row[3])
+            except ValueError:
+                office_number = None
+
+            office = self.get_or_create_office(row[4].strip(), office_number)
+            code = int(row[2])
+
+            if code in self.centers:
+                continue
+
+            self.centers[code] = center = Center(
+                region=row[1],
+                code=code,
+                office=office,
+                sub_constituency=sub_constituency,
+                name=row[8],
+                mahalla=row[9],
+                village=row[10],
+                center_type=center_type,
+                longitude=strip_non_numeric(row[12]),
+                latitude=strip_non_numeric(row[13]),
+                tally=self.tally)
+            new.append(center)
+
+        Center.objects.bulk_create(new, batch_size=BULK_CREATE_BATCH_SIZE)
+
+        return elements_processed
+
+    def import_stations(self, rows):
+        """Import station rows, creating centers that do not exist, and link
+        the result forms without a station to the new stations.
+
+        :returns: The number of rows processed.
+        """
+        stations = []
+        elements_processed = 0
+
+        for row in rows:
+            elements_processed += 1
+            center_code, center_name, sc_code, station_number, gender,\
+                registrants = row[0:6]
+
+            center = self.centers.get(int(center_code))
+
+            if center is None:
+                center = self.centers[int(center_code)] =\
+                    Center.objects.create(code=center_code,
+                                          name=center_name,
+                                          tally=self.tally)
+
+            try:
+                # attempt to convert SC to a number
+                sc_code = int(float(sc_code))
+                sub_constituency = self.get_sub_constituency(sc_code)
+            except (SubConstituency.DoesNotExist, ValueError):
+                # FIXME What to do if SubConstituency does not exist
+                sub_constituency = None
+                self.warn('SubConstituency "%s" does not exist' % sc_code)
+
+            stations.append(Station(
+                tally=self.tally,
+                center=center,
+                sub_constituency=sub_constituency,
+                gender=getattr(Gender, gender.upper()),
+                registrants=to_int(empty_string_to(registrants, None)),
+                station_number=int(station_number)))
+
+        # only the stations of the centers in these rows can match them
+        existing = {natural_key(station, STATION_FIELDS) for station in
+                    Station.objects.filter(
+                        tally=self.tally,
+                        center__in={station.center_id
+                                    for station in stations})}
+        new = []
+
+        for station in stations:
+            key = natural_key(station, STATION_FIELDS)
+
+            if key not in existing:
+                existing.add(key)
+                new.append(station)
+
+        if self.copy:
+            self.copy_stations(new)
+        else:
+            Station.objects.bulk_create(new,
+                                        batch_size=BULK_CREATE_BATCH_SIZE)
+
+        # bulk inserts do not call Station.save, which links result forms
+        if new:
+            ResultForm.objects.filter(
+                tally=self.tally, center__isnull=False,
+                station__isnull=True).link_stations()
+
+        return elements_processed
+
+    def import_candidates(self, rows, id_to_ballot_order):
+        """Import candidate rows.
+
+        :param id_to_ballot_order: A dictionary of candidate id to ballot
+            order.
+
+        :returns: The number of rows processed.
+        """
+        candidates = []
+        elements_processed = 0
+
+        for row in rows:
+            elements_processed += 1
+            candidate_id = row[0]
+            code = row[7]
+            full_name = row[14]
+            race_code = row[18]
+
+            race_type = get_race_type(race_code)
+
+            try:
+                sub_constituency = self.get_sub_constituency(code)
+
+                if race_type != RaceType.WOMEN:
+                    ballot_id = sub_constituency.ballot_general_id
+                else:
+                    ballot_id = sub_constituency.ballot_women_id
+            except SubConstituency.DoesNotExist:
+                ballot_id = self.get_ballot(code).pk
+
+            candidates.append(Candidate(
+                ballot_id=ballot_id,
+                candidate_id=int(candidate_id),
+                full_name=full_name,
+                order=int(id_to_ballot_order[candidate_id]),
+                race_type=race_type,
+                tally=self.tally))
+
+        # only candidates with the ids in these rows can match them
+        existing = {natural_key(candidate, CANDIDATE_FIELDS) for candidate in
+                    Candidate.objects.filter(
+                        tally=self.tally,
+                        candidate_id__in={candidate.candidate_id
+                                          for candidate in candidates})}
+        new = []
+
+        for candidate in candidates:
+            key = natural_key(candidate, CANDIDATE_FIELDS)
+
+            if key not in existing:
+                existing.add(key)
+                new.append(candidate)
+
+        Candidate.objects.bulk_create(new, batch_size=BULK_CREATE_BATCH_SIZE)
+        invalidate_ballot_metadata(self.tally_id)
+
+        return elements_processed
+
+    def import_result_forms(self, rows):
+        """Import result form rows, forms with an existing barcode are only
+        marked as replacements if their center does not exist.
+
+        :returns: The number of rows of replacement forms.
+        """
+        new = {}
+        replacements = set()
+        replacement_count = 0
+
+        for row in rows:
+            row = empty_strings_to_none(row)
+            # take first 9 values
+            ballot_number, code, station_number, gender, name,\
+                office_name, _, barcode, serial_number = row[0:9]
+
+            ballot = self.get_ballot(ballot_number)
+            gender = gender and getattr(Gender, gender.upper())
+            center = self.centers.get(to_int(code))
+
+            if center is None:
+                self.warn('Center "%s" does not exist' % code)
+
+            office = None
+
+            if office_name:
+                office = self.offices.get(office_name.strip())
+
+                if office is None:
+                    self.warn('Office "%s" does not exist' % office_name)
+
+            is_replacement = center is None
+
+            if is_replacement:
+                replacement_count += 1
+                replacements.add(barcode)
+
+            if barcode in self.barcodes or barcode in new:
+                continue
+
+            new[barcode] = ResultForm(
+                barcode=barcode,
+                ballot=ballot,
+                center=center,
+                gender=gender,
+                name=name,
+                office=office,
+                serial_number=serial_number,
+                station_number=to_int(station_number),
+                form_state=FormState.UNSUBMITTED,
+                is_replacement=is_replacement,
+                tally=self.tally)
+
+        if self.copy:
+            self.barcodes.update(self.copy_result_forms(new.values()))
+        else:
+            for result_form in ResultForm.bulk_create_forms(
+                    list(new.values()), batch_size=BULK_CREATE_BATCH_SIZE):
+                self.barcodes[result_form.barcode] = result_form.pk
+
+        ResultForm.objects.filter(
+            tally=self.tally,
+            barcode__in=replacements,
+            is_replacement=False).update(is_replacement=True,
+                                         modified_date=timezone.now())
+
+        return replacement_count
+
+    def copy_stations(self, stations):
+        """Load new stations with COPY, joining their centers and sub
+        constituencies by code.
+        """
+        copy_insert(
+            Station,
+            STATION_STAGING_COLUMNS,
+            ((station.center.code,
+              station.sub_constituency and station.sub_constituency.code,
+              station.gender.value,
+              station.registrants,
+              station.station_number) for station in stations),
+            select={
+                'center': 'c.id',
+                'sub_constituency': 'sc.id',
+                'gender': 's.gender',
+                'registrants': 's.registrants',
+                'station_number': 's.station_number',
+            },
+            joins=('JOIN {center} c ON c.code = s.center_code'
+                   ' AND c.tally_id IS NOT DISTINCT FROM %s'
+                   ' LEFT JOIN (SELECT code, min(id) AS id FROM {sc}'
+                   ' WHERE tally_id IS NOT DISTINCT FROM %s GROUP BY code)'
+                   ' sc ON sc.code = s.sub_constituency_code').format(
+                center=Center._meta.db_table,
+                sc=SubConstituency._meta.db_table),
+            template=Station(tally=self.tally),
+            join_params=[self.tally_id, self.tally_id])
+
+    def copy_result_forms(self, result_forms):
+        """Load new result forms with COPY, joining their ballots, centers
+        and offices by number, code and name.
+
+        :returns: A dictionary of barcode to id of the new result forms.
+        """
+        pks = copy_insert(
+            ResultForm,
+            RESULT_FORM_STAGING_COLUMNS,
+            ((result_form.barcode,
+              result_form.ballot.number,
+              result_form.center and result_form.center.code,
+              result_form.office and result_form.office.name,
+              result_form.gender and result_form.gender.value,
+              result_form.name,
+              result_form.serial_number,
+              result_form.station_number,
+              result_form.is_replacement) for result_form in result_forms),
+            select={
+                'barcode': 's.barcode',
+                'ballot': 'b.id',
+                'center': 'c.id',
+                'office': 'o.id',
+                'gender': 's.gender',
+                'name': 's.name',
+                'serial_number': 's.serial_number',
+                'station_number': 's.station_number',
+                'is_replacement': 's.is_replacement',
+            },
+            joins=('JOIN {ballot} b ON b.number = s.ballot_number'
+                   ' AND b.tally_id IS NOT DISTINCT FROM %s'
+                   ' LEFT JOIN {center} c ON c.code = s.center_code'
+                   ' AND c.tally_id IS NOT DISTINCT FROM %s'
+                   ' LEFT JOIN {office} o ON o.name = s.office_name'
+                   ' AND o.tally_id IS NOT DISTINCT FROM %s').format(
+                ballot=Ballot._meta.db_table,
+                center=Center._meta.db_table,
+                office=Office._meta.db_table),
+            template=ResultForm(tally=self.tally,
+                                form_state=FormState.UNSUBMITTED),
+            join_params=[self.tally_id] * 3)
+        ResultForm.created_in_bulk(pks)
+
+        return dict(ResultForm.objects.filter(pk__in=pks).values_list(
+            'barcode', 'pk'))
+
+
+def import_sub_constituencies_and_ballots(tally=None, subconst_file=None,
+                                          command=None):
+    file_to_parse = subconst_file if subconst_file else open(
+        SUB_CONSTITUENCIES_PATH, 'rU')
+
+    with file_to_parse as f, transaction.atomic():
         reader = csv.reader(f)
         next(reader)  # ignore header
 
-        for row in reader:
-            process_station_row(tally, row, command=command)
+        return BulkImporter(tally, command).import_sub_constituencies(reader)
 
 
-def process_candidate_row(tally, row, id_to_ballot_order):
-    candidate_id = row[0]
-    code = row[7]
-    full_name = row[14]
-    race_code = row[18]
+def import_centers(tally=None, centers_file=None):
+    file_to_parse = centers_file if centers_file else open(CENTERS_PATH, 'rU')
 
-    race_type = get_race_type(race_code)
+    with file_to_parse as f, transaction.atomic():
+        reader = csv.reader(f)
+        next(reader)  # ignore header
 
-    try:
-        sub_constituency = SubConstituency.objects.get(
-            code=code, tally=tally)
+        BulkImporter(tally).import_centers(reader)
 
-        if race_type != RaceType.WOMEN:
-            ballot = sub_constituency.ballot_general
-        else:
-            ballot = sub_constituency.ballot_women
 
-    except SubConstituency.DoesNotExist:
-        ballot = Ballot.objects.get(number=code, tally=tally)
-        sub_constituency = ballot.sc_component
+def import_stations(command, tally=None, stations_file=None):
+    file_to_parse = stations_file if stations_file else open(
+        STATIONS_PATH, 'rU')
+
+    with file_to_parse as f, transaction.atomic():
+        reader = csv.reader(f)
+        next(reader)  # ignore header
 
-    _, created = Candidate.objects.get_or_create(
-        ballot=ballot,
-        candidate_id=candidate_id,
-        full_name=full_name,
-        order=id_to_ballot_order[candidate_id],
-        race_type=race_type,
-        tally=tally)
+        BulkImporter(tally, command).import_stations(reader)
 
 
 def import_candidates(tally=None,
@@ -292,103 +703,154 @@ def import_candidates(tally=None,
     ballot_file_to_parse = ballot_file if ballot_file else open(
         BALLOT_ORDER_PATH, 'rU')
 
-    id_to_ballot_order = {}
+    id_to_ballot_order = read_ballot_order(ballot_file_to_parse)
 
-    with ballot_file_to_parse as f:
+    with candidates_file_to_parse as f, transaction.atomic():
         reader = csv.reader(f)
         next(reader)  # ignore header
 
-        for row in reader:
-            id_, ballot_number = row
-            id_to_ballot_order[id_] = ballot_number
+        BulkImporter(tally).import_candidates(reader, id_to_ballot_order)
+
+
+def import_result_forms(command, tally=None, result_forms_file=None):
+    file_to_parse = result_forms_file if result_forms_file else open(
+        RESULT_FORMS_PATH, 'rU')
 
-    with candidates_file_to_parse as f:
+    with file_to_parse as f, transaction.atomic():
         reader = csv.reader(f)
         next(reader)  # ignore header
 
+        replacement_count = BulkImporter(
+            tally, command).import_result_forms(reader)
+
+    command.stdout.write(command.style.NOTICE(
+        'Number of replacement forms: %s' % replacement_count))
+
+
+STEP_TO_ARGS = {
+    1: ['subconst_file',
+        'subconst_file_lines',
+        BulkImporter.import_sub_constituencies],
+    2: ['centers_file',
+        'centers_file_lines',
+        BulkImporter.import_centers],
+    3: ['stations_file',
+        'stations_file_lines',
+        BulkImporter.import_stations],
+    4: ['candidates_file',
+        'candidates_file_lines',
+        BulkImporter.import_candidates],
+    5: ['result_forms_file',
+        'result_forms_file_lines',
+        BulkImporter.import_result_forms]
+}
+logger = logging.getLogger(__name__)
+
+
+def read_rows(file_to_parse, position, limit):
+    """Read up to limit CSV rows from a position in a file.
+
+    :param file_to_parse: A text file opened with `newline=''`.
+    :param position: The position to start reading at, as returned by an
+        earlier call.
+    :param limit: The maximum number of rows to read.
+
+    :returns: A list of rows and the position after the last row.
+    """
+    rows = []
+
+    with file_to_parse as f:
+        f.seek(position)
+        # read with readline so that tell is the end of the last row read
+        reader = csv.reader(iter(f.readline, ''))
+
         for row in reader:
-            process_candidate_row(tally, row, id_to_ballot_order)
+            rows.append(row)
 
+            if len(rows) >= limit:
+                break
 
-def process_results_form_row(tally, row, command=None, logger=None):
-    replacement_count = 0
+        return rows, f.tell()
 
-    row = empty_strings_to_none(row)
-    # take first 9 values
-    ballot_number, code, station_number, gender, name,\
-        office_name, _, barcode, serial_number = row[0:9]
 
-    ballot = Ballot.objects.get(number=ballot_number, tally=tally)
-    gender = gender and getattr(Gender, gender.upper())
-    center = None
+def read_ballot_order_cached(file_name):
+    """Return the ballot order of an uploaded ballot order file, cached per
+    upload of the file.
+    """
+    path = UPLOADED_FILES_PATH + file_name
+    stat = os.stat(path)
+    key = 'ballot_order:%s:%s:%s' % (file_name, stat.st_mtime_ns,
+                                     stat.st_size)
+    id_to_ballot_order = cache.get(key)
 
-    try:
-        center = Center.objects.get(code=code, tally=tally)
-    except Center.DoesNotExist:
-        msg = 'Center "%s" does not exist' % code
-        if command:
-            command.stdout.write(command.style.WARNING(msg))
-        if logger:
-            logger.warning(msg)
+    if id_to_ballot_order is None:
+        id_to_ballot_order = read_ballot_order(open(path, newline=''))
+        cache.set(key, id_to_ballot_order, BALLOT_ORDER_CACHE_TIMEOUT)
 
-    office = None
+    return id_to_ballot_order
 
-    if office_name:
-        try:
-            office = Office.objects.get(name=office_name.strip(), tally=tally)
-        except Office.DoesNotExist:
-            msg = 'Office "%s" does not exist' % office_name
-            if command:
-                command.stdout.write(command.style.WARNING(msg))
-            if logger:
-                logger.warning(msg)
-
-    is_replacement = True if center is None else False
-
-    if is_replacement:
-        replacement_count = 1
-
-    kwargs = {
-        'barcode': barcode,
-        'ballot': ballot,
-        'center': center,
-        'gender': gender,
-        'name': name,
-        'office': office,
-        'serial_number': serial_number,
-        'station_number': station_number,
-        'form_state': FormState.UNSUBMITTED,
-        'is_replacement': is_replacement,
-        'tally': tally
-    }
 
-    try:
-        form = ResultForm.objects.get(barcode=barcode, tally=tally)
-    except ResultForm.DoesNotExist:
-        ResultForm.objects.create(**kwargs)
-    else:
-        if is_replacement:
-            form.is_replacement = is_replacement
-            form.save()
+def next_batch_size(batch_size, seconds):
+    """Scale the batch size towards batches that take BATCH_TARGET_SECONDS,
+    at most halving or doubling it.
+    """
+    factor = BATCH_TARGET_SECONDS / seconds if seconds else 2
 
-    return replacement_count
+    return int(min(MAX_BATCH_BLOCK_SIZE,
+                   max(BATCH_BLOCK_SIZE,
+                       batch_size * min(2, max(0.5, factor)))))
 
 
-def import_result_forms(command, tally=None, result_forms_file=None):
-    file_to_parse = result_forms_file if result_forms_file else open(
-        RESULT_FORMS_PATH, 'rU')
-    replacement_count = 0
+def import_rows_batch(tally,
+                      file_to_parse,
+                      position,
+                      batch_size,
+                      function,
+                      *args,
+                      importer=None):
+    """Import a block of rows of the specific file in bulk.
 
-    with file_to_parse as f:
-        reader = csv.reader(f)
-        next(reader)  # ignore header
+    :param position: The position in the file to continue at, 0 to start
+        with the header.
+    :param batch_size: The number of rows to import.
+    :param importer: The `BulkImporter` of earlier batches of the import,
+        so that the objects it loaded are not loaded again for every batch.
 
-        for row in reader:
-            replacement_count += process_results_form_row(
-                tally, row, command=command)
+    :returns: The number of lines processed, including the header, and the
+        position to continue at.
+    """
+    rows, next_position = read_rows(file_to_parse, position, batch_size)
+    elements_processed = len(rows)
 
-    command.stdout.write(command.style.NOTICE(
-        'Number of replacement forms: %s' % replacement_count))
+    if not position:
+        rows = rows[1:]  # ignore header
+
+    with transaction.atomic():
+        function(importer or BulkImporter(tally, logger=logger), rows, *args)
+
+    return elements_processed, next_position
+
+
+def process_batch_step(current_step, position, batch_size, file_map, tally,
+                       importer=None):
+    """Interpret step and map to build arguments for batch
+    processing of data.
+    """
+    args = []
+
+    file_name, file_lines, process_function = STEP_TO_ARGS[current_step]
+
+    if current_step == 4:
+        args.append(read_ballot_order_cached(file_map['ballots_order_file']))
+
+    return import_rows_batch(
+        tally,
+        open(UPLOADED_FILES_PATH + file_map[file_name], newline=''),
+        position,
+        batch_size,
+        process_function,
+        *args,
+        importer=importer)
 
 
 class Command(BaseCommand):
@@ -399,7 +861,7 @@ class Command(BaseCommand):
         create_permission_groups()
 
         self.stdout.write(self.style.NOTICE('import sub constituencies'))
-        import_sub_constituencies_and_ballots()
+        import_sub_constituencies_and_ballots(command=self)
 
         self.stdout.write(self.style.NOTICE('import centers'))
         import_centers()
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.utils.translation import ugettext_lazy
+
+from tally_ho.libs.reports.progress import (
+    form_state_count_drift,
+    rebuild_form_state_counts,
+)
+
+
+class Command(BaseCommand):
+    help = ugettext_lazy("Rebuild the form state counts from the result "
+                         "forms, or report where they have drifted.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help=ugettext_lazy("Only report the counts that differ from the "
+                               "result forms, do not rebuild."))
+        parser.add_argument(
+            '--tally',
+            type=int,
+            default=None,
+            help=ugettext_lazy("The id of the tally to check, default all."))
+
+    def handle(self, *args, **kwargs):
+        tally_id = kwargs['tally']
+        drift = form_state_count_drift(tally_id)
+
+        for key, (stored, actual) in sorted(drift.items(), key=str):
+            tally, office, ballot, form_state = key
+            self.stdout.write(self.style.NOTICE(
+                'tally %s office %s ballot %s %s: stored %s, actual %s' % (
+                    tally, office, ballot, form_state.name, stored, actual)))
+
+        if kwargs['verify']:
+            self.stdout.write('%s drifted form state counts' % len(drift))
+        else:
+            rebuild_form_state_counts(tally_id)
+            self.stdout.write('Rebuilt form state counts, %s had drifted'
+                              % len(drift))
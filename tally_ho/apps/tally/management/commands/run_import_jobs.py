@@ -0,0 +1,122 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy
+
+from tally_ho.apps.tally.management.commands.import_data import (
+    STEP_TO_ARGS,
+    BulkImporter,
+    next_batch_size,
+    process_batch_step,
+)
+from tally_ho.apps.tally.models.import_job import ImportJob
+from tally_ho.libs.models.enums.import_job_status import ImportJobStatus
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch(job_id, importer=None):
+    """Import the next batch of a running job and save its progress in the
+    transaction of the batch.
+
+    :param job_id: The id of the job to import a batch of.
+    :param importer: The `BulkImporter` of the earlier batches of the job.
+
+    :returns: The job after the batch.
+    """
+    with transaction.atomic():
+        job = ImportJob.objects.select_for_update().get(pk=job_id)
+
+        if job.status != ImportJobStatus.RUNNING:
+            return job
+
+        start = time.time()
+        rows_processed, position = process_batch_step(
+            job.step, job.position, job.batch_size, job.files, job.tally,
+            importer)
+        seconds = time.time() - start
+
+        job.rows_per_second = rows_processed / seconds if seconds else 0
+
+        if rows_processed < job.batch_size:
+            # the end of the file, continue with the next step
+            job.step += 1
+            job.position = 0
+            job.rows_processed = 0
+        else:
+            job.position = position
+            job.rows_processed += rows_processed
+
+        job.batch_size = next_batch_size(job.batch_size, seconds)
+
+        if job.step > len(STEP_TO_ARGS):
+            job.status = ImportJobStatus.COMPLETE
+            job.finished_date = timezone.now()
+
+        job.save()
+
+    return job
+
+
+def run_job(job):
+    """Run the batches of a claimed job until it is finished, marking it
+    failed if a batch raises.
+
+    The batches share one importer, which loads the ballots, sub
+    constituencies, offices, centers and barcodes of the tally once.  A
+    batch that raises fails the job, so the importer never holds objects of
+    a rolled back batch.
+
+    :param job: A running job.
+
+    :returns: The finished job.
+    """
+    importer = BulkImporter(job.tally, logger=logger)
+
+    try:
+        while job.status == ImportJobStatus.RUNNING:
+            job = run_batch(job.pk, importer)
+    except Exception as e:
+        logger.exception('Import job %s failed', job.pk)
+        job.fail('%s: %s' % (e.__class__.__name__, e))
+
+    return job
+
+
+class Command(BaseCommand):
+    help = ugettext_lazy("Run the tally import jobs created by uploading "
+                         "tally files, start several workers to import "
+                         "several tallies concurrently.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help=ugettext_lazy("Exit when there are no jobs to run instead "
+                               "of waiting for new jobs."))
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help=ugettext_lazy("The seconds to wait between checks for new "
+                               "jobs, default 5."))
+
+    def handle(self, *args, **kwargs):
+        while True:
+            job = ImportJob.claim()
+
+            if job:
+                self.stdout.write('Running import job %s of tally %s' % (
+                    job.pk, job.tally_id))
+                job = run_job(job)
+                self.stdout.write('Import job %s %s' % (
+                    job.pk, job.status.name.lower()))
+            elif kwargs['once']:
+                break
+            else:
+                # do not hold a connection the database may drop while idle
+                close_old_connections()
+                time.sleep(kwargs['sleep'])
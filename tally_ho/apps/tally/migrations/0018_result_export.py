@@ -0,0 +1,49 @@
+# Generated by Django 2.1.1 on 2026-10-18 05:39
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tally', '0017_auto_20190214_0849'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportFragment',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=255)),
+                ('rows', django.contrib.postgres.fields.jsonb.JSONField(default=list)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResultExport',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=64)),
+                ('watermark', models.DateTimeField(null=True)),
+                ('tally', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='result_exports', to='tally.Tally')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='exportfragment',
+            name='result_export',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fragments', to='tally.ResultExport'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='resultexport',
+            unique_together={('tally', 'name')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='exportfragment',
+            unique_together={('result_export', 'key')},
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 2.1.1 on 2026-10-18 05:55
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+import enumfields.fields
+import tally_ho.libs.models.enums.form_state
+
+
+def count_form_states(apps, schema_editor):
+    FormStateCount = apps.get_model('tally', 'FormStateCount')
+    ResultForm = apps.get_model('tally', 'ResultForm')
+    rows = ResultForm.objects.values(
+        'tally', 'office', 'ballot', 'form_state').annotate(
+        count=Count('id')).order_by()
+
+    FormStateCount.objects.bulk_create([
+        FormStateCount(tally_id=row['tally'],
+                       office_id=row['office'],
+                       ballot_id=row['ballot'],
+                       form_state=row['form_state'],
+                       count=row['count']) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tally', '0018_result_export'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormStateCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('form_state', enumfields.fields.EnumIntegerField(enum=tally_ho.libs.models.enums.form_state.FormState)),
+                ('count', models.IntegerField(default=0)),
+                ('ballot', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='tally.Ballot')),
+                ('office', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='tally.Office')),
+                ('tally', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='form_state_counts', to='tally.Tally')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='formstatecount',
+            unique_together={('tally', 'office', 'ballot', 'form_state')},
+        ),
+        migrations.RunPython(
+            count_form_states, reverse_code=migrations.RunPython.noop),
+    ]
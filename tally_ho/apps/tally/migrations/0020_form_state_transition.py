@@ -0,0 +1,42 @@
+# Generated by Django 2.1.1 on 2026-10-18 05:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import enumfields.fields
+import tally_ho.libs.models.enums.form_state
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tally', '0019_form_state_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormStateTransition',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('from_state', enumfields.fields.EnumIntegerField(enum=tally_ho.libs.models.enums.form_state.FormState, null=True)),
+                ('to_state', enumfields.fields.EnumIntegerField(enum=tally_ho.libs.models.enums.form_state.FormState)),
+                ('result_form', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='tally.ResultForm')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='formstatetransition',
+            index=models.Index(fields=['result_form', 'created_date'], name='tally_forms_result__f6d0c7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formstatetransition',
+            index=models.Index(fields=['from_state', 'created_date'], name='tally_forms_from_st_20f95d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formstatetransition',
+            index=models.Index(fields=['user', 'created_date'], name='tally_forms_user_id_765c60_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.1.1 on 2026-10-18 06:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tally', '0020_form_state_transition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BarcodeSequence',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('next_barcode', models.BigIntegerField()),
+                ('tally', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='barcode_sequence', to='tally.Tally')),
+            ],
+        ),
+    ]
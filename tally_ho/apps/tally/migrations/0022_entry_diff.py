@@ -0,0 +1,27 @@
+# Generated by Django 2.1.1 on 2026-10-18 06:16
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tally', '0021_barcode_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntryDiff',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('matched', models.BooleanField(db_index=True)),
+                ('candidates', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), default=list, size=None)),
+                ('recon_fields', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), default=list, size=None)),
+                ('result_form', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='entry_diff', to='tally.ResultForm')),
+            ],
+        ),
+    ]
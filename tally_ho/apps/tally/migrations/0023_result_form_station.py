@@ -0,0 +1,32 @@
+# Generated by Django 2.1.1 on 2026-10-18 06:24
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def link_stations(apps, schema_editor):
+    ResultForm = apps.get_model('tally', 'ResultForm')
+    Station = apps.get_model('tally', 'Station')
+
+    ResultForm.objects.filter(center__isnull=False).update(
+        station=Subquery(Station.objects.filter(
+            center=OuterRef('center'),
+            station_number=OuterRef('station_number')).order_by(
+            'id').values('id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tally', '0022_entry_diff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resultform',
+            name='station',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='tally.Station'),
+        ),
+        migrations.RunPython(link_stations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 2.1.1 on 2026-10-18 06:51
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+import enumfields.fields
+import tally_ho.libs.models.enums.import_job_status
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tally', '0023_result_form_station'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('status', enumfields.fields.EnumIntegerField(default=0, enum=tally_ho.libs.models.enums.import_job_status.ImportJobStatus)),
+                ('files', django.contrib.postgres.fields.jsonb.JSONField(default=dict)),
+                ('step', models.IntegerField(default=1)),
+                ('position', models.BigIntegerField(default=0)),
+                ('batch_size', models.IntegerField(default=100)),
+                ('rows_processed', models.IntegerField(default=0)),
+                ('rows_per_second', models.FloatField(default=0)),
+                ('error', models.TextField(null=True)),
+                ('started_date', models.DateTimeField(null=True)),
+                ('finished_date', models.DateTimeField(null=True)),
+                ('tally', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='tally.Tally')),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def count_distinct_form_states(apps, schema_editor):
+    FormStateCount = apps.get_model('tally', 'FormStateCount')
+    ResultForm = apps.get_model('tally', 'ResultForm')
+    pks = ResultForm.objects.filter(
+        center__isnull=False,
+        station_number__isnull=False,
+        ballot__isnull=False).order_by(
+        'center__id', 'station_number', 'ballot__id',
+        'form_state').distinct(
+        'center__id', 'station_number', 'ballot__id').values_list(
+        'id', flat=True)
+    rows = ResultForm.objects.filter(id__in=pks).values(
+        'tally', 'center__office', 'ballot', 'form_state').annotate(
+        count=Count('id')).order_by()
+
+    FormStateCount.objects.all().delete()
+    FormStateCount.objects.bulk_create([
+        FormStateCount(tally_id=row['tally'],
+                       office_id=row['center__office'],
+                       ballot_id=row['ballot'],
+                       form_state=row['form_state'],
+                       count=row['count']) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tally', '0025_cache_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(count_distinct_form_states,
+                             migrations.RunPython.noop),
+    ]
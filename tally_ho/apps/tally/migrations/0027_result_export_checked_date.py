@@ -0,0 +1,18 @@
+# Generated by Django 2.1.1 on 2026-10-18 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tally', '0026_distinct_form_state_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resultexport',
+            name='checked_date',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
@@ -2,14 +2,23 @@
 from tally_ho.apps.tally.models.archive import Archive
 from tally_ho.apps.tally.models.audit import Audit
 from tally_ho.apps.tally.models.ballot import Ballot
+from tally_ho.apps.tally.models.barcode_sequence import BarcodeSequence
+from tally_ho.apps.tally.models.cache_version import CacheVersion
 from tally_ho.apps.tally.models.candidate import Candidate
 from tally_ho.apps.tally.models.center import Center
 from tally_ho.apps.tally.models.clearance import Clearance
 from tally_ho.apps.tally.models.comment import Comment
+from tally_ho.apps.tally.models.entry_diff import EntryDiff
+from tally_ho.apps.tally.models.export_fragment import ExportFragment
+from tally_ho.apps.tally.models.form_state_count import FormStateCount
+from tally_ho.apps.tally.models.form_state_transition import\
+    FormStateTransition
+from tally_ho.apps.tally.models.import_job import ImportJob
 from tally_ho.apps.tally.models.quality_control import QualityControl
 from tally_ho.apps.tally.models.reconciliation_form import\
     ReconciliationForm
 from tally_ho.apps.tally.models.result import Result
+from tally_ho.apps.tally.models.result_export import ResultExport
 from tally_ho.apps.tally.models.result_form import ResultForm
 from tally_ho.apps.tally.models.sub_constituency import SubConstituency
 from tally_ho.apps.tally.models.station import Station
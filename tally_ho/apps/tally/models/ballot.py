@@ -8,6 +8,8 @@ import uuid
 import pathlib
 
 from tally_ho.apps.tally.models.tally import Tally
+from tally_ho.libs.models.ballot_metadata import ballot_metadata,\
+    invalidate_ballot_metadata
 from tally_ho.libs.models.base_model import BaseModel
 from tally_ho.libs.models.enums.race_type import RaceType
 from tally_ho.libs.models.enums.disable_reason import DisableReason
@@ -34,7 +36,7 @@ def sub_constituency(sc_general, sc_women, sc_component):
 
 
 def race_type_name(race_type, sc_general):
-    if sc_general and sc_general.ballot_component:
+    if sc_general and sc_general.ballot_component_id:
         return _('General and Component')
 
     return race_type.name
@@ -77,9 +79,14 @@ class Ballot(BaseModel):
                               related_name='ballots',
                               on_delete=models.PROTECT)
 
+    @property
+    def metadata(self):
+        """The cached candidates and sub constituencies of this ballot."""
+        return ballot_metadata(self)
+
     @property
     def race_type_name(self):
-        return race_type_name(self.race_type, self.sc_general.first())
+        return race_type_name(self.race_type, self.metadata.sc_general)
 
     @property
     def document_name(self):
@@ -87,9 +94,11 @@ class Ballot(BaseModel):
 
     @property
     def sub_constituency(self):
-        return sub_constituency(self.sc_general.first(),
-                                self.sc_women.first(),
-                                self.sc_component.first())
+        metadata = self.metadata
+
+        return sub_constituency(metadata.sc_general,
+                                metadata.sc_women,
+                                metadata.sc_component)
 
     @property
     def component_ballot(self):
@@ -98,8 +107,7 @@ class Ballot(BaseModel):
         :returns: The component ballot for this ballot via the general ballot
             sub constituency.
         """
-        return self.sc_general and self.sc_general.all() and\
-            self.sc_general.all()[0].ballot_component
+        return self.metadata.component_ballot
 
     @property
     def form_ballot_numbers(self):
@@ -134,4 +142,10 @@ def auto_delete_document(sender, instance, **kwargs):
     return False
 
 
+@receiver([models.signals.post_save, models.signals.post_delete],
+          sender=Ballot, dispatch_uid='ballot_metadata')
+def invalidate_metadata(sender, instance, **kwargs):
+    invalidate_ballot_metadata(instance.tally_id)
+
+
 reversion.register(Ballot)
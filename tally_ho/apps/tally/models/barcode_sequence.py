@@ -0,0 +1,87 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import BigIntegerField, Max
+from django.db.models.functions import Cast
+
+from tally_ho.apps.tally.models.tally import Tally
+from tally_ho.libs.models.base_model import BaseModel
+
+
+class BarcodeSequence(BaseModel):
+    """The next barcode to hand out for new result forms of a tally.
+
+    Barcodes are reserved by locking the row of the tally, so concurrent
+    requests get distinct barcodes.  Reserved barcodes are never returned,
+    unused ones leave gaps.
+    """
+    class Meta:
+        app_label = 'tally'
+
+    tally = models.OneToOneField(Tally,
+                                 related_name='barcode_sequence',
+                                 on_delete=models.CASCADE)
+    next_barcode = models.BigIntegerField()
+
+    @classmethod
+    def reserve(cls, tally_id, count=1):
+        """Reserve count consecutive barcodes that are not used in the tally.
+
+        :param tally_id: The tally to reserve barcodes for.
+        :param count: The number of barcodes to reserve.
+
+        :returns: A list of the reserved integer barcodes.
+        """
+        from tally_ho.apps.tally.models.result_form import ResultForm
+
+        result_forms = ResultForm.objects.filter(tally__id=tally_id)
+
+        with transaction.atomic():
+            sequence = cls.locked(tally_id)
+            start = sequence.next_barcode
+
+            # skip barcodes entered by hand or imported after the sequence
+            # was started
+            while result_forms.filter(
+                    barcode__in=[str(barcode) for barcode in
+                                 range(start, start + count)]).exists():
+                start = cls.highest_barcode(tally_id) + 1
+
+            sequence.next_barcode = start + count
+            sequence.save(update_fields=['next_barcode', 'modified_date'])
+
+        return list(range(start, start + count))
+
+    @classmethod
+    def locked(cls, tally_id):
+        """Get the sequence of a tally locked for update, starting it after
+        the highest barcode in the tally if it does not exist.
+        """
+        sequences = cls.objects.select_for_update()
+
+        try:
+            return sequences.get(tally_id=tally_id)
+        except cls.DoesNotExist:
+            pass
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    tally_id=tally_id,
+                    next_barcode=cls.highest_barcode(tally_id) + 1)
+        except IntegrityError:
+            # started concurrently, lock the new row instead
+            pass
+
+        return sequences.get(tally_id=tally_id)
+
+    @staticmethod
+    def highest_barcode(tally_id):
+        """The numerically greatest barcode in a tally, or the start barcode
+        if the tally has no numeric barcodes.
+        """
+        from tally_ho.apps.tally.models.result_form import ResultForm
+
+        highest = ResultForm.objects.filter(
+            tally__id=tally_id, barcode__regex=r'^[0-9]{1,18}$').aggregate(
+            highest=Max(Cast('barcode', BigIntegerField())))['highest']
+
+        return ResultForm.START_BARCODE if highest is None else highest
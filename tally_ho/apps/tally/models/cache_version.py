@@ -0,0 +1,42 @@
+import uuid
+
+from django.db import IntegrityError, models, transaction
+
+from tally_ho.libs.models.base_model import BaseModel
+
+
+class CacheVersion(BaseModel):
+    """The version of cached data, shared by all processes through the
+    database.
+
+    The version is part of the cache keys of the data, and it is replaced
+    in the transaction that changes the data.  Every process then misses
+    the cache once the transaction commits, whichever cache backend it
+    uses.  Versions are random, so a version that was rolled back is never
+    used again.
+    """
+    class Meta:
+        app_label = 'tally'
+
+    key = models.CharField(max_length=255, unique=True)
+    version = models.UUIDField(default=uuid.uuid4)
+
+    @classmethod
+    def current(cls, key):
+        """Return the current version of a key, None if it never changed."""
+        return cls.objects.filter(key=key).values_list(
+            'version', flat=True).first()
+
+    @classmethod
+    def replace(cls, *keys):
+        """Replace the versions of keys with new versions."""
+        for key in set(keys):
+            if cls.objects.filter(key=key).update(version=uuid.uuid4()):
+                continue
+
+            try:
+                with transaction.atomic():
+                    cls.objects.create(key=key)
+            except IntegrityError:
+                # created concurrently, replace the new version instead
+                cls.objects.filter(key=key).update(version=uuid.uuid4())
@@ -1,15 +1,17 @@
 from django.db import models
-from django.db.models import Q
+from django.dispatch import receiver
 from django.utils.translation import ugettext as _
 from enumfields import EnumIntegerField
 import reversion
 
 from tally_ho.apps.tally.models.tally import Tally
 from tally_ho.apps.tally.models.ballot import Ballot
+from tally_ho.libs.models.ballot_metadata import invalidate_ballot_metadata
 from tally_ho.libs.models.base_model import BaseModel
 from tally_ho.libs.models.enums.entry_version import EntryVersion
 from tally_ho.libs.models.enums.form_state import FormState
 from tally_ho.libs.models.enums.race_type import RaceType
+from tally_ho.libs.reports.votes import candidate_votes, NO_VOTES
 from tally_ho.libs.utils.templates import get_active_candidate_link
 
 
@@ -41,6 +43,14 @@ class Candidate(BaseModel):
             RaceType.COMPONENT_TEBU: _('Component Tebu')
         }[self.race_type]
 
+    @property
+    def votes(self):
+        """Return the vote totals for this candidate.
+
+        :returns: A `CandidateVotes` computed in a single grouped query.
+        """
+        return candidate_votes(self.results.all()).get(self.pk, NO_VOTES)
+
     def num_votes(self, result_form=None):
         """Return the number of final active votes for this candidate in the
         result form.
@@ -51,19 +61,18 @@ class Candidate(BaseModel):
             list of the number of results and the number of votes if a result
             form not is passed.
         """
-        results = self.results.filter(
-            entry_version=EntryVersion.FINAL,
-            result_form__form_state=FormState.ARCHIVED,
-            active=True)
-
         if result_form:
-            results = results.filter(result_form=result_form)
-            return results.aggregate(models.Sum('votes')).values()[0] or 0
+            results = self.results.filter(
+                entry_version=EntryVersion.FINAL,
+                result_form__form_state=FormState.ARCHIVED,
+                result_form=result_form,
+                active=True)
 
-        results = results.distinct('entry_version', 'active', 'result_form')
+            return results.aggregate(models.Sum('votes'))['votes__sum'] or 0
 
-        # Distinct can not be combined with aggregate.
-        return [len(results), sum([r.votes for r in results])]
+        votes = self.votes
+
+        return [votes.num_results, votes.votes]
 
     @property
     def num_valid_votes(self):
@@ -71,14 +80,7 @@ class Candidate(BaseModel):
 
         :returns: The number of votes
         """
-        results = self.results.filter(
-            entry_version=EntryVersion.FINAL,
-            result_form__form_state=FormState.ARCHIVED,
-            active=True)
-
-        results = results.distinct('entry_version', 'active', 'result_form')
-
-        return sum([r.votes for r in results])
+        return self.votes.votes
 
     @property
     def num_all_votes(self):
@@ -87,33 +89,16 @@ class Candidate(BaseModel):
 
         :returns: The number of votes
         """
-        results = self.results.filter(
-            entry_version=EntryVersion.FINAL,
-            active=True)
-
-        results = results.filter(
-            Q(result_form__form_state=FormState.ARCHIVED) |
-            Q(result_form__form_state=FormState.AUDIT))
-
-        results = results.distinct('entry_version', 'active', 'result_form')
-
-        return sum([r.votes for r in results])
+        return self.votes.all_votes
 
     @property
     def num_quarentine_votes(self):
-        """Return the number of final active votes plus votes in forms in
-        quarantine for this candidate.
+        """Return the number of final active votes in forms in quarantine for
+        this candidate.
 
         :returns: The number of votes
         """
-        results = self.results.filter(
-            entry_version=EntryVersion.FINAL,
-            result_form__form_state=FormState.AUDIT,
-            active=True)
-
-        results = results.distinct('entry_version', 'active', 'result_form')
-
-        return sum([r.votes for r in results])
+        return self.votes.quarantine_votes
 
     @property
     def ballot_number(self):
@@ -124,4 +109,11 @@ class Candidate(BaseModel):
         return get_active_candidate_link(self) if self else None
 
 
+@receiver([models.signals.post_save, models.signals.post_delete],
+          sender=Candidate, dispatch_uid='candidate_ballot_metadata')
+def invalidate_metadata(sender, instance, **kwargs):
+    invalidate_ballot_metadata(*Ballot.objects.filter(
+        pk=instance.ballot_id).values_list('tally_id', flat=True))
+
+
 reversion.register(Candidate)
@@ -1,8 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import ugettext as _
 from enumfields import EnumIntegerField
 import reversion
 
+from tally_ho.apps.tally.models.result_export import ResultExport
 from tally_ho.apps.tally.models.tally import Tally
 from tally_ho.apps.tally.models.office import Office
 from tally_ho.apps.tally.models.sub_constituency import SubConstituency
@@ -39,6 +40,32 @@ class Center(BaseModel):
                               related_name='centers',
                               on_delete=models.PROTECT)
 
+    def save(self, *args, **kwargs):
+        """Save the center and move the distinct forms of the center to the
+        form state counts of its new office if the office changed.
+        """
+        # imported here, result forms refer to centers
+        from tally_ho.apps.tally.models.result_form import ResultForm
+
+        with transaction.atomic():
+            saved_office = None if self._state.adding else\
+                Center.objects.filter(pk=self.pk).values_list(
+                    'office', flat=True).first()
+
+            if self._state.adding or saved_office == self.office_id:
+                return super(Center, self).save(*args, **kwargs)
+
+            groups = set(self.resultform_set.filter(
+                station_number__isnull=False,
+                ballot__isnull=False).values_list(
+                'center', 'station_number', 'ballot').distinct())
+            before = ResultForm.form_state_count_keys(groups)
+            saved = super(Center, self).save(*args, **kwargs)
+            ResultForm.move_form_state_counts(
+                before, ResultForm.form_state_count_keys(groups))
+
+        return saved
+
     def remove(self):
         """Remove this center and related information.
 
@@ -55,6 +82,7 @@ class Center(BaseModel):
         self.stations.all().delete()
 
         self.delete()
+        ResultExport.reset(self.tally_id)
 
     def sc_code(self):
         return self.sub_constituency.code if self.sub_constituency else _(
@@ -0,0 +1,43 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+
+from tally_ho.libs.models.base_model import BaseModel
+
+
+class EntryDiff(BaseModel):
+    """The comparison of the data entry 1 and 2 entries of a result form,
+    recorded when data entry 2 is submitted.
+
+    Rejecting the result form deletes the diff, result forms without a diff
+    are compared when needed.
+    """
+    class Meta:
+        app_label = 'tally'
+
+    result_form = models.OneToOneField('tally.ResultForm',
+                                       related_name='entry_diff',
+                                       on_delete=models.CASCADE)
+    matched = models.BooleanField(db_index=True)
+    candidates = ArrayField(models.IntegerField(), default=list)
+    recon_fields = ArrayField(models.CharField(max_length=255), default=list)
+
+    @classmethod
+    def record(cls, result_form):
+        """Compare the entries of a result form and store the diff.
+
+        :param result_form: The result form to compare entries for.
+
+        :returns: The stored `EntryDiff`.
+        """
+        diff = result_form.double_entry_diff
+        entry_diff, _ = cls.objects.update_or_create(
+            result_form=result_form,
+            defaults={
+                'matched': diff.matched,
+                'candidates': sorted({result.candidate_id
+                                      for result in diff.all.no_match}),
+                'recon_fields': diff.recon_mismatches or [],
+            })
+        result_form.invalidate_cache('stored_entry_diff')
+
+        return entry_diff
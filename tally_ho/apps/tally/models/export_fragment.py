@@ -0,0 +1,18 @@
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+
+from tally_ho.apps.tally.models.result_export import ResultExport
+from tally_ho.libs.models.base_model import BaseModel
+
+
+class ExportFragment(BaseModel):
+    """The rows a ballot or result form contributes to a result export."""
+    class Meta:
+        app_label = 'tally'
+        unique_together = ('result_export', 'key')
+
+    result_export = models.ForeignKey(ResultExport,
+                                      related_name='fragments',
+                                      on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    rows = JSONField(default=list)
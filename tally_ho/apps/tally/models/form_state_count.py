@@ -0,0 +1,77 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from enumfields import EnumIntegerField
+
+from tally_ho.apps.tally.models.ballot import Ballot
+from tally_ho.apps.tally.models.office import Office
+from tally_ho.apps.tally.models.tally import Tally
+from tally_ho.libs.models.base_model import BaseModel
+from tally_ho.libs.models.enums.form_state import FormState
+
+
+class FormStateCount(BaseModel):
+    """The number of distinct result forms of a tally, office and ballot in
+    a form state, read by the progress reports.
+
+    As in `ResultForm.distinct_filter` duplicate forms of a center, station
+    number and ballot are counted once, in their lowest form state and the
+    office of their center.  The counts are maintained by `ResultForm.save`,
+    `ResultForm.delete`, `ResultForm.created_in_bulk` and `Center.save`,
+    changes that bypass them, e.g. queryset updates, must be followed by a
+    rebuild with the `rebuild_form_state_counts` command.
+    """
+    class Meta:
+        app_label = 'tally'
+        unique_together = ('tally', 'office', 'ballot', 'form_state')
+
+    tally = models.ForeignKey(Tally,
+                              null=True,
+                              related_name='form_state_counts',
+                              on_delete=models.CASCADE)
+    office = models.ForeignKey(Office, null=True, on_delete=models.CASCADE)
+    ballot = models.ForeignKey(Ballot, null=True, on_delete=models.CASCADE)
+    form_state = EnumIntegerField(FormState)
+    count = models.IntegerField(default=0)
+
+    @classmethod
+    def add(cls, key, delta):
+        """Add delta to the count for a key.
+
+        :param key: A tuple of the tally id, office id, ballot id and form
+            state to change the count of.
+        :param delta: The number to add to the count.
+        """
+        tally_id, office_id, ballot_id, form_state = key
+        counts = cls.objects.filter(tally_id=tally_id,
+                                    office_id=office_id,
+                                    ballot_id=ballot_id,
+                                    form_state=form_state)
+
+        if counts.update(count=F('count') + delta):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(tally_id=tally_id,
+                                   office_id=office_id,
+                                   ballot_id=ballot_id,
+                                   form_state=form_state,
+                                   count=delta)
+        except IntegrityError:
+            # created concurrently, update the new row instead
+            counts.update(count=F('count') + delta)
+
+    @classmethod
+    def move(cls, old_key, new_key):
+        """Move one form from the count for the old key to the count for the
+        new key, either key may be None for created or deleted forms.
+        """
+        if old_key == new_key:
+            return
+
+        with transaction.atomic():
+            if old_key and old_key[3] is not None:
+                cls.add(old_key, -1)
+
+            if new_key and new_key[3] is not None:
+                cls.add(new_key, 1)
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import models
+from enumfields import EnumIntegerField
+
+from tally_ho.libs.models.base_model import BaseModel
+from tally_ho.libs.models.enums.form_state import FormState
+
+
+class FormStateTransition(BaseModel):
+    """A change of the form state of a result form.
+
+    Transitions are appended by `ResultForm.save` and never changed, the
+    created date is the time of the transition.  The from state is None for
+    newly created result forms.
+    """
+    class Meta:
+        app_label = 'tally'
+        indexes = [
+            models.Index(fields=['result_form', 'created_date']),
+            models.Index(fields=['from_state', 'created_date']),
+            models.Index(fields=['user', 'created_date']),
+        ]
+
+    result_form = models.ForeignKey('tally.ResultForm',
+                                    related_name='transitions',
+                                    on_delete=models.CASCADE)
+    from_state = EnumIntegerField(FormState, null=True)
+    to_state = EnumIntegerField(FormState)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             null=True,
+                             on_delete=models.SET_NULL)
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from enumfields import EnumIntegerField
+
+from tally_ho.apps.tally.models.tally import Tally
+from tally_ho.libs.models.base_model import BaseModel
+from tally_ho.libs.models.enums.import_job_status import ImportJobStatus
+
+
+class ImportJob(BaseModel):
+    """An import of the uploaded data files of a tally, run in batches by the
+    `run_import_jobs` command.
+
+    The step and the position in the file of the step are saved in the
+    transaction of each batch, a job whose worker stopped is claimed again
+    once it is stale and continues after its last committed batch.
+    """
+    class Meta:
+        app_label = 'tally'
+
+    UNFINISHED = [ImportJobStatus.PENDING, ImportJobStatus.RUNNING]
+
+    tally = models.ForeignKey(Tally,
+                              related_name='import_jobs',
+                              on_delete=models.CASCADE)
+    status = EnumIntegerField(ImportJobStatus,
+                              default=ImportJobStatus.PENDING)
+    # the uploaded file names and line counts, as keyed in STEP_TO_ARGS
+    files = JSONField(default=dict)
+    step = models.IntegerField(default=1)
+    position = models.BigIntegerField(default=0)
+    batch_size = models.IntegerField(default=100)
+    rows_processed = models.IntegerField(default=0)
+    rows_per_second = models.FloatField(default=0)
+    error = models.TextField(null=True)
+    started_date = models.DateTimeField(null=True)
+    finished_date = models.DateTimeField(null=True)
+
+    @classmethod
+    def claim(cls):
+        """Mark the oldest pending job, or a running job that has not saved
+        a batch for IMPORT_JOB_STALE_SECONDS, as running.
+
+        Jobs locked by a worker importing a batch are skipped, so concurrent
+        workers claim different jobs.
+
+        :returns: The claimed job or None.
+        """
+        stale_date = timezone.now() - timedelta(
+            seconds=settings.IMPORT_JOB_STALE_SECONDS)
+
+        with transaction.atomic():
+            job = cls.objects.select_for_update(skip_locked=True).filter(
+                Q(status=ImportJobStatus.PENDING) |
+                Q(status=ImportJobStatus.RUNNING,
+                  modified_date__lt=stale_date)).order_by('id').first()
+
+            if job:
+                job.status = ImportJobStatus.RUNNING
+                job.started_date = job.started_date or timezone.now()
+                job.save()
+
+        return job
+
+    @classmethod
+    def cancel_unfinished(cls, tally):
+        """Cancel the pending and running jobs of a tally, a running job
+        stops after its current batch.
+        """
+        cls.objects.filter(tally=tally, status__in=cls.UNFINISHED).update(
+            status=ImportJobStatus.CANCELLED,
+            finished_date=timezone.now(),
+            modified_date=timezone.now())
+
+    def fail(self, error):
+        """Mark the job failed with an error unless it has been cancelled."""
+        ImportJob.objects.filter(
+            pk=self.pk, status=ImportJobStatus.RUNNING).update(
+            status=ImportJobStatus.FAILED,
+            error=error,
+            finished_date=timezone.now(),
+            modified_date=timezone.now())
+        self.reload()
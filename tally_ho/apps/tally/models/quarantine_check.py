@@ -1,10 +1,16 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.dispatch import receiver
 from django.utils.translation import ugettext as _
 import reversion
 
 from tally_ho.libs.models.base_model import BaseModel
+from tally_ho.apps.tally.models.cache_version import CacheVersion
 from tally_ho.apps.tally.models.user_profile import UserProfile
 
+CACHE_KEY = 'quarantine_checks'
+
 
 class QuarantineCheck(BaseModel):
     class Meta:
@@ -20,5 +26,32 @@ class QuarantineCheck(BaseModel):
     def local_name(self):
         return _(self.name)
 
+    @classmethod
+    def cached(cls):
+        """Return all quarantine checks ordered by id from the cache, loading
+        them on a cache miss.
+
+        The cache key includes the version of the checks in the database,
+        which is replaced when a check is saved or deleted, so every process
+        sees changed checks.
+
+        :returns: A list of quarantine checks.
+        """
+        key = '%s:%s' % (CACHE_KEY, CacheVersion.current(CACHE_KEY))
+        checks = cache.get(key)
+
+        if checks is None:
+            checks = list(cls.objects.order_by('pk'))
+            cache.set(key, checks,
+                      settings.QUARANTINE_CHECKS_CACHE_TIMEOUT)
+
+        return checks
+
+
+@receiver([models.signals.post_save, models.signals.post_delete],
+          sender=QuarantineCheck, dispatch_uid='quarantine_check_cache')
+def invalidate_cache(sender, **kwargs):
+    CacheVersion.replace(CACHE_KEY)
+
 
 reversion.register(QuarantineCheck)
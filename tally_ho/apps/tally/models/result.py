@@ -27,5 +27,24 @@ class Result(BaseModel):
     entry_version = EnumIntegerField(EntryVersion)
     votes = models.PositiveIntegerField()
 
+    @classmethod
+    def bulk_create_versioned(cls, results):
+        """Insert results in one query and add them to the active revision.
+
+        `bulk_create` does not send the signals that add saved results to a
+        revision, so they are added here.
+
+        :param results: A list of unsaved results.
+
+        :returns: The list of saved results.
+        """
+        results = cls.objects.bulk_create(results)
+
+        if reversion.is_active() and not reversion.is_manage_manually():
+            for result in results:
+                reversion.add_to_revision(result)
+
+        return results
+
 
 reversion.register(Result)
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from tally_ho.apps.tally.models.tally import Tally
+from tally_ho.libs.models.base_model import BaseModel
+
+
+class ResultExport(BaseModel):
+    """The state of an incrementally generated result export for a tally.
+
+    The watermark is the time the last export run started, forms, results and
+    candidates modified after it, less RESULT_EXPORT_OVERLAP_SECONDS for
+    transactions that commit after the run started, are recomputed on the
+    next run.  Deletions do not leave modified rows, the code deleting
+    exported data calls `reset` so the next run rebuilds the export.
+    """
+    class Meta:
+        app_label = 'tally'
+        unique_together = ('tally', 'name')
+
+    tally = models.ForeignKey(Tally,
+                              related_name='result_exports',
+                              on_delete=models.CASCADE)
+    name = models.CharField(max_length=64)
+    watermark = models.DateTimeField(null=True)
+    # the last time the export was found up to date
+    checked_date = models.DateTimeField(null=True)
+
+    @classmethod
+    def reset(cls, tally_id):
+        """Rebuild the exports of a tally on their next run."""
+        cls.objects.filter(tally__id=tally_id).update(
+            watermark=None, checked_date=None, modified_date=timezone.now())
+
+    @property
+    def since(self):
+        """The time after which changes must be exported, or None if the
+        whole export must be rebuilt.
+        """
+        if not self.watermark:
+            return None
+
+        return self.watermark - timedelta(
+            seconds=settings.RESULT_EXPORT_OVERLAP_SECONDS)
+
+    @property
+    def recently_checked(self):
+        """Return True if the export was found up to date within the last
+        RESULT_EXPORT_CHECK_SECONDS.
+        """
+        return bool(self.checked_date) and self.checked_date > (
+            timezone.now() - timedelta(
+                seconds=settings.RESULT_EXPORT_CHECK_SECONDS))
@@ -1,14 +1,25 @@
+from collections import Counter
+
 from django.core.exceptions import SuspiciousOperation
-from django.db import models
-from django.db.models import Q, Sum
-from django.forms.models import model_to_dict
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Prefetch, Q, Subquery,\
+    Sum, Window
+from django.db.models.functions import FirstValue, RowNumber
+from django.utils import timezone
 from django.utils.translation import ugettext as _
 from enumfields import EnumIntegerField
 import reversion
 
 from tally_ho.apps.tally.models.ballot import Ballot
+from tally_ho.apps.tally.models.barcode_sequence import BarcodeSequence
 from tally_ho.apps.tally.models.center import Center
+from tally_ho.apps.tally.models.entry_diff import EntryDiff
+from tally_ho.apps.tally.models.form_state_count import FormStateCount
+from tally_ho.apps.tally.models.form_state_transition import\
+    FormStateTransition
 from tally_ho.apps.tally.models.office import Office
+from tally_ho.apps.tally.models.result_export import ResultExport
+from tally_ho.apps.tally.models.station import Station
 from tally_ho.apps.tally.models.tally import Tally
 from tally_ho.apps.tally.models.user_profile import UserProfile
 from tally_ho.libs.models.base_model import BaseModel
@@ -17,42 +28,52 @@ from tally_ho.libs.models.enums.form_state import FormState
 from tally_ho.libs.models.enums.entry_version import EntryVersion
 from tally_ho.libs.models.enums.gender import Gender
 from tally_ho.libs.models.enums.race_type import RaceType
+from tally_ho.libs.utils.memoize import invalidate_memo, memoized_property
 from tally_ho.libs.utils.templates import get_result_form_edit_delete_links
+from tally_ho.libs.verify.double_entry import compare_entries
+
+# fields that may differ between duplicate reconciliation forms
+RECON_IGNORED_FIELDS = {'id', 'user'}
+DISTINCT_FORM_FIELDS = {'center_id', 'station_number', 'ballot_id',
+                        'form_state'}
+STATION_FIELDS = {'center_id', 'station_id', 'station_number'}
+PREFETCHED_ATTRIBUTES = {
+    'audit': 'active_audits',
+    'clearance': 'active_clearances',
+}
 
 male_local = _('Male')
 female_local = _('Female')
 
 
-def model_field_to_dict(form):
-    field_dict = model_to_dict(form)
-    del field_dict['id']
-    del field_dict['user']
+def distinct_form_group(key):
+    """Return the (center id, station number, ballot id) of a distinct form
+    key, or None if the form does not belong to a group of duplicate forms.
+    """
+    if key is None or None in key[:3]:
+        return None
 
-    return field_dict
+    return key[:3]
 
 
-def get_matched_results(result_form, results):
+def get_matched_results(result_form, race_type):
     """Checks results entered by Data Entry 1 and Data Entry 2 clerks match.
 
     If we have more results from either data entry 1 or data entry 2,
     we reset to data entry 1 then raise a SuspiciousOperation exception.
 
     :param result_form: The result form to find matching results for.
-    :param results: The results to look within when finding matching results.
+    :param race_type: The race type to compare results for, None for the
+        component races.
 
     :returns: A list of matched and unmatched results.
     """
-    results_v1 = results.filter(
-        result_form=result_form, entry_version=EntryVersion.DATA_ENTRY_1)\
-        .values('candidate', 'votes')
-    results_v2 = results.filter(
-        result_form=result_form, entry_version=EntryVersion.DATA_ENTRY_2)\
-        .values('candidate', 'votes')
-
-    if results and (not results_v1 or not results_v2):
+    race = result_form.double_entry_diff.race(race_type)
+
+    if race.results and not race.double_entered:
         raise SuspiciousOperation(_(u"Result Form has no double entries."))
 
-    if results_v1.count() != results_v2.count():
+    if not race.counts_match:
         result_form.reject()
 
         raise SuspiciousOperation(_(
@@ -60,46 +81,73 @@ def get_matched_results(result_form, results):
             u"return result form to Data Entry 1." %
             {'barcode': result_form.barcode}))
 
-    tuple_list = [i.items() for i in results_v1]
-    matches = [rec for rec in results_v2 if rec.items() in tuple_list]
-    no_match = [rec for rec in results_v2 if rec.items() not in tuple_list]
+    return race.compare()
 
-    return matches, no_match
 
-
-def match_results(result_form, results=None):
+def match_results(result_form, race_type):
     """True is all results match, otherwise false.
 
     :param result_form: The result form to find match results for.
-    :param results: The results to filter when finding matched results.
+    :param race_type: The race type to compare results for.
     """
-    matches, no_match = get_matched_results(result_form, results)
+    matches, no_match = get_matched_results(result_form, race_type)
     return len(no_match) == 0
 
 
+def deactivate(queryset):
+    """Deactivate the active objects of a queryset in one update.
+
+    The modified date is set, which `update` does not do, and when a revision
+    is active the deactivated objects are added to it as `save` would.
+
+    :param queryset: The queryset of objects to deactivate.
+
+    :returns: The number of objects deactivated.
+    """
+    queryset = queryset.filter(active=True)
+    versioned = reversion.is_active() and not reversion.is_manage_manually()
+    pks = list(queryset.values_list('pk', flat=True)) if versioned else None
+    count = queryset.update(active=False, modified_date=timezone.now())
+
+    if pks:
+        for obj in queryset.model.objects.filter(pk__in=pks):
+            reversion.add_to_revision(obj)
+
+    return count
+
+
 def sanity_check_final_results(result_form):
     """Deactivate duplicate final results.
 
     Each result form should have one final result for each candidate.  If there
-    are multiple final results for a candidate deactivate them.
+    are multiple final results for a candidate deactivate all but the first.
+    Duplicates are found in one query with window functions over the final
+    results of each candidate.
 
     :param result_form: The result form to check final results for.
 
     :raises: `SuspiciousOperation` if the votes in the final results for the
         same candidate and result form do not match.
     """
-    for candidate in result_form.candidates:
-        results = result_form.results_final.filter(candidate=candidate)
-        other_result = results[0]
+    window = {'partition_by': [F('candidate_id')], 'order_by': F('id').asc()}
+    results = result_form.results.filter(
+        active=True, entry_version=EntryVersion.FINAL).annotate(
+        row_number=Window(RowNumber(), **window),
+        first_votes=Window(FirstValue('votes'), **window)).values_list(
+        'id', 'votes', 'row_number', 'first_votes')
+
+    duplicates = []
 
-        if results.count() > 1:
-            for result in results[1:]:
+    for pk, votes, row_number, first_votes in results:
+        if row_number > 1:
+            if votes != first_votes:
+                raise SuspiciousOperation(_("Votes do not match!"))
 
-                if result.votes != other_result.votes:
-                    raise SuspiciousOperation(_("Votes do not match!"))
+            duplicates.append(pk)
 
-                result.active = False
-                result.save()
+    if duplicates:
+        deactivate(result_form.results.filter(pk__in=duplicates))
+        result_form.invalidate_cache()
 
 
 def clean_reconciliation_forms(recon_queryset):
@@ -115,24 +163,97 @@ def clean_reconciliation_forms(recon_queryset):
 
     :returns: True if any forms need to be cleaned, False otherwise.
     """
-    if len(recon_queryset) > 1:
-        field_dict = model_field_to_dict(recon_queryset[0])
+    fields = [field.attname for field in recon_queryset.model._meta.fields
+              if field.editable and field.name not in RECON_IGNORED_FIELDS]
+    recon_forms = list(recon_queryset.order_by('id').values_list(
+        'id', *fields))
 
-        for form in recon_queryset[1:]:
-            other_field_dict = model_field_to_dict(form)
-            for k, v in other_field_dict.items():
-                if field_dict[k] != v:
-                    raise SuspiciousOperation(_(
-                        'Unexpected number of reconciliation forms'))
+    if len(recon_forms) > 1:
+        if len({recon_form[1:] for recon_form in recon_forms}) > 1:
+            raise SuspiciousOperation(_(
+                'Unexpected number of reconciliation forms'))
 
-            form.active = False
-            form.save()
+        deactivate(recon_queryset.model.objects.filter(
+            pk__in=[recon_form[0] for recon_form in recon_forms[1:]]))
 
         return True
 
     return False
 
 
+class ResultFormQuerySet(models.QuerySet):
+    def for_listing(self):
+        """Load the relations shown in lists of result forms in bulk.
+
+        The ballot, center, offices and station are selected and the active
+        audits and clearances are prefetched, the result form properties use
+        these when present.  Ballot sub constituencies come from the ballot
+        metadata cache.
+
+        :returns: A queryset of result forms.
+        """
+        Audit = self.model._meta.get_field('audit').related_model
+        Clearance = self.model._meta.get_field('clearances').related_model
+
+        return self.select_related(
+            'ballot', 'center', 'center__office', 'center__sub_constituency',
+            'office', 'station').prefetch_related(
+            Prefetch('audit_set',
+                     queryset=Audit.objects.filter(active=True).select_related(
+                         'user', 'supervisor'),
+                     to_attr='active_audits'),
+            Prefetch('clearances',
+                     queryset=Clearance.objects.filter(
+                         active=True).select_related('user', 'supervisor'),
+                     to_attr='active_clearances'))
+
+    def with_expected_station(self):
+        """Annotate the result forms with the id of the station with their
+        station number in their center as expected_station_id.
+        """
+        return self.annotate(expected_station_id=Subquery(
+            Station.objects.filter(
+                center=OuterRef('center'),
+                station_number=OuterRef('station_number')).order_by(
+                'id').values('id')[:1]))
+
+    def station_mismatches(self):
+        """Filter to result forms whose station is not the station with their
+        station number in their center.
+
+        :returns: A queryset of result forms annotated with the
+            expected_station_id.
+        """
+        return self.with_expected_station().exclude(
+            Q(station__isnull=True, expected_station_id__isnull=True) |
+            Q(station=F('expected_station_id')))
+
+    def link_stations(self):
+        """Set the station of the result forms to the station with their
+        station number in their center in one update.
+
+        :returns: The number of result forms updated.
+        """
+        return self.update(station=Subquery(
+            Station.objects.filter(
+                center=OuterRef('center'),
+                station_number=OuterRef('station_number')).order_by(
+                'id').values('id')[:1]))
+
+    def corrections_required(self):
+        """Filter to result forms in corrections whose data entry 1 and 2
+        entries were found to differ when data entry 2 was submitted.
+
+        Forms without a stored diff, e.g. forms that were already in
+        corrections before diffs were stored, are included.
+
+        :returns: A queryset of result forms.
+        """
+        return self.filter(Q(entry_diff__matched=False) |
+                           Q(entry_diff__isnull=True),
+                           form_state=FormState.CORRECTION)
+
+
 class ResultForm(BaseModel):
     class Meta:
         app_label = 'tally'
@@ -144,6 +265,8 @@ class ResultForm(BaseModel):
         ]
         unique_together = (('barcode', 'tally'), ('serial_number', 'tally'))
 
+    objects = ResultFormQuerySet.as_manager()
+
     START_BARCODE = 10000000
     OCV_CENTER_MIN = 80001
 
@@ -170,6 +293,9 @@ class ResultForm(BaseModel):
     reject_reason = models.TextField(null=True, blank=True)
     serial_number = models.PositiveIntegerField(null=True)
     skip_quarantine_checks = models.BooleanField(default=False)
+    # the station of the center with the station number, kept in sync by save
+    station = models.ForeignKey(Station, null=True, blank=True,
+                                on_delete=models.SET_NULL)
     station_number = models.PositiveSmallIntegerField(blank=True, null=True)
     is_replacement = models.BooleanField(default=False)
     intake_printed = models.BooleanField(default=False)
@@ -183,28 +309,243 @@ class ResultForm(BaseModel):
     # Field used in result duplicated list view
     results_duplicated = []
 
-    @property
-    def results_final(self):
-        """Return the final active results for this result form."""
-        return self.results.filter(
-            active=True, entry_version=EntryVersion.FINAL)
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(ResultForm, cls).from_db(db, field_names, values)
+
+        deferred_fields = instance.get_deferred_fields()
+
+        if not DISTINCT_FORM_FIELDS & deferred_fields:
+            instance._distinct_form_key = instance.distinct_form_key
+
+        if not STATION_FIELDS & deferred_fields:
+            instance._station_key = instance.station_key
+
+        return instance
+
+    @classmethod
+    def bulk_create_forms(cls, result_forms, batch_size=None):
+        """Insert result forms in batches and do what `save` does for new
+        result forms, see `created_in_bulk`.
+
+        :param result_forms: A list of unsaved result forms.
+        :param batch_size: The number of result forms per insert query.
+
+        :returns: The list of saved result forms.
+        """
+        with transaction.atomic():
+            result_forms = cls.objects.bulk_create(result_forms,
+                                                   batch_size=batch_size)
+            cls.created_in_bulk(
+                [result_form.pk for result_form in result_forms])
+
+        return result_forms
+
+    @classmethod
+    def created_in_bulk(cls, pks):
+        """Do what `save` does for new result forms for result forms that
+        were inserted in bulk, i.e. link their stations, count them in their
+        form state counts and log their initial form state.
+
+        :param pks: The ids of the inserted result forms.
+        """
+        user = reversion.is_active() and reversion.get_user()
+        result_forms = cls.objects.filter(pk__in=pks)
+
+        with transaction.atomic():
+            result_forms.filter(center__isnull=False).link_stations()
+
+            groups = set(filter(None, map(distinct_form_group,
+                                          result_forms.values_list(
+                                              'center', 'station_number',
+                                              'ballot', 'form_state'))))
+            cls.move_form_state_counts(
+                cls.form_state_count_keys(groups, exclude_pks=pks),
+                cls.form_state_count_keys(groups))
+
+            FormStateTransition.objects.bulk_create([
+                FormStateTransition(
+                    result_form_id=pk,
+                    from_state=None,
+                    to_state=form_state,
+                    user_id=user.pk if user else user_id)
+                for pk, form_state, user_id in result_forms.values_list(
+                    'pk', 'form_state', 'user')], batch_size=1000)
+
+    @property
+    def station_key(self):
+        """The center and station number that identify the station."""
+        return (self.center_id, self.station_number)
+
+    def link_station(self):
+        """Set the station to the station with the station number in the
+        center if the center or station number changed, or no station is set.
+        """
+        if self.station_id is not None and\
+                getattr(self, '_station_key', None) == self.station_key:
+            return
+
+        self.station = Station.objects.filter(
+            center_id=self.center_id,
+            station_number=self.station_number).first()\
+            if self.center_id and self.station_number is not None else None
 
     @property
-    def station(self):
-        """Return the station for this result form.
+    def distinct_form_key(self):
+        """The center, station number, ballot and form state that decide the
+        form state count this result form is counted in.
+        """
+        return (self.center_id, self.station_number, self.ballot_id,
+                self.form_state)
 
-        Stations are indirectly tied to result forms through the station
-        number and the centers linked to the result form.  Find the station for
-        this result form by finding that with a matching station number in the
-        center tied to this result form.
+    def saved_distinct_form_key(self):
+        """Return the distinct form key of this result form as stored in the
+        database, or None if it has not been saved.
         """
-        if self.center:
-            stations = self.center.stations.filter(
-                station_number=self.station_number)
-            if stations:
-                return stations[0]
+        if self._state.adding or self.pk is None:
+            return None
 
-        return None
+        key = getattr(self, '_distinct_form_key', None)
+
+        if key is None:
+            key = ResultForm.objects.filter(pk=self.pk).values_list(
+                'center', 'station_number', 'ballot', 'form_state').first()
+
+        return key
+
+    @classmethod
+    def form_state_count_keys(cls, groups, exclude_pks=()):
+        """Lock the result forms of groups of duplicate forms and return the
+        form state count key each group is counted in.
+
+        As in `distinct_filter` a group of forms with the same center,
+        station number and ballot is one distinct form, it is counted in the
+        lowest form state of its forms and the office of its center.
+
+        :param groups: A set of (center id, station number, ballot id)
+            tuples.
+        :param exclude_pks: The ids of result forms to leave out.
+
+        :returns: A dict mapping each group to a (tally id, office id,
+            ballot id, form state) key, or None if the group has no forms.
+        """
+        keys = dict.fromkeys(groups)
+
+        if not groups:
+            return keys
+
+        center_ids, station_numbers, ballot_ids = zip(*groups)
+        rows = cls.objects.select_for_update(of=('self',)).filter(
+            center__in=set(center_ids),
+            station_number__in=set(station_numbers),
+            ballot__in=set(ballot_ids)).exclude(
+            pk__in=exclude_pks).values_list(
+            'center', 'station_number', 'ballot', 'tally', 'center__office',
+            'form_state')
+
+        for center, station_number, ballot, tally, office, form_state in rows:
+            group = (center, station_number, ballot)
+            form_state = FormState(form_state)
+
+            if group in keys and (keys[group] is None or
+                                  form_state.value < keys[group][3].value):
+                keys[group] = (tally, office, ballot, form_state)
+
+        return keys
+
+    @classmethod
+    def move_form_state_counts(cls, before, after):
+        """Move groups of duplicate forms between form state counts.
+
+        :param before: A dict mapping groups to the form state count keys
+            they were counted in, as returned by `form_state_count_keys`.
+        :param after: A dict mapping the same groups to the keys they must
+            be counted in.
+        """
+        deltas = Counter()
+
+        for group, key in after.items():
+            if before[group] != key:
+                deltas[before[group]] -= 1
+                deltas[key] += 1
+
+        for key, delta in deltas.items():
+            if key and delta:
+                FormStateCount.add(key, delta)
+
+    def save(self, *args, **kwargs):
+        """Save the result form, move its distinct form to the form state
+        count for its new form state and log form state changes.
+        """
+        with transaction.atomic():
+            old_key = self.saved_distinct_form_key()
+            new_key = self.distinct_form_key
+            groups = set() if old_key == new_key else set(filter(None, [
+                distinct_form_group(old_key), distinct_form_group(new_key)]))
+            before = ResultForm.form_state_count_keys(groups)
+
+            self.link_station()
+            super(ResultForm, self).save(*args, **kwargs)
+            self._station_key = self.station_key
+            self.invalidate_cache()
+            self._distinct_form_key = new_key
+
+            ResultForm.move_form_state_counts(
+                before, ResultForm.form_state_count_keys(groups))
+
+            from_state = old_key[3] if old_key else None
+
+            if from_state != self.form_state:
+                self.log_transition(from_state)
+
+    def log_transition(self, from_state):
+        """Append a transition from the state to the current form state to
+        the transition log.
+
+        The user is the user of the current revision, i.e. of the request,
+        if there is one and the user of the result form otherwise.
+        """
+        user = reversion.is_active() and reversion.get_user()
+
+        FormStateTransition.objects.create(
+            result_form=self,
+            from_state=from_state,
+            to_state=self.form_state,
+            user_id=user.pk if user else self.user_id)
+
+    def invalidate_cache(self, *names):
+        """Forget the memoized relations of this result form so that they are
+        read from the database on the next access.
+
+        Call this after changing results, reconciliation forms, audits or
+        other related objects of a result form that is still in use.
+
+        :param names: The names of the properties to forget, all if empty.
+        """
+        invalidate_memo(self, *names)
+
+        for name, attribute in PREFETCHED_ATTRIBUTES.items():
+            if not names or name in names:
+                self.__dict__.pop(attribute, None)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            groups = set(filter(None, [
+                distinct_form_group(self.saved_distinct_form_key())]))
+            before = ResultForm.form_state_count_keys(groups)
+            deleted = super(ResultForm, self).delete(*args, **kwargs)
+            ResultExport.reset(self.tally_id)
+
+            ResultForm.move_form_state_counts(
+                before, ResultForm.form_state_count_keys(groups))
+
+        return deleted
+
+    @property
+    def results_final(self):
+        """Return the final active results for this result form."""
+        return self.results.filter(
+            active=True, entry_version=EntryVersion.FINAL)
 
     @property
     def general_results(self):
@@ -226,14 +567,18 @@ class ResultForm(BaseModel):
     def has_women_results(self):
         return self.women_results.count() > 0
 
-    @property
+    @memoized_property
     def qualitycontrol(self):
         quality_controls = self.qualitycontrol_set.filter(active=True)
         return quality_controls[0] if len(quality_controls) else None
 
-    @property
+    @memoized_property
     def audit(self):
-        audits = self.audit_set.filter(active=True)
+        audits = getattr(self, 'active_audits', None)
+
+        if audits is None:
+            audits = self.audit_set.filter(active=True)
+
         return audits[0] if len(audits) else None
 
     @property
@@ -261,7 +606,7 @@ class ResultForm(BaseModel):
         return _(self.station.gender.name if self.station
                  else self.gender.name)
 
-    @property
+    @memoized_property
     def num_votes(self):
         return list(
             self.results_final.aggregate(Sum('votes')).values())[0] or 0
@@ -270,15 +615,27 @@ class ResultForm(BaseModel):
     def corrections_required_text(self):
         return _(u"Corrections Required!")
 
+    @memoized_property
+    def double_entry_diff(self):
+        return compare_entries(self)
+
+    @memoized_property
+    def stored_entry_diff(self):
+        """The diff recorded when data entry 2 was submitted, None if there
+        is none.
+        """
+        return EntryDiff.objects.filter(result_form=self).first()
+
     @property
     def general_match(self):
-        return match_results(self, self.general_results) \
-            if self.general_results else False
+        return match_results(self, RaceType.GENERAL) \
+            if self.double_entry_diff.race(RaceType.GENERAL).results\
+            else False
 
     @property
     def women_match(self):
-        return match_results(self, self.women_results) \
-            if self.women_results else True
+        return match_results(self, RaceType.WOMEN) \
+            if self.double_entry_diff.race(RaceType.WOMEN).results else True
 
     @property
     def corrections_reconciliationforms(self):
@@ -303,7 +660,7 @@ class ResultForm(BaseModel):
 
         return self.reconciliationform_set.filter(active=True)
 
-    @property
+    @memoized_property
     def reconciliationform(self):
         """Return the final reconciliation form for this result form.
 
@@ -333,25 +690,15 @@ class ResultForm(BaseModel):
         :returns: True if there are two reonciliation forms and they match,
             False otherwise.
         """
-        results = self.reconciliationform_set.filter(active=True)
-        if results and results.count() == 2:
-            v1, v2 = [model_to_dict(result) for result in results]
-
-            # remove keys that should differ
-            del v1['id']
-            del v1['entry_version']
-
-            for k, v in v1.items():
-                if v != v2[k]:
-                    return False
+        return self.double_entry_diff.reconciliation_match
 
-            return True
+    @memoized_property
+    def clearance(self):
+        clearance = getattr(self, 'active_clearances', None)
 
-        return False
+        if clearance is None:
+            clearance = self.clearances.filter(active=True)
 
-    @property
-    def clearance(self):
-        clearance = self.clearances.filter(active=True)
         return clearance[0] if clearance else None
 
     @property
@@ -383,11 +730,16 @@ class ResultForm(BaseModel):
         :returns: True if the results from Data Entry 1 and 2 match, otherwise
             returns False.
         """
+        if self.stored_entry_diff:
+            return self.stored_entry_diff.matched
+
+        diff = self.double_entry_diff
+
         return (
-            (not self.has_general_results or self.general_match) and
-            (not self.reconciliationform_exists or
-             self.reconciliation_match) and
-            (not self.has_women_results or self.women_match))
+            (not diff.race(RaceType.GENERAL).results or
+             self.general_match) and
+            (not diff.recon_forms or diff.reconciliation_match) and
+            (not diff.race(RaceType.WOMEN).results or self.women_match))
 
     def reject(self, new_state=FormState.DATA_ENTRY_1, reject_reason=None):
         """Deactivate existing results and reconciliation forms for this result
@@ -395,14 +747,12 @@ class ResultForm(BaseModel):
 
         :param new_state: The state to set the form to.
         """
-        for result in self.results.all():
-            result.active = False
-            result.save()
+        deactivate(self.results.all())
+        deactivate(self.reconciliationform_set.all())
 
-        for recon in self.reconciliationform_set.all():
-            recon.active = False
-            recon.save()
+        EntryDiff.objects.filter(result_form=self).delete()
 
+        self.invalidate_cache()
         self.rejected_count += 1
         self.form_state = new_state
         self.duplicate_reviewed = False
@@ -452,7 +802,7 @@ class ResultForm(BaseModel):
     def center_name(self):
         return self.center.name if self.center else None
 
-    @property
+    @memoized_property
     def candidates(self):
         """Get the candidates for this result form.
 
@@ -462,12 +812,13 @@ class ResultForm(BaseModel):
 
         :returns: A list of candidates that appear on this result form.
         """
-        ballot = self.ballot
-        candidates = list(ballot.candidates.order_by('race_type', 'order'))
-        component_ballot = ballot.component_ballot
+        metadata = self.ballot.metadata
+        candidates = list(metadata.candidates)
+        component_ballot = metadata.component_ballot
 
         if component_ballot:
-            candidates += list(component_ballot.candidates.order_by('order'))
+            candidates += sorted(component_ballot.metadata.candidates,
+                                 key=lambda candidate: candidate.order)
 
         return candidates
 
@@ -532,22 +883,25 @@ class ResultForm(BaseModel):
         return qs.filter(tally__id=tally_id) if tally_id else qs
 
     @classmethod
-    def generate_barcode(cls, tally_id=None):
+    def generate_barcode(cls, tally_id):
         """Create a new barcode.
 
-        Create a new barcode that is not already in the system by taking the
-        greatest barcode in the system and incrementing it by one.
-
-        Note this does not account for multiple request or threads.
+        Create a new barcode that is not already in the tally by reserving
+        the next barcode of the tally's barcode sequence, which starts after
+        the greatest barcode in the tally.  Concurrent requests get distinct
+        barcodes.
 
         :returns: A new unique integer barcode.
         """
-        result_forms = cls.objects.filter(
-            tally__id=tally_id).order_by('-barcode')
-        highest_barcode = result_forms[0].barcode if result_forms else\
-            cls.START_BARCODE
+        return cls.generate_barcodes(tally_id, 1)[0]
 
-        return int(highest_barcode) + 1
+    @classmethod
+    def generate_barcodes(cls, tally_id, count):
+        """Reserve count new barcodes for creating result forms in a batch.
+
+        :returns: A list of new unique integer barcodes.
+        """
+        return BarcodeSequence.reserve(tally_id, count)
 
     def get_duplicated_forms(self, center=None, station_number=None):
         """Get all the result forms for this center and station_number.
@@ -588,6 +942,7 @@ class ResultForm(BaseModel):
             audit = self.audit
             audit.active = False
             audit.save()
+            self.invalidate_cache('audit')
         self.save()
 
 
@@ -6,6 +6,7 @@ from enumfields import EnumIntegerField
 from django.utils import timezone
 
 from tally_ho.apps.tally.models.center import Center
+from tally_ho.apps.tally.models.result_export import ResultExport
 from tally_ho.apps.tally.models.sub_constituency import SubConstituency
 from tally_ho.apps.tally.models.tally import Tally
 from tally_ho.libs.models.base_model import BaseModel
@@ -53,6 +54,18 @@ class Station(BaseModel):
     def __str__(self):
         return u'%s - %s' % (self.center.code, self.station_number)
 
+    def save(self, *args, **kwargs):
+        """Save the station and link the result forms with its center and
+        station number that have no station.
+        """
+        adding = self._state.adding
+        super(Station, self).save(*args, **kwargs)
+
+        if adding:
+            self.center.resultform_set.filter(
+                station_number=self.station_number,
+                station__isnull=True).update(station=self)
+
     @property
     def center_code(self):
         return self.center.code if self.center else None
@@ -84,8 +97,7 @@ class Station(BaseModel):
 
     @property
     def result_forms(self):
-        return self.center.resultform_set.filter(
-            station_number=self.station_number)
+        return self.resultform_set.all()
 
     @property
     def sub_constituency_code(self):
@@ -124,6 +136,12 @@ class Station(BaseModel):
         resultforms.delete()
         self.delete()
 
+    def delete(self, *args, **kwargs):
+        deleted = super(Station, self).delete(*args, **kwargs)
+        ResultExport.reset(self.tally_id)
+
+        return deleted
+
     @classmethod
     def update_cache(cls):
         """Check if this stations cache is out of date.
@@ -1,9 +1,11 @@
 from django.db import models
+from django.dispatch import receiver
 from django.utils.translation import ugettext as _
 import reversion
 
 from tally_ho.apps.tally.models.tally import Tally
 from tally_ho.apps.tally.models.ballot import Ballot
+from tally_ho.libs.models.ballot_metadata import invalidate_ballot_metadata
 from tally_ho.libs.models.base_model import BaseModel
 
 
@@ -65,4 +67,14 @@ class SubConstituency(BaseModel):
             return None
 
 
+@receiver([models.signals.post_save, models.signals.post_delete],
+          sender=SubConstituency,
+          dispatch_uid='sub_constituency_ballot_metadata')
+def invalidate_metadata(sender, instance, **kwargs):
+    invalidate_ballot_metadata(*Ballot.objects.filter(pk__in=[
+        instance.ballot_general_id,
+        instance.ballot_women_id,
+        instance.ballot_component_id]).values_list('tally_id', flat=True))
+
+
 reversion.register(SubConstituency)
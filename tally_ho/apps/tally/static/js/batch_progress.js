@@ -1,26 +1,6 @@
-var csrftoken = jQuery("[name=csrfmiddlewaretoken]").val();
-
-function getCookie(name) {
-    var cookieValue = null;
-    if (document.cookie && document.cookie !== '') {
-        var cookies = document.cookie.split(';');
-        for (var i = 0; i < cookies.length; i++) {
-            var cookie = jQuery.trim(cookies[i]);
-            // Does this cookie string begin with the name we want?
-            if (cookie.substring(0, name.length + 1) === (name + '=')) {
-                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
-                break;
-            }
-        }
-    }
-    return cookieValue;
-}
-
-if (csrftoken === undefined)
-    csrftoken = getCookie('csrftoken');
-
-var currentStep = 0;
 var totalSteps = 5;
+// the milliseconds between checks of the import job status
+var pollInterval = 1000;
 
 for (i = 1; i <= totalSteps; i++) {
     var total = parseInt($('#total' + i).html());
@@ -32,58 +12,45 @@ for (i = 1; i <= totalSteps; i++) {
 }
 
 $(document).ready(function() {
-    currentStep = 1;
     doRequest();
 });
 
-function csrfSafeMethod(method) {
-    // these HTTP methods do not require CSRF protection
-    return (/^(GET|HEAD|OPTIONS|TRACE)$/.test(method));
+function setProgress(step, elementsProcessed) {
+    $('#offset' + step).html(elementsProcessed);
+    $('#progressbar' + step).progressbar('option', 'value', elementsProcessed);
 }
 
-$.ajaxSetup({
-    beforeSend: function(xhr, settings) {
-        if (!csrfSafeMethod(settings.type) && !this.crossDomain) {
-            xhr.setRequestHeader("X-CSRFToken", csrftoken);
-        }
-    }
-});
-
 function doRequest() {
-    elementsProcessed = parseInt($('#offset' + currentStep ).html());
-    total = parseInt($('#total' + currentStep).html());
-    if (elementsProcessed < total) {
-        $.ajax({
-            url: $('#route').html(),
-            //    timeout: 30000,
-            type: 'POST',
-            data: {
-                offset: $('#offset' + currentStep).html(),
-                step: currentStep
-            },
-            success: function (data) {
-                if (data.status == 'OK') {
-                    // If elements_processed is the same as offset, we didn't
-                    // process any new lines. Assume we are done and set the
-                    // length to elements_processed.
-                    if (data.elements_processed == 0) {
-                        $('#total' + currentStep).html(elementsProcessed);
-                    }
-                    elementsProcessed += data.elements_processed;
-                    $('#offset' + currentStep).html(elementsProcessed);
-                    $('#progressbar' + currentStep).progressbar('option', 'value', elementsProcessed);
-                    doRequest();
+    $.ajax({
+        url: $('#route').html(),
+        type: 'GET',
+        success: function (data) {
+            // the import runs on the server, the steps before the current
+            // one are complete
+            for (step = 1; step <= totalSteps; step++) {
+                if (step < data.step) {
+                    setProgress(step, data.totals[step - 1]);
+                }
+                else if (step == data.step) {
+                    setProgress(step, data.rows_processed);
                 }
             }
-        });
-    }
-    else {
-        if (currentStep < totalSteps) {
-            currentStep += 1;
-            doRequest();
-        }
-        else {
-            location.href = $("#route_destination").html();
+
+            if (data.status == 'COMPLETE') {
+                location.href = $("#route_destination").html();
+            }
+            else if (data.status == 'FAILED' || data.status == 'CANCELLED') {
+                $('#error').text(data.status + ' ' + (data.error || '')).show();
+            }
+            else {
+                if (data.status == 'RUNNING') {
+                    $('#rate').text(data.rows_per_second + ' rows/s');
+                }
+                setTimeout(doRequest, pollInterval);
+            }
+        },
+        error: function () {
+            setTimeout(doRequest, pollInterval);
         }
-    }
+    });
 }
@@ -0,0 +1,154 @@
+from io import StringIO
+import csv
+
+from django.core.management.base import BaseCommand
+from django.test import TestCase
+
+from tally_ho.apps.tally.management.commands.import_data import BulkImporter
+from tally_ho.apps.tally.models.ballot import Ballot
+from tally_ho.apps.tally.models.candidate import Candidate
+from tally_ho.apps.tally.models.center import Center
+from tally_ho.apps.tally.models.form_state_count import FormStateCount
+from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.apps.tally.models.station import Station
+from tally_ho.apps.tally.models.sub_constituency import SubConstituency
+from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.models.enums.race_type import RaceType
+from tally_ho.libs.tests.test_base import create_tally
+
+SUB_CONSTITUENCIES = [
+    ['1', 'office', '2', '1', '2', '2', ''],
+    ['2', 'office', '1', '3', '', '1', ''],
+]
+
+
+def center_row(code, sc_code):
+    return ['', 'region', code, '1', 'office', '', sc_code, '', 'center',
+            'mahalla', 'village', '', '1.5', '2.5']
+
+
+def candidate_row(candidate_id, code, race_code):
+    row = [''] * 19
+    row[0], row[7], row[14], row[18] = candidate_id, code, 'name', race_code
+
+    return row
+
+
+def result_form_row(barcode, code, station_number):
+    return ['1', code, station_number, 'male', 'name', 'office', '',
+            barcode, barcode]
+
+
+class TestImportData(TestCase):
+    use_copy = True
+
+    def setUp(self):
+        self.tally = create_tally()
+        self.command = BaseCommand(stdout=StringIO())
+        self.importer = BulkImporter(self.tally, self.command,
+                                     use_copy=self.use_copy)
+
+    def import_data(self, num_centers):
+        importer = BulkImporter(self.tally, self.command,
+                                use_copy=self.use_copy)
+        importer.import_sub_constituencies(SUB_CONSTITUENCIES)
+        importer.import_centers(
+            [center_row(str(i), '1') for i in range(num_centers)])
+        importer.import_stations(
+            [[str(i), 'center', '1', '1', 'female', '10']
+             for i in range(num_centers)])
+        importer.import_candidates(
+            [candidate_row('1', '1', '0'), candidate_row('2', '1', '1')],
+            {'1': '1', '2': '2'})
+
+        return importer.import_result_forms(
+            [result_form_row(str(100 + i), str(i), '1')
+             for i in range(num_centers)])
+
+    def test_import(self):
+        self.assertEqual(self.import_data(3), 0)
+
+        self.assertEqual(
+            list(Ballot.objects.filter(tally=self.tally).values_list(
+                'number', 'race_type').order_by('number')),
+            [(1, RaceType.GENERAL), (2, RaceType.WOMEN),
+             (3, RaceType.GENERAL)])
+        self.assertEqual(SubConstituency.objects.filter(
+            tally=self.tally).count(), 2)
+        center = Center.objects.get(tally=self.tally, code=1)
+        self.assertEqual(center.office.name, 'office')
+        self.assertEqual(center.sub_constituency.code, 1)
+        self.assertEqual(center.latitude, 2.5)
+        self.assertEqual(
+            list(Candidate.objects.filter(tally=self.tally).values_list(
+                'ballot__number', 'order').order_by('order')),
+            [(1, 1), (2, 2)])
+
+        result_form = ResultForm.objects.get(tally=self.tally, barcode='101')
+        self.assertEqual(result_form.center, center)
+        self.assertEqual(result_form.station,
+                         Station.objects.get(center=center))
+        self.assertFalse(result_form.is_replacement)
+        self.assertEqual(result_form.transitions.get().to_state,
+                         FormState.UNSUBMITTED)
+        self.assertEqual(FormStateCount.objects.get(
+            tally=self.tally, form_state=FormState.UNSUBMITTED).count, 3)
+
+    def test_import_twice(self):
+        self.import_data(3)
+        self.import_data(3)
+
+        self.assertEqual(SubConstituency.objects.filter(
+            tally=self.tally).count(), 2)
+        self.assertEqual(Center.objects.filter(tally=self.tally).count(), 3)
+        self.assertEqual(Station.objects.filter(tally=self.tally).count(), 3)
+        self.assertEqual(Candidate.objects.filter(tally=self.tally).count(),
+                         2)
+        self.assertEqual(ResultForm.objects.filter(tally=self.tally).count(),
+                         3)
+
+    def test_import_queries_independent_of_rows(self):
+        BulkImporter(self.tally).import_sub_constituencies(
+            SUB_CONSTITUENCIES)
+        BulkImporter(self.tally).import_centers([center_row('0', '1')])
+
+        with self.assertNumQueries(4):
+            BulkImporter(self.tally).import_centers(
+                [center_row(str(i), '1') for i in range(1, 5)])
+
+        with self.assertNumQueries(4):
+            BulkImporter(self.tally).import_centers(
+                [center_row(str(i), '2') for i in range(5, 50)])
+
+    def test_import_warnings(self):
+        self.import_data(1)
+
+        replacement_count = self.importer.import_result_forms([
+            result_form_row('100', '7', '1'),
+            result_form_row('200', '', '1')])
+        self.importer.import_stations([['0', 'center', 'x', '2', 'male', '']])
+
+        self.assertEqual(replacement_count, 2)
+        self.assertTrue(ResultForm.objects.get(
+            tally=self.tally, barcode='100').is_replacement)
+        self.assertTrue(ResultForm.objects.get(
+            tally=self.tally, barcode='200').is_replacement)
+        self.assertEqual(self.command.stdout.getvalue().splitlines(), [
+            'Center "7" does not exist',
+            'Center "None" does not exist',
+            'SubConstituency "x" does not exist'])
+
+    def test_import_csv_reader(self):
+        rows = StringIO()
+        csv.writer(rows).writerows(SUB_CONSTITUENCIES + [['a'] * 7])
+        rows.seek(0)
+
+        processed = self.importer.import_sub_constituencies(csv.reader(rows))
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(self.command.stdout.getvalue().strip(),
+                         "ValueError when parsing row: %s" % (['a'] * 7))
+
+
+class TestImportDataWithoutCopy(TestImportData):
+    use_copy = False
@@ -0,0 +1,153 @@
+from datetime import timedelta
+from io import StringIO
+import csv
+import os
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tally_ho.apps.tally.management.commands.import_data import (
+    UPLOADED_FILES_PATH,
+    BulkImporter,
+)
+from tally_ho.apps.tally.management.commands.run_import_jobs import (
+    run_batch,
+    run_job,
+)
+from tally_ho.apps.tally.models.candidate import Candidate
+from tally_ho.apps.tally.models.import_job import ImportJob
+from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.apps.tally.models.sub_constituency import SubConstituency
+from tally_ho.apps.tally.tests.management.commands.test_import_data import (
+    SUB_CONSTITUENCIES,
+    candidate_row,
+    center_row,
+    result_form_row,
+)
+from tally_ho.libs.models.enums.import_job_status import ImportJobStatus
+from tally_ho.libs.tests.test_base import create_tally
+
+
+class TestRunImportJobs(TestCase):
+    def setUp(self):
+        self.tally = create_tally()
+        self.files = {}
+
+        self.write_file('subconst', SUB_CONSTITUENCIES)
+        self.write_file('centers', [center_row('1', '1')])
+        self.write_file('stations', [['1', 'center', '1', '1', 'female',
+                                      '10']])
+        self.write_file('candidates', [candidate_row('1', '1', '0'),
+                                       candidate_row('2', '1', '1')])
+        self.write_file('ballots_order', [['1', '1'], ['2', '2']])
+        self.write_file('result_forms', [result_form_row('100', '1', '1')])
+
+    def tearDown(self):
+        for key, file_name in self.files.items():
+            if key.endswith('_file'):
+                os.remove(UPLOADED_FILES_PATH + file_name)
+
+    def write_file(self, name, rows):
+        file_name = 'test_%s_%d.csv' % (name, self.tally.pk)
+
+        with open(UPLOADED_FILES_PATH + file_name, 'w', newline='') as f:
+            csv.writer(f).writerows([['header']] + rows)
+
+        self.files['%s_file' % name] = file_name
+        self.files['%s_file_lines' % name] = len(rows) + 1
+
+    def create_job(self, **kwargs):
+        return ImportJob.objects.create(tally=self.tally, files=self.files,
+                                        **kwargs)
+
+    def test_run_import_jobs(self):
+        job = self.create_job()
+        stdout = StringIO()
+
+        call_command('run_import_jobs', once=True, stdout=stdout)
+
+        job.reload()
+        self.assertEqual(job.status, ImportJobStatus.COMPLETE)
+        self.assertEqual(job.step, 6)
+        self.assertIsNotNone(job.finished_date)
+        self.assertEqual(SubConstituency.objects.filter(
+            tally=self.tally).count(), 2)
+        self.assertEqual(Candidate.objects.filter(tally=self.tally).count(),
+                         2)
+        self.assertEqual(ResultForm.objects.get(
+            tally=self.tally).center.code, 1)
+        self.assertEqual(stdout.getvalue().splitlines(), [
+            'Running import job %s of tally %s' % (job.pk, self.tally.pk),
+            'Import job %s complete' % job.pk])
+
+    def test_run_batch_saves_position(self):
+        job = self.create_job(status=ImportJobStatus.RUNNING, batch_size=2)
+
+        job = run_batch(job.pk)
+
+        # the header and the first sub constituency
+        self.assertEqual(job.step, 1)
+        self.assertEqual(job.rows_processed, 2)
+        self.assertGreater(job.position, 0)
+        self.assertEqual(SubConstituency.objects.filter(
+            tally=self.tally).count(), 1)
+
+        job = run_batch(job.pk)
+
+        self.assertEqual(job.step, 2)
+        self.assertEqual(job.position, 0)
+        self.assertEqual(SubConstituency.objects.filter(
+            tally=self.tally).count(), 2)
+
+    def test_run_batch_shares_importer(self):
+        job = self.create_job(status=ImportJobStatus.RUNNING)
+        importer = BulkImporter(self.tally)
+
+        while job.step < 5:
+            job = run_batch(job.pk, importer)
+
+        with CaptureQueriesContext(connection) as queries:
+            job = run_batch(job.pk, importer)
+
+        # the ballots and centers loaded by earlier batches are reused
+        self.assertEqual(job.status, ImportJobStatus.COMPLETE)
+        self.assertFalse([query for query in queries.captured_queries
+                          if 'FROM "tally_ballot"' in query['sql'] or
+                          'FROM "tally_center"' in query['sql']])
+        self.assertEqual(ResultForm.objects.get(
+            tally=self.tally).center.code, 1)
+
+    def test_run_job_failed(self):
+        files = dict(self.files, centers_file='missing.csv')
+        job = run_job(ImportJob.objects.create(
+            tally=self.tally, files=files, status=ImportJobStatus.RUNNING))
+
+        self.assertEqual(job.status, ImportJobStatus.FAILED)
+        self.assertEqual(job.step, 2)
+        self.assertTrue(job.error.startswith('FileNotFoundError'))
+
+    def test_cancelled_job_stops(self):
+        job = self.create_job(status=ImportJobStatus.RUNNING)
+        ImportJob.cancel_unfinished(self.tally)
+
+        job = run_job(job)
+
+        self.assertEqual(job.status, ImportJobStatus.CANCELLED)
+        self.assertFalse(SubConstituency.objects.filter(
+            tally=self.tally).exists())
+
+    def test_claim(self):
+        running = self.create_job(status=ImportJobStatus.RUNNING)
+        pending = self.create_job()
+
+        self.assertEqual(ImportJob.claim(), pending)
+        self.assertIsNone(ImportJob.claim())
+
+        # a running job whose worker stopped is claimed again
+        ImportJob.objects.filter(pk=running.pk).update(
+            modified_date=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(ImportJob.claim(), running)
@@ -1,12 +1,17 @@
 import os
 import shutil
+from django.core.cache.backends.locmem import LocMemCache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.conf import settings
 from django.db.models.signals import pre_save
+from mock import patch
 
 from tally_ho.apps.tally.models.ballot import (
     Ballot, auto_delete_document, document_name)
-from tally_ho.libs.tests.test_base import create_ballot, create_tally, TestBase
+from tally_ho.apps.tally.models.sub_constituency import SubConstituency
+from tally_ho.libs.models.enums.race_type import RaceType
+from tally_ho.libs.tests.test_base import create_ballot, create_candidate,\
+    create_result_form, create_tally, TestBase
 
 
 class TestBallot(TestBase):
@@ -38,3 +43,69 @@ class TestBallot(TestBase):
         self.assertNotIn(pdf_file_name, ballot.document.path)
         self.assertIn(image_file_name, ballot.document.path)
         shutil.rmtree(os.path.dirname(ballot.document.path))
+
+    def test_metadata_cached(self):
+        tally = create_tally()
+        ballot = create_ballot(tally=tally)
+        component = create_ballot(tally=tally, number=2)
+        create_candidate(ballot, 'general')
+        create_candidate(component, 'component',
+                         race_type=RaceType.COMPONENT_AMAZIGH)
+        sc = SubConstituency.objects.create(code=1, field_office='1',
+                                            ballot_general=ballot,
+                                            ballot_component=component)
+
+        # the version and the metadata of the tally
+        with self.assertNumQueries(4):
+            self.assertEqual(ballot.component_ballot, component)
+
+        result_form = create_result_form(ballot=ballot, tally=tally)
+
+        # only the version of the metadata of the tally is read
+        with self.assertNumQueries(4):
+            self.assertEqual(ballot.sub_constituency, sc)
+            self.assertEqual(ballot.race_type_name, 'General and Component')
+            self.assertEqual(
+                [candidate.full_name for candidate in result_form.candidates],
+                ['general', 'component'])
+
+    def test_metadata_invalidated(self):
+        tally = create_tally()
+        ballot = create_ballot(tally=tally)
+        candidate = create_candidate(ballot, 'general')
+        self.assertEqual(ballot.metadata.candidates, [candidate])
+        self.assertIsNone(ballot.sub_constituency)
+
+        candidate.active = False
+        candidate.save()
+        self.assertFalse(ballot.metadata.candidates[0].active)
+
+        sc = SubConstituency.objects.create(code=1, field_office='1',
+                                            ballot_women=ballot)
+        self.assertEqual(ballot.sub_constituency, sc)
+
+        ballot.active = False
+        ballot.save()
+        other = create_candidate(ballot, 'other')
+        self.assertEqual(ballot.metadata.candidates, [candidate, other])
+
+        candidate.delete()
+        self.assertEqual(ballot.metadata.candidates, [other])
+
+    def test_metadata_changed_in_other_process(self):
+        tally = create_tally()
+        ballot = create_ballot(tally=tally)
+        candidate = create_candidate(ballot, 'general')
+        self.assertEqual(ballot.metadata.candidates, [candidate])
+
+        # the other process has its own cache
+        with patch('tally_ho.libs.models.ballot_metadata.cache',
+                   LocMemCache('other', {})):
+            candidate.full_name = 'renamed'
+            candidate.save()
+            other = create_candidate(ballot, 'other')
+
+        self.assertEqual(
+            [candidate.full_name for candidate in ballot.metadata.candidates],
+            ['renamed', 'other'])
+        self.assertEqual(ballot.metadata.candidates, [candidate, other])
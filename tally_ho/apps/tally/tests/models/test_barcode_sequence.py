@@ -0,0 +1,92 @@
+from threading import Thread
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from tally_ho.apps.tally.models.barcode_sequence import BarcodeSequence
+from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.libs.tests.test_base import create_result_form,\
+    create_tally, TestBase
+
+
+class TestBarcodeSequence(TestBase):
+    def setUp(self):
+        self.tally = create_tally()
+
+    def test_generate_barcode_empty_tally(self):
+        self.assertEqual(ResultForm.generate_barcode(self.tally.pk),
+                         ResultForm.START_BARCODE + 1)
+
+    def test_generate_barcode_numeric_order(self):
+        create_result_form(barcode='9', tally=self.tally)
+        create_result_form(barcode='10000000010', serial_number=1,
+                           station_number=1, tally=self.tally)
+        create_result_form(barcode='abc', serial_number=2,
+                           station_number=2, tally=self.tally)
+
+        self.assertEqual(ResultForm.generate_barcode(self.tally.pk),
+                         10000000011)
+        self.assertEqual(ResultForm.generate_barcode(self.tally.pk),
+                         10000000012)
+
+    def test_generate_barcodes(self):
+        create_result_form(barcode='100', tally=self.tally)
+
+        self.assertEqual(ResultForm.generate_barcodes(self.tally.pk, 3),
+                         [101, 102, 103])
+        self.assertEqual(ResultForm.generate_barcode(self.tally.pk), 104)
+        self.assertEqual(BarcodeSequence.objects.get(
+            tally=self.tally).next_barcode, 105)
+
+    def test_generate_barcode_skips_used(self):
+        create_result_form(barcode='100', tally=self.tally)
+        self.assertEqual(ResultForm.generate_barcode(self.tally.pk), 101)
+        create_result_form(barcode='103', serial_number=1,
+                           station_number=1, tally=self.tally)
+
+        self.assertEqual(ResultForm.generate_barcodes(self.tally.pk, 2),
+                         [104, 105])
+
+    def test_generate_barcode_per_tally(self):
+        other_tally = create_tally(name='other')
+        create_result_form(barcode='100', tally=self.tally)
+
+        self.assertEqual(ResultForm.generate_barcode(self.tally.pk), 101)
+        self.assertEqual(ResultForm.generate_barcode(other_tally.pk),
+                         ResultForm.START_BARCODE + 1)
+
+
+class TestBarcodeSequenceConcurrency(TransactionTestCase):
+    def test_generate_barcode_threads(self):
+        tally = create_tally()
+        num_threads = 8
+        num_barcodes = 10
+        barcodes = []
+        errors = []
+
+        def generate():
+            try:
+                for i in range(num_barcodes):
+                    if i % 2:
+                        barcodes.extend(
+                            ResultForm.generate_barcodes(tally.pk, 2))
+                    else:
+                        barcodes.append(ResultForm.generate_barcode(tally.pk))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [Thread(target=generate) for _ in range(num_threads)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(barcodes), num_threads * num_barcodes * 3 // 2)
+        self.assertEqual(sorted(barcodes), list(range(
+            ResultForm.START_BARCODE + 1,
+            ResultForm.START_BARCODE + 1 + len(barcodes))))
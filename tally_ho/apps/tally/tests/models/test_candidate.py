@@ -0,0 +1,50 @@
+from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.tests.test_base import create_ballot, create_candidate,\
+    create_center, create_result, create_result_form, create_tally, TestBase
+
+
+class TestCandidate(TestBase):
+    def setUp(self):
+        self._create_and_login_user()
+        self.tally = create_tally()
+        self.ballot = create_ballot(tally=self.tally)
+        self.candidate = create_candidate(self.ballot, 'candidate name')
+        center = create_center(tally=self.tally)
+
+        for i, form_state in enumerate([FormState.ARCHIVED,
+                                        FormState.ARCHIVED,
+                                        FormState.AUDIT,
+                                        FormState.DATA_ENTRY_1]):
+            result_form = create_result_form(
+                barcode=i, serial_number=i, station_number=i,
+                form_state=form_state, ballot=self.ballot, center=center,
+                tally=self.tally)
+            create_result(result_form, self.candidate, self.user, 10 + i)
+
+        # a duplicate final result is only counted once
+        create_result(ResultForm.objects.get(barcode=0),
+                      self.candidate, self.user, 10)
+
+    def test_num_votes(self):
+        self.assertEqual(self.candidate.num_votes(), [2, 21])
+
+    def test_num_votes_for_result_form(self):
+        result_form = self.candidate.results.get(votes=11).result_form
+
+        self.assertEqual(self.candidate.num_votes(result_form), 11)
+
+    def test_num_valid_votes(self):
+        self.assertEqual(self.candidate.num_valid_votes, 21)
+
+    def test_num_quarentine_votes(self):
+        self.assertEqual(self.candidate.num_quarentine_votes, 12)
+
+    def test_num_all_votes(self):
+        self.assertEqual(self.candidate.num_all_votes, 33)
+
+    def test_no_votes(self):
+        candidate = create_candidate(self.ballot, 'other candidate')
+
+        self.assertEqual(candidate.num_votes(), [0, 0])
+        self.assertEqual(candidate.num_all_votes, 0)
@@ -0,0 +1,131 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from tally_ho.apps.tally.models.office import Office
+from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.reports.progress import (
+    form_state_count_drift,
+    form_state_counts,
+    office_progress,
+)
+from tally_ho.libs.tests.test_base import create_ballot, create_center,\
+    create_result_form, create_tally, TestBase
+
+
+class TestFormStateCount(TestBase):
+    def setUp(self):
+        self.tally = create_tally()
+        ballot = create_ballot(tally=self.tally)
+        self.center = create_center(tally=self.tally)
+        self.result_forms = [create_result_form(
+            barcode=i, serial_number=i, station_number=i,
+            form_state=FormState.INTAKE, ballot=ballot, center=self.center,
+            tally=self.tally) for i in range(3)]
+
+    def assertCounts(self, **counts):
+        tally_counts = form_state_counts(self.tally.pk)
+
+        for form_state, count in tally_counts.items():
+            self.assertEqual(count, counts.get(form_state.name, 0),
+                             form_state)
+
+        self.assertEqual(form_state_count_drift(self.tally.pk), {})
+
+    def test_create(self):
+        self.assertCounts(INTAKE=3)
+
+    def test_save(self):
+        result_form = self.result_forms[0]
+        result_form.form_state = FormState.DATA_ENTRY_1
+        result_form.save()
+        result_form.save()
+
+        self.assertCounts(INTAKE=2, DATA_ENTRY_1=1)
+
+        # forms loaded from the database are moved from their saved state
+        result_form = ResultForm.objects.get(pk=result_form.pk)
+        result_form.reject(FormState.CLEARANCE)
+
+        self.assertCounts(INTAKE=2, CLEARANCE=1)
+
+    def test_send_to_clearance(self):
+        self.result_forms[1].send_to_clearance()
+
+        self.assertCounts(INTAKE=2, CLEARANCE=1)
+
+    def test_deferred_form_state(self):
+        result_form = ResultForm.objects.only('id').get(
+            pk=self.result_forms[0].pk)
+        result_form.form_state = FormState.ARCHIVED
+        result_form.save()
+
+        self.assertCounts(INTAKE=2, ARCHIVED=1)
+
+    def test_delete(self):
+        self.result_forms[2].delete()
+
+        self.assertCounts(INTAKE=2)
+
+    def test_duplicate_forms(self):
+        result_form = self.result_forms[0]
+        duplicate = create_result_form(
+            barcode=10, serial_number=10, station_number=0,
+            form_state=FormState.ARCHIVED, ballot=result_form.ballot,
+            center=self.center, tally=self.tally)
+
+        # duplicate forms are counted once in their lowest form state
+        self.assertCounts(INTAKE=2, ARCHIVED=1)
+
+        duplicate.form_state = FormState.UNSUBMITTED
+        duplicate.save()
+
+        self.assertCounts(INTAKE=3)
+
+        result_form.form_state = FormState.DATA_ENTRY_1
+        result_form.save()
+
+        self.assertCounts(INTAKE=2, DATA_ENTRY_1=1)
+
+        result_form.delete()
+
+        self.assertCounts(INTAKE=2, UNSUBMITTED=1)
+
+    def test_move_station(self):
+        result_form = self.result_forms[0]
+        result_form.station_number = 1
+        result_form.save()
+
+        self.assertCounts(INTAKE=2)
+
+        result_form.center = None
+        result_form.save()
+
+        self.assertCounts(INTAKE=2)
+
+    def test_change_center_office(self):
+        offices = [Office.objects.create(name=name, number=number,
+                                         tally=self.tally)
+                   for number, name in enumerate(['a', 'b'])]
+
+        for office in offices:
+            self.center.office = office
+            self.center.save()
+
+        self.assertEqual([(row['office'], row['intaken'])
+                          for row in office_progress(self.tally.pk)],
+                         [('a', 0), ('b', 3)])
+        self.assertCounts(INTAKE=3)
+
+    def test_rebuild_form_state_counts(self):
+        ResultForm.objects.filter(pk=self.result_forms[0].pk).update(
+            form_state=FormState.AUDIT)
+        out = StringIO()
+
+        call_command('rebuild_form_state_counts', verify=True, stdout=out)
+        self.assertIn('2 drifted form state counts', out.getvalue())
+        self.assertEqual(len(form_state_count_drift(self.tally.pk)), 2)
+
+        call_command('rebuild_form_state_counts', stdout=out)
+        self.assertCounts(INTAKE=2, AUDIT=1)
@@ -0,0 +1,39 @@
+import reversion
+from reversion.models import Version
+
+from tally_ho.apps.tally.models.result import Result
+from tally_ho.libs.models.enums.entry_version import EntryVersion
+from tally_ho.libs.tests.test_base import create_candidate,\
+    create_result_form, TestBase
+
+
+class TestResult(TestBase):
+    def setUp(self):
+        self._create_and_login_user()
+        self.result_form = create_result_form()
+        self.candidates = [create_candidate(self.result_form.ballot, str(i))
+                           for i in range(3)]
+
+    def results(self):
+        return [Result(candidate=candidate,
+                       result_form=self.result_form,
+                       entry_version=EntryVersion.DATA_ENTRY_1,
+                       votes=i,
+                       user=self.user)
+                for i, candidate in enumerate(self.candidates)]
+
+    def test_bulk_create_versioned(self):
+        with self.assertNumQueries(1):
+            results = Result.bulk_create_versioned(self.results())
+
+        self.assertTrue(all(result.pk for result in results))
+        self.assertEqual(Version.objects.get_for_model(Result).count(), 0)
+
+    def test_bulk_create_versioned_revision(self):
+        with reversion.create_revision():
+            results = Result.bulk_create_versioned(self.results())
+
+        versions = Version.objects.get_for_model(Result)
+        self.assertEqual(sorted(int(v.object_id) for v in versions),
+                         sorted(result.pk for result in results))
+        self.assertEqual(len({v.revision_id for v in versions}), 1)
@@ -1,15 +1,56 @@
-from tally_ho.apps.tally.models.result_form import \
-    sanity_check_final_results
+from io import StringIO
+
+from django.core.exceptions import SuspiciousOperation
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import reversion
+from reversion.models import Version
+
+from tally_ho.apps.tally.models.reconciliation_form import\
+    ReconciliationForm
+from tally_ho.apps.tally.models.result import Result
+from tally_ho.apps.tally.models.station import Station
+from tally_ho.apps.tally.models.result_form import ResultForm,\
+    clean_reconciliation_forms, sanity_check_final_results
 from tally_ho.apps.tally.models.quality_control import QualityControl
 from tally_ho.libs.models.enums.entry_version import EntryVersion
-from tally_ho.libs.tests.test_base import create_reconciliation_form,\
-    create_result_form, create_result, create_candidates, TestBase
+from tally_ho.libs.tests.test_base import create_audit, create_center,\
+    create_reconciliation_form, create_result_form, create_result,\
+    create_candidates, create_station, TestBase
 
 
 class TestResultForm(TestBase):
     def setUp(self):
         self._create_and_login_user()
 
+    def create_duplicate_results(self, num_results, barcode='123456789'):
+        result_form = create_result_form(barcode=barcode,
+                                         serial_number=num_results,
+                                         station_number=num_results)
+        create_candidates(result_form, votes=12, user=self.user,
+                          num_results=num_results)
+
+        for result in result_form.results.all():
+            create_result(result_form, result.candidate, self.user, 12)
+
+        return result_form
+
+    def assertConstantQueries(self, func):
+        num_queries = []
+
+        # the first run creates the form state count rows the others update
+        for num_results in [2, 1, 5]:
+            result_form = self.create_duplicate_results(
+                num_results, barcode=str(num_results))
+
+            with CaptureQueriesContext(connection) as queries:
+                func(result_form)
+
+            num_queries.append(len(queries))
+
+        self.assertEqual(num_queries[1], num_queries[2])
+
     def test_quality_control(self):
         result_form = create_result_form()
         quality_control = QualityControl.objects.create(
@@ -44,3 +85,163 @@ class TestResultForm(TestBase):
         self.assertEqual(result_form.results_final.filter().count(), 4)
         sanity_check_final_results(result_form)
         self.assertEqual(result_form.results_final.filter().count(), 2)
+
+    def test_sanity_check_results_constant_queries(self):
+        self.assertConstantQueries(sanity_check_final_results)
+
+        result_form = ResultForm.objects.get(barcode='5')
+        self.assertEqual(result_form.results_final.count(), 10)
+        self.assertEqual(result_form.results.filter(active=False).count(), 10)
+
+    def test_sanity_check_results_votes_do_not_match(self):
+        result_form = self.create_duplicate_results(2)
+        result = result_form.results_final.order_by('id').last()
+        result.votes = 13
+        result.save()
+
+        with self.assertRaises(SuspiciousOperation):
+            sanity_check_final_results(result_form)
+
+        self.assertEqual(result_form.results_final.count(), 8)
+
+    def test_reject_constant_queries(self):
+        def reject(result_form):
+            create_reconciliation_form(result_form, self.user)
+            result_form.reject()
+
+        self.assertConstantQueries(reject)
+
+        result_form = ResultForm.objects.get(barcode='5')
+        self.assertFalse(result_form.results.filter(active=True).exists())
+        self.assertFalse(result_form.reconciliationform_set.filter(
+            active=True).exists())
+        self.assertEqual(result_form.rejected_count, 1)
+
+    def test_reject_revision(self):
+        result_form = self.create_duplicate_results(1)
+
+        with reversion.create_revision():
+            result_form.reject()
+
+        versions = Version.objects.get_for_model(Result)
+        self.assertEqual(versions.count(), 4)
+        self.assertFalse(any(version.field_dict['active']
+                             for version in versions))
+
+    def test_clean_reconciliation_forms(self):
+        result_form = create_result_form()
+
+        for i in range(3):
+            create_reconciliation_form(result_form, self.user)
+
+        recon_forms = ReconciliationForm.objects.filter(
+            result_form=result_form, active=True)
+
+        with self.assertNumQueries(2):
+            self.assertTrue(clean_reconciliation_forms(recon_forms))
+
+        self.assertEqual(recon_forms.count(), 1)
+
+        create_reconciliation_form(result_form, self.user,
+                                   number_sorted_and_counted=2)
+
+        with self.assertRaises(SuspiciousOperation):
+            clean_reconciliation_forms(recon_forms)
+
+    def test_memoized_relations(self):
+        result_form = create_result_form()
+        quality_control = QualityControl.objects.create(
+            result_form=result_form,
+            user=self.user)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(result_form.qualitycontrol, quality_control)
+            self.assertEqual(result_form.qualitycontrol, quality_control)
+
+        quality_control.active = False
+        quality_control.save()
+        self.assertEqual(result_form.qualitycontrol, quality_control)
+
+        result_form.invalidate_cache('qualitycontrol')
+        self.assertIsNone(result_form.qualitycontrol)
+
+    def test_reject_invalidates_memoized_relations(self):
+        result_form = create_result_form()
+        create_reconciliation_form(result_form, self.user)
+        self.assertTrue(result_form.reconciliationform)
+
+        result_form.reject()
+
+        self.assertFalse(result_form.reconciliationform)
+
+    def test_for_listing(self):
+        center = create_center()
+        create_station(center, registrants=5)
+        result_form = create_result_form(center=center, station_number=1)
+        create_audit(result_form, self.user, reviewed_team=True)
+
+        result_form = ResultForm.objects.for_listing().get(pk=result_form.pk)
+        result_form.ballot.metadata
+
+        # the version of the cached ballot metadata
+        with self.assertNumQueries(1):
+            self.assertEqual(result_form.station.registrants, 5)
+            self.assertEqual(result_form.gender_name, 'MALE')
+            self.assertEqual(result_form.audit_team_reviewed,
+                             self.user.username)
+            self.assertEqual(result_form.center_office, 'office')
+            self.assertEqual(result_form.ballot_race_type_name, 'GENERAL')
+
+    def test_station(self):
+        center = create_center()
+        station = create_station(center)
+        result_form = create_result_form(center=center, station_number=1)
+        self.assertEqual(result_form.station, station)
+
+        result_form.station_number = 2
+        result_form.save()
+        self.assertIsNone(result_form.station)
+
+        new_station = Station.objects.create(
+            center=center, station_number=3, gender=station.gender)
+        result_form.station_number = 3
+        result_form.save()
+        self.assertEqual(result_form.station, new_station)
+
+        Station.objects.create(center=center, station_number=4,
+                               gender=station.gender)
+        other_form = create_result_form(barcode='2', serial_number=2,
+                                        center=center, station_number=4)
+        self.assertIsNotNone(other_form.station)
+
+    def test_station_created_after_form(self):
+        center = create_center()
+        result_form = create_result_form(center=center, station_number=1)
+        self.assertIsNone(result_form.station)
+
+        station = create_station(center)
+        result_form.reload()
+        self.assertEqual(result_form.station, station)
+
+    def test_check_result_form_stations(self):
+        center = create_center()
+        station = create_station(center)
+        result_form = create_result_form(center=center, station_number=1)
+        ResultForm.objects.filter(pk=result_form.pk).update(station=None)
+
+        self.assertEqual(
+            list(ResultForm.objects.station_mismatches().values_list(
+                'pk', 'expected_station_id')),
+            [(result_form.pk, station.pk)])
+
+        out = StringIO()
+        call_command('check_result_form_stations', '--verify', stdout=out)
+        self.assertIn('1 result forms with the wrong station',
+                      out.getvalue())
+        result_form.reload()
+        self.assertIsNone(result_form.station)
+
+        call_command('check_result_form_stations', stdout=StringIO())
+        result_form.reload()
+        self.assertEqual(result_form.station, station)
+        self.assertFalse(ResultForm.objects.station_mismatches().exists())
@@ -1,8 +1,10 @@
 from django.test import RequestFactory
 
+from tally_ho.apps.tally.models.sub_constituency import SubConstituency
 from tally_ho.apps.tally.views.data import race_list_view as views
 from tally_ho.libs.permissions import groups
-from tally_ho.libs.tests.test_base import create_tally, TestBase
+from tally_ho.libs.tests.test_base import create_ballot, create_tally,\
+    TestBase
 
 
 class TestRaceListView(TestBase):
@@ -21,3 +23,17 @@ class TestRaceListView(TestBase):
         response = view(request, tally_id=tally.pk)
         self.assertContains(response, "Races List")
         self.assertContains(response, "New Race")
+
+    def test_race_list_view_races(self):
+        tally = create_tally()
+        tally.users.add(self.user)
+        ballot = create_ballot(tally=tally, number=12)
+        SubConstituency.objects.create(code=3, field_office='1',
+                                       ballot_general=ballot)
+        view = views.RaceListView.as_view()
+        request = self.factory.get('/')
+        request.user = self.user
+        response = view(request, tally_id=tally.pk)
+        self.assertContains(response, "<td>12</td>")
+        self.assertContains(response, "No results")
+        self.assertContains(response, "Page 1 of 1.")
@@ -0,0 +1,59 @@
+import json
+
+from django.test import RequestFactory
+
+from tally_ho.apps.tally.views.reports import transitions
+from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.permissions import groups
+from tally_ho.libs.tests.test_base import (
+    create_result_form,
+    create_tally,
+    TestBase,
+)
+
+
+class TestTransitions(TestBase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self._create_permission_groups()
+        self._create_and_login_user()
+        self._add_user_to_group(self.user, groups.SUPER_ADMINISTRATOR)
+        self.tally = create_tally()
+        self.tally.users.add(self.user)
+        result_form = create_result_form(tally=self.tally, user=self.user,
+                                         form_state=FormState.INTAKE)
+        result_form.form_state = FormState.DATA_ENTRY_1
+        result_form.save()
+
+    def get_data(self, view_class, **params):
+        request = self.factory.get('/', params)
+        request.user = self.user
+        request.session = {}
+        response = view_class.as_view()(request, tally_id=self.tally.pk)
+        self.assertEqual(response.status_code, 200)
+
+        return json.loads(response.content.decode())['data']
+
+    def test_throughput_report(self):
+        data = self.get_data(transitions.ThroughputReportView)
+
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['state'], 'INTAKE')
+        self.assertEqual(data[0]['forms'], 1)
+        self.assertEqual(self.get_data(transitions.ThroughputReportView,
+                                       since='2100-01-01T00:00:00Z'), [])
+
+    def test_time_in_state_report(self):
+        data = self.get_data(transitions.TimeInStateReportView)
+
+        self.assertEqual([row['state'] for row in data], ['INTAKE'])
+        self.assertEqual(sorted(data[0]['seconds'].keys()),
+                         ['0.5', '0.9', '0.99'])
+
+    def test_clerk_productivity_report(self):
+        data = self.get_data(transitions.ClerkProductivityReportView)
+
+        self.assertEqual(data, [{'user': self.user.username,
+                                 'transitions': 2,
+                                 'forms': 1,
+                                 'median_seconds': data[0]['median_seconds']}])
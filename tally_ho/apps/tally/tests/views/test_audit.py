@@ -1,6 +1,8 @@
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 
 from tally_ho.apps.tally.views import audit as views
 from tally_ho.apps.tally.models.audit import Audit
@@ -68,6 +70,32 @@ class TestAudit(TestBase):
         self.assertContains(response, username)
         self.assertContains(response, '42')
 
+    def test_dashboard_get_constant_queries(self):
+        self._create_and_login_user()
+        self._add_user_to_group(self.user, groups.AUDIT_SUPERVISOR)
+        tally = create_tally()
+        tally.users.add(self.user)
+        view = views.DashboardView.as_view()
+
+        def num_queries(barcodes):
+            for barcode in barcodes:
+                result_form = create_result_form(form_state=FormState.AUDIT,
+                                                 barcode=barcode,
+                                                 serial_number=barcode,
+                                                 station_number=barcode,
+                                                 tally=tally)
+                create_audit(result_form, self.user, reviewed_team=True)
+
+            request = self.factory.get('/')
+            request.user = self.user
+
+            with CaptureQueriesContext(connection) as queries:
+                view(request, tally_id=tally.pk).render()
+
+            return len(queries)
+
+        self.assertEqual(num_queries([1]), num_queries([2, 3, 4]))
+
     def test_dashboard_get_csv(self):
         self._create_and_login_user()
         self._add_user_to_group(self.user, groups.AUDIT_CLERK)
@@ -1,8 +1,11 @@
 from django.core.exceptions import PermissionDenied, SuspiciousOperation
 from django.urls import reverse
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 
+from tally_ho.apps.tally.models.entry_diff import EntryDiff
 from tally_ho.apps.tally.models.result import Result
 from tally_ho.apps.tally.models.result_form import ResultForm
 from tally_ho.apps.tally.models.reconciliation_form import\
@@ -12,6 +15,7 @@ from tally_ho.libs.models.enums.entry_version import EntryVersion
 from tally_ho.libs.models.enums.form_state import FormState
 from tally_ho.libs.models.enums.race_type import RaceType
 from tally_ho.libs.permissions import groups
+from tally_ho.libs.views.corrections import save_general_results
 from tally_ho.libs.tests.test_base import (
     create_result_form,
     create_candidate,
@@ -142,6 +146,52 @@ class TestCorrections(TestBase):
         self.assertEqual(response.status_code, 302)
         self.assertIn('corrections/required', response['location'])
 
+    def test_corrections_stored_entry_diff(self):
+        barcode = '123456789'
+        result_form = create_result_form(form_state=FormState.CORRECTION,
+                                         tally=self.tally)
+        create_results(result_form, vote1=1, vote2=3)
+        entry_diff = EntryDiff.record(result_form)
+
+        self.assertFalse(entry_diff.matched)
+        self.assertEqual(len(entry_diff.candidates), 1)
+        self.assertEqual(list(ResultForm.objects.corrections_required()),
+                         [result_form])
+
+        result_form = ResultForm.objects.get(pk=result_form.pk)
+
+        with self.assertNumQueries(1):
+            self.assertFalse(result_form.corrections_passed)
+
+        self._add_user_to_group(self.user, groups.CORRECTIONS_CLERK)
+        view = views.CorrectionView.as_view()
+        barcode_data = {
+            'barcode': barcode,
+            'barcode_copy': barcode,
+            'tally_id': self.tally.pk,
+        }
+        request = self.factory.post('/', data=barcode_data)
+        request.user = self.user
+        request.session = {}
+        response = view(request, tally_id=self.tally.pk)
+        self.assertIn('corrections/required', response['location'])
+
+        result_form.reject()
+
+        self.assertFalse(EntryDiff.objects.filter(
+            result_form=result_form).exists())
+        self.assertFalse(ResultForm.objects.corrections_required().exists())
+
+    def test_corrections_required_without_entry_diff(self):
+        result_form = create_result_form(form_state=FormState.CORRECTION,
+                                         tally=self.tally)
+        create_result_form(barcode='2', serial_number=2,
+                           form_state=FormState.QUALITY_CONTROL,
+                           tally=self.tally)
+
+        self.assertEqual(list(ResultForm.objects.corrections_required()),
+                         [result_form])
+
     def test_corrections_match_page(self):
         result_form = create_result_form(form_state=FormState.CORRECTION,
                                          tally=self.tally)
@@ -244,6 +294,40 @@ class TestCorrections(TestBase):
         self.assertEqual(response.status_code, 302)
         self.assertIn('corrections/success', response['location'])
 
+    def test_save_general_results_constant_queries(self):
+        self._add_user_to_group(self.user, groups.CORRECTIONS_CLERK)
+        self.assertIsNotNone(self.user.userprofile)
+        num_queries = []
+
+        for num_candidates in [1, 4]:
+            result_form = create_result_form(
+                barcode=num_candidates, serial_number=num_candidates,
+                station_number=num_candidates,
+                form_state=FormState.CORRECTION, tally=self.tally)
+            post_data = {}
+
+            for i in range(num_candidates):
+                candidate = create_candidate(result_form.ballot, str(i))
+                Result.objects.create(
+                    candidate=candidate, result_form=result_form,
+                    entry_version=EntryVersion.DATA_ENTRY_1, votes=1)
+                Result.objects.create(
+                    candidate=candidate, result_form=result_form,
+                    entry_version=EntryVersion.DATA_ENTRY_2, votes=i % 2)
+
+                if not i % 2:
+                    post_data['candidate_general_%s' % candidate.pk] = 1
+
+            with CaptureQueriesContext(connection) as queries:
+                save_general_results(result_form, post_data, self.user)
+
+            num_queries.append(len(queries))
+            self.assertEqual(
+                [r.votes for r in result_form.results_final.order_by(
+                    'candidate__full_name')], [1] * num_candidates)
+
+        self.assertEqual(num_queries[0], num_queries[1])
+
     def test_corrections_general_post_few_corrections(self):
         view = views.CorrectionRequiredView.as_view()
         result_form = create_result_form(form_state=FormState.CORRECTION,
@@ -360,6 +360,10 @@ class TestDataEntry(TestBase):
         self.assertEqual(results[0].entry_version, EntryVersion.DATA_ENTRY_2)
         self.assertEqual(results[0].user, self.user)
 
+        self.assertFalse(updated_result_form.entry_diff.matched)
+        self.assertEqual(updated_result_form.entry_diff.candidates,
+                         [results[0].candidate.pk])
+
     def test_enter_results_success_data_entry(self):
         self._create_and_login_user('data_entry_1')
         self._add_user_to_group(self.user, groups.DATA_ENTRY_1_CLERK)
@@ -406,6 +410,12 @@ class TestDataEntry(TestBase):
             self.assertEqual(result.user, self.user)
             self.assertNotEqual(result.user, data_entry_1)
 
+        entry_diff = updated_result_form.entry_diff
+        self.assertTrue(entry_diff.matched)
+        self.assertEqual(entry_diff.candidates, [])
+        self.assertEqual(entry_diff.recon_fields, [])
+        self.assertTrue(updated_result_form.corrections_passed)
+
     def test_confirmation_get(self):
         self._create_and_login_user()
         self._add_user_to_group(self.user, groups.DATA_ENTRY_1_CLERK)
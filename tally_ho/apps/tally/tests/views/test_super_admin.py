@@ -23,6 +23,7 @@ from tally_ho.libs.tests.test_base import (
     configure_messages,
     create_audit,
     create_ballot,
+    create_candidate,
     create_candidates,
     create_reconciliation_form,
     create_result_form,
@@ -1219,3 +1220,32 @@ class TestSuperAdmin(TestBase):
         self.assertTrue(result_form_1.duplicate_reviewed)
         self.assertNotEqual(result_form_2.form_state, FormState.CLEARANCE)
         self.assertFalse(result_form_2.duplicate_reviewed)
+
+    def test_get_results_duplicates(self):
+        tally = create_tally()
+        tally.users.add(self.user)
+        ballot = create_ballot(tally=tally)
+        center = create_center(tally=tally)
+        candidates = [create_candidate(ballot, 'candidate %s' % i)
+                      for i in range(2)]
+
+        # the forms have no station and the ballot no sub constituency
+        for station_number, votes in enumerate([(1, 2), (2, 1), (1, 2)]):
+            result_form = create_result_form(
+                barcode=station_number,
+                serial_number=station_number,
+                station_number=station_number,
+                form_state=FormState.ARCHIVED,
+                ballot=ballot,
+                center=center,
+                tally=tally)
+
+            for candidate, num_votes in zip(candidates, votes):
+                create_result(result_form, candidate, self.user, num_votes)
+
+        result_forms = views.get_results_duplicates(tally.pk)
+
+        self.assertEqual(sorted(form.barcode for form in result_forms),
+                         ['0', '2'])
+        self.assertEqual([form.results_duplicated for form in result_forms],
+                         [(1, 2), (1, 2)])
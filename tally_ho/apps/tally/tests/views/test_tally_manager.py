@@ -0,0 +1,194 @@
+from io import StringIO
+import hashlib
+import json
+import os
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory
+
+from tally_ho.apps.tally.management.commands import import_data
+from tally_ho.apps.tally.models.import_job import ImportJob
+from tally_ho.apps.tally.views import tally_manager as views
+from tally_ho.libs.models.enums.import_job_status import ImportJobStatus
+from tally_ho.libs.permissions import groups
+from tally_ho.libs.tests.test_base import create_tally, TestBase
+
+SUB_CONSTITUENCIES = 'code,office,races,general,women,ballots,component\n'\
+    '1,"office\none",1,1,,1,\n'\
+    '2,office,1,2,,1,\n'\
+    '3,office,1,3,,1,\n'
+
+
+class TestTallyManager(TestBase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self._create_permission_groups()
+        self._create_and_login_user()
+        self._add_user_to_group(self.user, groups.TALLY_MANAGER)
+        self.tally = create_tally()
+        self.file_name = 'test_subconstituencies_%d.csv' % self.tally.pk
+
+        with open(import_data.UPLOADED_FILES_PATH + self.file_name, 'w') as f:
+            f.write(SUB_CONSTITUENCIES)
+
+    def tearDown(self):
+        os.remove(import_data.UPLOADED_FILES_PATH + self.file_name)
+
+    def test_read_rows(self):
+        rows, position = import_data.read_rows(
+            StringIO(SUB_CONSTITUENCIES), 0, 2)
+
+        self.assertEqual([row[0] for row in rows], ['code', '1'])
+        self.assertEqual(rows[1][1], 'office\none')
+
+        rows, position = import_data.read_rows(
+            StringIO(SUB_CONSTITUENCIES), position, 5)
+
+        self.assertEqual([row[0] for row in rows], ['2', '3'])
+        self.assertEqual(import_data.read_rows(
+            StringIO(SUB_CONSTITUENCIES), position, 5)[0], [])
+
+    def upload(self, content, name='upload.csv'):
+        upload = SimpleUploadedFile(name, content)
+        # split multibyte characters and lines across chunks
+        upload.DEFAULT_CHUNK_SIZE = 3
+
+        return upload
+
+    def test_save_file(self):
+        content = (SUB_CONSTITUENCIES.replace('\n1,', '\r\n1,') +
+                   '4,bur\u00e9au,1,4,,1,').encode('utf-8')
+        path = import_data.UPLOADED_FILES_PATH + self.file_name
+
+        num_lines, checksum = views.save_file(self.upload(content),
+                                              self.file_name, 7)
+
+        self.assertEqual(num_lines, 5)
+        self.assertEqual(checksum, hashlib.sha256(content).hexdigest())
+        self.assertFalse(os.path.exists(path + '.part'))
+
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+        self.assertEqual(views.save_file(self.upload(b''), self.file_name),
+                         (0, hashlib.sha256(b'').hexdigest()))
+
+    def test_save_file_invalid(self):
+        path = import_data.UPLOADED_FILES_PATH + self.file_name
+
+        with self.assertRaises(ValidationError):
+            views.save_file(self.upload(b'id,order\n1,2\n'),
+                            self.file_name, 7)
+
+        with self.assertRaises(ValidationError):
+            views.save_file(self.upload(b'id,order\n\xff,2\n'),
+                            self.file_name)
+
+        # the saved file is kept
+        with open(path) as f:
+            self.assertEqual(f.read(), SUB_CONSTITUENCIES)
+
+        self.assertFalse(os.path.exists(path + '.part'))
+
+    def post_files(self, **contents):
+        data = {'tally_id': self.tally.pk}
+
+        for field, columns in import_data.FILE_COLUMNS.items():
+            data[field] = self.upload(contents.get(field, ','.join(
+                [field] * columns).encode() + b'\n1\n'))
+
+        view = views.TallyFilesFormView.as_view()
+        request = self.factory.post('/', data=data)
+        request.user = self.user
+
+        return view(request, tally_id=self.tally.pk)
+
+    def test_tally_files_upload(self):
+        response = self.post_files()
+
+        job = ImportJob.objects.get(tally=self.tally)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'],
+                         '/tally-manager/import-job/%d/' % job.pk)
+        self.assertEqual(job.files['centers_file'],
+                         'centers_%d.csv' % self.tally.pk)
+        self.assertEqual(job.files['centers_file_lines'], 2)
+
+        for field, file_name in views.UPLOADED_FILE_NAMES:
+            os.remove(import_data.UPLOADED_FILES_PATH +
+                      file_name % self.tally.pk)
+
+    def test_tally_files_upload_invalid(self):
+        job = ImportJob.objects.create(tally=self.tally)
+        path = import_data.UPLOADED_FILES_PATH + 'centers_%d.csv' %\
+            self.tally.pk
+
+        with open(path, 'w') as f:
+            f.write('imported')
+
+        response = self.post_files(result_forms_file=b'barcode\n1\n')
+
+        # the files of the unfinished job are kept until all uploads are
+        # valid
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ImportJob.objects.get(pk=job.pk).status,
+                         ImportJobStatus.PENDING)
+
+        with open(path) as f:
+            self.assertEqual(f.read(), 'imported')
+
+        os.remove(path)
+
+        for field, file_name in views.UPLOADED_FILE_NAMES:
+            self.assertFalse(os.path.exists(
+                import_data.UPLOADED_FILES_PATH + file_name % self.tally.pk +
+                views.UPLOADING_SUFFIX))
+
+    def test_next_batch_size(self):
+        self.assertEqual(import_data.next_batch_size(1000, 0.1), 2000)
+        self.assertEqual(import_data.next_batch_size(1000, 10), 500)
+        self.assertEqual(import_data.next_batch_size(1000, 2.5), 800)
+        self.assertEqual(import_data.next_batch_size(100, 10),
+                         import_data.BATCH_BLOCK_SIZE)
+        self.assertEqual(
+            import_data.next_batch_size(import_data.MAX_BATCH_BLOCK_SIZE, 0),
+            import_data.MAX_BATCH_BLOCK_SIZE)
+
+    def test_import_job_status_view(self):
+        job = ImportJob.objects.create(tally=self.tally, files={
+            'subconst_file': self.file_name,
+            'subconst_file_lines': 4,
+            'centers_file_lines': 10,
+            'stations_file_lines': 20,
+            'candidates_file_lines': 30,
+            'ballots_order_file_lines': 30,
+            'result_forms_file_lines': 40})
+        view = views.ImportJobStatusView.as_view()
+        request = self.factory.get('/')
+        request.user = self.user
+        response = view(request, job_id=job.pk)
+
+        self.assertEqual(json.loads(response.content.decode()), {
+            'status': 'PENDING',
+            'step': 1,
+            'rows_processed': 0,
+            'rows_per_second': 0,
+            'totals': [4, 10, 20, 30, 40],
+            'error': None})
+
+    def test_read_ballot_order_cached(self):
+        path = import_data.UPLOADED_FILES_PATH + self.file_name
+
+        with open(path, 'w') as f:
+            f.write('id,order\n1,2\n')
+
+        self.assertEqual(import_data.read_ballot_order_cached(self.file_name),
+                         {'1': '2'})
+
+        # a new upload of the file is read again
+        with open(path, 'w') as f:
+            f.write('id,order\n1,3\n5,1\n')
+
+        self.assertEqual(import_data.read_ballot_order_cached(self.file_name),
+                         {'1': '3', '5': '1'})
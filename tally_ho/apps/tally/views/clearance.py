@@ -107,7 +107,7 @@ class DashboardView(LoginRequiredMixin,
         if format_ == 'csv':
             return render_to_csv_response(form_list)
 
-        forms = paging(form_list, self.request)
+        forms = paging(form_list.for_listing(), self.request)
 
         return self.render_to_response(self.get_context_data(
             forms=forms, is_clerk=is_clerk(self.request.user),
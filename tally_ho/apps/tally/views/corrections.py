@@ -22,7 +22,7 @@ from tally_ho.libs.permissions import groups
 from tally_ho.libs.views.session import session_matches_post_result_form
 from tally_ho.libs.views import mixins
 from tally_ho.libs.views.corrections import get_matched_forms,\
-    candidate_results_for_race_type, save_component_results,\
+    candidate_entries_for_race_type, save_component_results,\
     save_final_results, save_general_results, save_women_results
 from tally_ho.libs.views.form_state import form_in_state,\
     safe_form_in_state
@@ -49,6 +49,7 @@ def save_final_recon_form(updated, user, result_form):
     recon_form_final.result_form = result_form
     recon_form_final.entry_version = EntryVersion.FINAL
     recon_form_final.save()
+    result_form.invalidate_cache()
 
 
 def incorrect_checks(post_data, result_form, success_url, tally_id=None):
@@ -81,18 +82,13 @@ def get_corrections_forms(result_form):
         race if there is one.
     """
     recon = get_recon_form(result_form) if result_form.has_recon else None
-    general = candidate_results_for_race_type(result_form,
-                                              RaceType.GENERAL,
-                                              num_results=2)
-    women = candidate_results_for_race_type(result_form,
-                                            RaceType.WOMEN,
-                                            num_results=2)
-    component = candidate_results_for_race_type(result_form,
-                                                None,
-                                                num_results=2)
+    general = candidate_entries_for_race_type(result_form, RaceType.GENERAL)
+    women = candidate_entries_for_race_type(result_form, RaceType.WOMEN)
+    component = candidate_entries_for_race_type(result_form, None)
 
     # get name of component race type
-    c_name = component[0][0].race_type_name if len(component) else None
+    c_name = component[0].candidate.race_type_name if len(component)\
+        else None
 
     return [recon, general, women, component, c_name]
 
@@ -116,6 +112,8 @@ def get_recon_form(result_form):
             for final in final_results:
                 final.active = False
                 final.save()
+
+            result_form.invalidate_cache()
         else:
             raise SuspiciousOperation(_(u"There should be exactly two "
                                         u"reconciliation results."))
@@ -15,6 +15,7 @@ from tally_ho.libs.views import mixins
 
 
 ALL = '__all__'
+CORRECTIONS_REQUIRED = 'corrections_required'
 
 
 class FormListDataView(LoginRequiredMixin,
@@ -36,6 +37,9 @@ class FormListDataView(LoginRequiredMixin,
         'action'
     )
 
+    def get_initial_queryset(self):
+        return ResultForm.objects.for_listing()
+
     def render_column(self, row, column):
         if column == 'action':
             return row.get_action_button
@@ -81,6 +85,9 @@ class FormListView(LoginRequiredMixin,
         if form_state:
             if form_state == ALL:
                 form_list = ResultForm.objects.filter(tally__id=tally_id)
+            elif form_state == CORRECTIONS_REQUIRED:
+                form_list = ResultForm.objects.corrections_required().filter(
+                    tally__id=tally_id)
             else:
                 form_state = FormState[form_state.upper()]
                 form_list = ResultForm.forms_in_state(form_state.value,
@@ -1,5 +1,6 @@
 from tally_ho.apps.tally.views.reports.races import RacesReportView
 from tally_ho.libs.permissions import groups
+from tally_ho.libs.reports import progress as p
 from tally_ho.libs.views.pagination import paging
 
 
@@ -9,9 +10,8 @@ class RaceListView(RacesReportView):
 
     def get(self, *args, **kwargs):
         tally_id = kwargs.get('tally_id')
-        ballots = self.get_per_ballot_progress()
-
-        ballots = paging(ballots, self.request)
+        ballots = paging(p.race_ballots(tally_id), self.request)
+        ballots.object_list = p.race_progress(tally_id, ballots.object_list)
 
         return self.render_to_response(
             self.get_context_data(
@@ -16,6 +16,7 @@ from tally_ho.apps.tally.forms.candidate_formset import\
 from tally_ho.apps.tally.forms.create_result_form import CreateResultForm
 from tally_ho.apps.tally.forms.recon_form import ReconForm
 from tally_ho.apps.tally.models.center import Center
+from tally_ho.apps.tally.models.entry_diff import EntryDiff
 from tally_ho.apps.tally.models.result import Result
 from tally_ho.apps.tally.models.result_form import ResultForm
 from tally_ho.libs.models.enums.entry_version import EntryVersion
@@ -306,10 +307,6 @@ class EnterResultsView(LoginRequiredMixin,
         recon_form = ReconForm(post_data)
         data_entry_number = get_data_entry_number(result_form.form_state)
         candidates = result_form.candidates
-        CandidateFormSet = formset_factory(CandidateForm,
-                                           extra=len(candidates),
-                                           formset=BaseCandidateFormSet)
-        formset = CandidateFormSet(post_data)
 
         if (not result_form.has_recon or
                 recon_form.is_valid()) and formset.is_valid():
@@ -329,15 +326,14 @@ class EnterResultsView(LoginRequiredMixin,
                 entry_version = EntryVersion.DATA_ENTRY_2
                 new_state = FormState.CORRECTION
 
-            for i, form in enumerate(formset.forms):
-                votes = form.cleaned_data['votes']
-                Result.objects.create(
-                    candidate=candidates[i],
-                    result_form=result_form,
-                    entry_version=entry_version,
-                    votes=votes,
-                    user=self.request.user.userprofile
-                )
+            user = self.request.user.userprofile
+            Result.bulk_create_versioned([
+                Result(candidate=candidates[i],
+                       result_form=result_form,
+                       entry_version=entry_version,
+                       votes=form.cleaned_data['votes'],
+                       user=user)
+                for i, form in enumerate(formset.forms)])
 
             if result_form.has_recon:
                 re_form = recon_form.save(commit=False)
@@ -346,6 +342,11 @@ class EnterResultsView(LoginRequiredMixin,
                 re_form.user = self.request.user.userprofile
                 re_form.save()
 
+            result_form.invalidate_cache()
+
+            if entry_version == EntryVersion.DATA_ENTRY_2:
+                EntryDiff.record(result_form)
+
             result_form.form_state = new_state
             result_form.duplicate_reviewed = False
             result_form.save()
@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.http import JsonResponse
+from django.utils.dateparse import parse_datetime
+from django.views.generic import View
+from guardian.mixins import LoginRequiredMixin
+
+from tally_ho.libs.permissions import groups
+from tally_ho.libs.reports import transitions as t
+from tally_ho.libs.views import mixins
+
+
+class TransitionsReportView(LoginRequiredMixin,
+                            mixins.GroupRequiredMixin,
+                            mixins.TallyAccessMixin,
+                            View):
+    group_required = groups.SUPER_ADMINISTRATOR
+
+    def get_since(self):
+        since = self.request.GET.get('since')
+
+        return parse_datetime(since) if since else None
+
+    def get(self, *args, **kwargs):
+        return JsonResponse({'data': self.get_data(kwargs['tally_id'])})
+
+
+class ThroughputReportView(TransitionsReportView):
+    def get_data(self, tally_id):
+        return [{'hour': row['hour'].isoformat(),
+                 'state': row['state'].name,
+                 'forms': row['forms']}
+                for row in t.throughput(tally_id, self.get_since())]
+
+
+class TimeInStateReportView(TransitionsReportView):
+    def get_data(self, tally_id):
+        return [{'state': state.name,
+                 'count': times['count'],
+                 'seconds': {str(percentile): seconds for
+                             percentile, seconds in times['seconds'].items()}}
+                for state, times in t.time_in_state(tally_id).items()]
+
+
+class ClerkProductivityReportView(TransitionsReportView):
+    def get_data(self, tally_id):
+        productivity = t.clerk_productivity(tally_id, self.get_since())
+        usernames = dict(User.objects.filter(
+            id__in=productivity.keys()).values_list('id', 'username'))
+
+        return [dict(row, user=usernames.get(user_id))
+                for user_id, row in sorted(productivity.items())]
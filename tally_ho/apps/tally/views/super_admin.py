@@ -1,8 +1,6 @@
-from collections import defaultdict
-
 from django.core.exceptions import SuspiciousOperation
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import Count, Func
+from django.db.models import Count, Func, Sum
 from django.shortcuts import get_object_or_404, redirect
 from django.views.generic.edit import UpdateView, DeleteView, CreateView
 from django.views.generic import FormView, TemplateView
@@ -41,8 +39,10 @@ from tally_ho.apps.tally.models.tally import Tally
 from tally_ho.apps.tally.models.user_profile import UserProfile
 from tally_ho.libs.models.enums.audit_resolution import\
     AuditResolution
+from tally_ho.libs.models.enums.entry_version import EntryVersion
 from tally_ho.libs.models.enums.form_state import FormState
 from tally_ho.libs.permissions import groups
+from tally_ho.libs.reports.duplicates import duplicate_votes
 from tally_ho.libs.utils.collections import flatten
 from tally_ho.libs.utils.active_status import (
     disable_enable_entity,
@@ -51,10 +51,8 @@ from tally_ho.libs.utils.active_status import (
 )
 from tally_ho.libs.views import mixins
 from tally_ho.libs.views.exports import (
+    complete_result_forms,
     get_result_export_response,
-    valid_ballots,
-    distinct_forms,
-    SPECIAL_BALLOTS,
 )
 from tally_ho.libs.views.pagination import paging
 from tally_ho.libs.views.session import session_matches_post_result_form
@@ -108,53 +106,34 @@ def audit(tally_id=None):
 
 
 def get_results_duplicates(tally_id):
-    complete_barcodes = []
-
-    for ballot in valid_ballots(tally_id):
-        forms = distinct_forms(ballot, tally_id)
-        final_forms = ResultForm.forms_in_state(
-            FormState.ARCHIVED, pks=[r.pk for r in forms], tally_id=tally_id)
-
-        if not SPECIAL_BALLOTS or ballot.number in SPECIAL_BALLOTS:
-            complete_barcodes.extend([r.barcode for r in final_forms])
+    """Build a list of the archived result forms with the same votes per
+    candidate as another archived result form in the same center.
 
-    result_forms = ResultForm.objects\
-        .select_related().filter(barcode__in=complete_barcodes,
-                                 tally__id=tally_id)
+    :param tally_id: The tally to find duplicate results in.
 
-    center_to_votes = defaultdict(list)
-    center_to_forms = defaultdict(list)
-
-    result_forms_founds = []
+    :returns: A list of result forms with their votes in `results_duplicated`.
+    """
+    result_forms = list(complete_result_forms(tally_id).select_related(
+        'ballot'))
+    votes = {(row['result_form'], row['candidate']): row['votes']
+             for row in Result.objects.filter(
+                 result_form__in=[form.pk for form in result_forms],
+                 entry_version=EntryVersion.FINAL,
+                 active=True).values(
+                 'result_form', 'candidate').annotate(votes=Sum('votes'))}
+    forms_and_votes = []
 
     for result_form in result_forms:
-        # build list of votes for this barcode
-        vote_list = ()
+        vote_list = tuple(votes.get((result_form.pk, candidate.pk)) or 0
+                          for candidate in result_form.candidates)
+        forms_and_votes.append(
+            (result_form.center_id, result_form, vote_list))
 
-        for candidate in result_form.candidates:
-            votes = candidate.num_votes(result_form)
-            vote_list += (votes,)
-
-        # store votes for this forms center
-        center = result_form.center
-        center_to_votes[center.code].append(vote_list)
-        center_to_forms[center.code].append(result_form)
-
-    for code, vote_lists in center_to_votes.items():
-        votes_cast = sum([sum(l) for l in vote_lists]) > 0
-        num_vote_lists = len(vote_lists)
-        num_distinct_vote_lists = len(set(vote_lists))
-
-        if votes_cast and num_distinct_vote_lists < num_vote_lists:
-
-            for i, form in enumerate(center_to_forms[code]):
-                vote_list = vote_lists[i]
-                votes_cast = sum(vote_list) > 0
-                other_vote_lists = vote_lists[:i] + vote_lists[i + 1:]
+    result_forms_founds = []
 
-                if votes_cast and vote_list in other_vote_lists:
-                    form.results_duplicated = vote_list
-                    result_forms_founds.append(form)
+    for _code, form, vote_list in duplicate_votes(forms_and_votes):
+        form.results_duplicated = vote_list
+        result_forms_founds.append(form)
 
     return result_forms_founds
 
@@ -587,6 +566,9 @@ class FormProgressDataView(LoginRequiredMixin,
         'modified_date_formatted',
     )
 
+    def get_initial_queryset(self):
+        return ResultForm.objects.for_listing()
+
     def filter_queryset(self, qs):
         tally_id = self.kwargs['tally_id']
 
@@ -735,7 +717,8 @@ class ResultExportView(LoginRequiredMixin,
         report = kwargs.get('report')
         tally_id = kwargs.get('tally_id')
         if report:
-            return get_result_export_response(report, int(tally_id))
+            return get_result_export_response(report, int(tally_id),
+                                              self.request)
         return super(ResultExportView, self).get(*args, **kwargs)
 
 
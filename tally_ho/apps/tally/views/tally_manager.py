@@ -1,20 +1,22 @@
+import codecs
 import csv
-from io import StringIO
-import json
-import logging
+import hashlib
+import os
 
 from django.contrib.messages.views import SuccessMessageMixin
+from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.http import HttpResponseRedirect, HttpResponse
+from django.http import HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from django.utils.decorators import method_decorator
-from django.views.decorators.csrf import ensure_csrf_cookie
+from django.utils.translation import ugettext as _
 from django.views.generic import (
     FormView,
     TemplateView,
     CreateView,
     UpdateView,
     DeleteView,
+    View,
 )
 from guardian.mixins import LoginRequiredMixin
 
@@ -26,16 +28,16 @@ from tally_ho.apps.tally.forms.edit_user_profile_form import (
 from tally_ho.apps.tally.forms.tally_files_form import TallyFilesForm
 from tally_ho.apps.tally.forms.tally_form import TallyForm
 from tally_ho.apps.tally.management.commands.import_data import (
-    process_sub_constituency_row,
-    process_center_row,
-    process_station_row,
-    process_candidate_row,
-    process_results_form_row,
+    FILE_COLUMNS,
+    STEP_TO_ARGS,
+    UPLOADED_FILES_PATH,
 )
 from tally_ho.apps.tally.models.ballot import Ballot
 from tally_ho.apps.tally.models.candidate import Candidate
 from tally_ho.apps.tally.models.center import Center
+from tally_ho.apps.tally.models.import_job import ImportJob
 from tally_ho.apps.tally.models.office import Office
+from tally_ho.apps.tally.models.result_export import ResultExport
 from tally_ho.apps.tally.models.result_form import ResultForm
 from tally_ho.apps.tally.models.station import Station
 from tally_ho.apps.tally.models.sub_constituency import SubConstituency
@@ -43,101 +45,95 @@ from tally_ho.apps.tally.models.tally import Tally
 from tally_ho.libs.permissions import groups
 from tally_ho.libs.views import mixins
 
+# the tally files form fields and the names their uploads are saved as
+UPLOADED_FILE_NAMES = [
+    ('subconst_file', 'subcontituencies_%d.csv'),
+    ('centers_file', 'centers_%d.csv'),
+    ('stations_file', 'stations_%d.csv'),
+    ('candidates_file', 'candidates_%d.csv'),
+    ('ballots_order_file', 'ballot_order_%d.csv'),
+    ('result_forms_file', 'result_forms_%d.csv'),
+]
+# appended to the names of uploads until all the uploads have been checked
+UPLOADING_SUFFIX = '.uploading'
+
+
+def decode_lines(chunks):
+    """Decode UTF-8 chunks and split them into lines that keep their line
+    endings, as csv.reader expects.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    line = ''
+
+    for chunk in chunks:
+        lines = (line + decoder.decode(chunk)).split('\n')
+        line = lines.pop()
+
+        for complete_line in lines:
+            yield complete_line + '\n'
+
+    line += decoder.decode(b'', final=True)
+
+    if line:
+        yield line
+
 
-BATCH_BLOCK_SIZE = 100
-UPLOADED_FILES_PATH = 'data/uploaded/'
-STEP_TO_ARGS = {
-    1: ['subconst_file',
-        'subconst_file_lines',
-        process_sub_constituency_row],
-    2: ['centers_file',
-        'centers_file_lines',
-        process_center_row],
-    3: ['stations_file',
-        'stations_file_lines',
-        process_station_row],
-    4: ['candidates_file',
-        'candidates_file_lines',
-        process_candidate_row],
-    5: ['result_forms_file',
-        'result_forms_file_lines',
-        process_results_form_row]
-}
-logger = logging.getLogger(__name__)
-
-
-def save_file(file_uploaded, file_name):
-    num_lines = 0
-
-    with open(UPLOADED_FILES_PATH + file_name, 'wb+') as destination:
+def save_file(file_uploaded, file_name, columns=0):
+    """Save an uploaded CSV file and count its records in one pass over the
+    chunks of the upload, the memory used is bounded by the chunk size and
+    the longest line.
+
+    The upload is written next to the file and replaces it once it has been
+    read to the end.
+
+    :param file_uploaded: The uploaded file.
+    :param file_name: The name to save the file as.
+    :param columns: The minimum number of columns of the header.
+
+    :raises ValidationError: If the file is not UTF-8 CSV or the header has
+        fewer columns.
+
+    :returns: The number of records, including the header, and the SHA-256
+        hex digest of the file.
+    """
+    path = UPLOADED_FILES_PATH + file_name
+    partial_path = path + '.part'
+    checksum = hashlib.sha256()
+
+    def chunks():
         for chunk in file_uploaded.chunks():
             destination.write(chunk)
+            checksum.update(chunk)
 
-        file_uploaded.seek(0)
-        fp = StringIO(file_uploaded.read().decode('utf-8'), newline=None)
-        reader = csv.reader(fp, dialect=csv.excel_tab)
-        num_lines = sum(1 for line in reader)
+            yield chunk
 
-    return num_lines
+    try:
+        with open(partial_path, 'wb') as destination:
+            reader = csv.reader(decode_lines(chunks()))
+            header = next(reader, None)
 
+            if header is not None and len(header) < columns:
+                raise ValidationError(
+                    _('The header has %(found)s columns, expected at least '
+                      '%(columns)s.') % {'found': len(header),
+                                         'columns': columns})
 
-def import_rows_batch(tally,
-                      file_to_parse,
-                      file_lines,
-                      offset,
-                      function,
-                      **kwargs):
-    """Import rows for the specific file.
-    """
-    elements_processed = 0
-    id_to_ballot_order = {}
-    ballot_file_to_parse = kwargs.get('ballots_order_file', False)
-
-    if ballot_file_to_parse:
-        with ballot_file_to_parse as f:
-            reader = csv.reader(f)
-            next(reader)  # ignore header
-
-            for row in reader:
-                id_, ballot_number = row
-                id_to_ballot_order[id_] = ballot_number
-
-    with file_to_parse as f:
-        reader = csv.reader(f)
-        count = 0
-        for line, row in enumerate(reader):
-            if count >= offset and count < (offset + BATCH_BLOCK_SIZE):
-                if line != 0:
-                    if id_to_ballot_order:
-                        function(tally, row, id_to_ballot_order)
-                    else:
-                        function(tally, row, logger=logger)
-
-                elements_processed += 1
-            count += 1
-
-    return elements_processed
-
-
-def process_batch_step(current_step, offset, file_map, tally):
-    """Interpret step and map to build arguments for batch
-    processing of data.
-    """
-    ballots_order_file = None
+            num_lines = 0 if header is None else 1 + sum(1 for row in reader)
+    except (UnicodeDecodeError, csv.Error) as e:
+        os.remove(partial_path)
+        raise ValidationError(_('Invalid CSV file: %s') % e)
+    except Exception:
+        os.remove(partial_path)
+        raise
 
-    file_name, file_lines, process_function = STEP_TO_ARGS[current_step]
+    os.replace(partial_path, path)
 
-    if current_step == 4:
-        ballots_order_file = open(
-            UPLOADED_FILES_PATH + file_map['ballots_order_file'], 'rU')
+    return num_lines, checksum.hexdigest()
 
-    return import_rows_batch(
-        tally,
-        open(UPLOADED_FILES_PATH + file_map[file_name], 'rU'),
-        int(file_map[file_lines]),
-        offset,
-        process_function,
-        ballots_order_file=ballots_order_file)
+
+def import_job_totals(job):
+    """The number of lines in the file of each step of an import job."""
+    return [job.files[STEP_TO_ARGS[step][1]] for step in sorted(STEP_TO_ARGS)]
 
 
 class DashboardView(LoginRequiredMixin,
@@ -291,7 +287,7 @@ class TallyFilesFormView(LoginRequiredMixin,
     group_required = groups.TALLY_MANAGER
     template_name = "tally_manager/tally_files_form.html"
     form_class = TallyFilesForm
-    success_url = 'batch-view'
+    success_url = 'import-job'
 
     def get_initial(self):
         initial = super(TallyFilesFormView, self).get_initial()
@@ -299,11 +295,66 @@ class TallyFilesFormView(LoginRequiredMixin,
 
         return initial
 
-    def form_valid(self, form):
+    def save_files(self, form, tally_id):
+        """Save the uploads of the form under temporary names and check
+        them.
+
+        :returns: The files of the import job, keyed as in STEP_TO_ARGS, or
+            None if an upload is invalid.  The uploads are saved as the file
+            names with UPLOADING_SUFFIX appended.
+        """
         data = form.cleaned_data
-        tally_id = data['tally_id']
+        files = {}
+        checksums = {}
+
+        for field, file_name in UPLOADED_FILE_NAMES:
+            file_name = file_name % tally_id
+
+            try:
+                num_lines, checksum = save_file(
+                    data[field], file_name + UPLOADING_SUFFIX,
+                    FILE_COLUMNS[field])
+            except ValidationError as e:
+                form.add_error(field, e)
+
+                return None
+
+            files[field] = file_name
+
+            if checksum in checksums:
+                form.add_error(field, _('The same file as the %s.') %
+                               form.fields[checksums[checksum]].label)
+
+                return None
+
+            checksums[checksum] = field
+            files['%s_lines' % field] = num_lines
+            files['%s_checksum' % field] = checksum
+
+        return files
+
+    def form_valid(self, form):
+        tally_id = form.cleaned_data['tally_id']
+        files = self.save_files(form, tally_id)
+
+        if files is None:
+            for field, file_name in UPLOADED_FILE_NAMES:
+                path = UPLOADED_FILES_PATH + file_name % tally_id +\
+                    UPLOADING_SUFFIX
+
+                if os.path.exists(path):
+                    os.remove(path)
+
+            return self.form_invalid(form)
 
         tally = Tally.objects.get(id=tally_id)
+        # waits for the batch a worker is importing, later batches of the
+        # cancelled jobs are not run, so the files are no longer read
+        ImportJob.cancel_unfinished(tally)
+
+        for field, file_name in UPLOADED_FILE_NAMES:
+            path = UPLOADED_FILES_PATH + files[field]
+            os.replace(path + UPLOADING_SUFFIX, path)
 
         with transaction.atomic():
             Station.objects.filter(tally=tally).delete()
@@ -314,70 +365,38 @@ class TallyFilesFormView(LoginRequiredMixin,
             Ballot.objects.filter(tally=tally).delete()
             Candidate.objects.filter(tally=tally).delete()
             ResultForm.objects.filter(tally=tally).delete()
+            ResultExport.reset(tally.pk)
 
-        subconst_file = 'subcontituencies_%d.csv' % (tally_id)
-        subconst_file_lines = save_file(data['subconst_file'], subconst_file)
-
-        centers_file = 'centers_%d.csv' % (tally_id)
-        centers_file_lines = save_file(data['centers_file'], centers_file)
-
-        stations_file = 'stations_%d.csv' % (tally_id)
-        stations_file_lines = save_file(data['stations_file'], stations_file)
-
-        candidates_file = 'candidates_%d.csv' % (tally_id)
-        candidates_file_lines = save_file(data['candidates_file'],
-                                          candidates_file)
-
-        ballots_order_file = 'ballot_order_%d.csv' % (tally_id)
-        ballots_order_file_lines = save_file(data['ballots_order_file'],
-                                             ballots_order_file)
-
-        result_forms_file = 'result_forms_%d.csv' % (tally_id)
-        result_forms_file_lines = save_file(data['result_forms_file'],
-                                            result_forms_file)
-
-        url_kwargs = {'tally_id': tally_id,
-                      'subconst_file': subconst_file,
-                      'subconst_file_lines': subconst_file_lines,
-                      'centers_file': centers_file,
-                      'centers_file_lines': centers_file_lines,
-                      'stations_file': stations_file,
-                      'stations_file_lines': stations_file_lines,
-                      'candidates_file': candidates_file,
-                      'candidates_file_lines': candidates_file_lines,
-                      'ballots_order_file': ballots_order_file,
-                      'ballots_order_file_lines': ballots_order_file_lines,
-                      'result_forms_file': result_forms_file,
-                      'result_forms_file_lines': result_forms_file_lines}
+        job = ImportJob.objects.create(tally=tally, files=files)
 
         return HttpResponseRedirect(reverse(self.success_url,
-                                            kwargs=url_kwargs))
+                                            kwargs={'job_id': job.pk}))
 
 
-class BatchView(LoginRequiredMixin,
-                mixins.GroupRequiredMixin,
-                SuccessMessageMixin,
-                TemplateView):
+class ImportJobView(LoginRequiredMixin,
+                    mixins.GroupRequiredMixin,
+                    TemplateView):
     group_required = groups.TALLY_MANAGER
     template_name = "tally_manager/batch_progress.html"
 
-    def get_initial(self):
-        initial = super(TallyFilesFormView, self).get_initial()
-        initial['tally_id'] = self.kwargs['tally_id']
-
-        return initial
+    def get(self, *args, **kwargs):
+        job = get_object_or_404(ImportJob, id=kwargs['job_id'])
 
-    @method_decorator(ensure_csrf_cookie)
-    def post(self, request, *args, **kwargs):
-        tally = Tally.objects.get(id=kwargs['tally_id'])
+        return self.render_to_response(self.get_context_data(job=job))
 
-        offset = int(request.POST.get('offset', 0))
-        current_step = int(request.POST.get('step', 1))
 
-        elements_processed = process_batch_step(
-            current_step, offset, kwargs, tally)
+class ImportJobStatusView(LoginRequiredMixin,
+                          mixins.GroupRequiredMixin,
+                          View):
+    group_required = groups.TALLY_MANAGER
 
-        return HttpResponse(json.dumps({
-            'status': 'OK',
-            'elements_processed': elements_processed}),
-                            content_type='application/json')
+    def get(self, *args, **kwargs):
+        job = get_object_or_404(ImportJob, id=kwargs['job_id'])
+
+        return JsonResponse({
+            'status': job.status.name,
+            'step': job.step,
+            'rows_processed': job.rows_processed,
+            'rows_per_second': round(job.rows_per_second, 1),
+            'totals': import_job_totals(job),
+            'error': job.error})
@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+
+CACHE_KEY = 'ballot_metadata:%s'
+SUB_CONSTITUENCY_BALLOTS = [
+    ('sc_general', 'ballot_general_id'),
+    ('sc_women', 'ballot_women_id'),
+    ('sc_component', 'ballot_component_id'),
+]
+
+
+class BallotMetadata(object):
+    """The ordered candidates and the sub constituencies of a ballot."""
+    def __init__(self, ballot_id):
+        self.ballot_id = ballot_id
+        self.candidates = []
+        self.sc_general = None
+        self.sc_women = None
+        self.sc_component = None
+
+    @property
+    def component_ballot(self):
+        return self.sc_general.ballot_component if self.sc_general else None
+
+
+def version_key(tally_id):
+    return CACHE_KEY % tally_id
+
+
+def cache_key(tally_id):
+    """The cache key of the ballot metadata of a tally, at the current
+    version of the metadata in the database.
+    """
+    from tally_ho.apps.tally.models.cache_version import CacheVersion
+
+    key = version_key(tally_id)
+
+    return '%s:%s' % (key, CacheVersion.current(key))
+
+
+def load_ballot_metadata(tally_id):
+    """Load the metadata of all ballots in a tally in three queries.
+
+    :param tally_id: The tally to load ballots for, None for the ballots
+        without a tally.
+
+    :returns: A dictionary of ballot id to `BallotMetadata`.
+    """
+    from tally_ho.apps.tally.models.ballot import Ballot
+    from tally_ho.apps.tally.models.candidate import Candidate
+    from tally_ho.apps.tally.models.sub_constituency import SubConstituency
+
+    ballot_pks = Ballot.objects.filter(tally_id=tally_id).values('id')
+    ballots = {row['id']: BallotMetadata(row['id']) for row in ballot_pks}
+
+    for candidate in Candidate.objects.filter(
+            ballot__tally_id=tally_id).order_by('race_type', 'order', 'id'):
+        ballots[candidate.ballot_id].candidates.append(candidate)
+
+    sub_constituencies = SubConstituency.objects.filter(
+        Q(ballot_general__in=ballot_pks) |
+        Q(ballot_women__in=ballot_pks) |
+        Q(ballot_component__in=ballot_pks)).select_related(
+        'ballot_component')
+
+    # the sub constituency with the lowest id wins, as with first()
+    for sc in sub_constituencies.order_by('-id'):
+        for name, ballot_field in SUB_CONSTITUENCY_BALLOTS:
+            metadata = ballots.get(getattr(sc, ballot_field))
+
+            if metadata:
+                setattr(metadata, name, sc)
+
+    return ballots
+
+
+def ballot_metadata(ballot):
+    """Return the cached metadata of a ballot, loading the metadata of its
+    tally on a cache miss.
+
+    The version of the metadata is read from the database on each call, it
+    is replaced when a candidate, ballot or sub constituency of the tally is
+    saved or deleted, so every process sees the change.
+    `BALLOT_METADATA_CACHE_TIMEOUT` bounds the staleness of changes made
+    without saving models.
+
+    :param ballot: The ballot to return metadata for.
+
+    :returns: A `BallotMetadata`.
+    """
+    key = cache_key(ballot.tally_id)
+    ballots = cache.get(key)
+
+    if ballots is None or ballot.pk not in ballots:
+        ballots = load_ballot_metadata(ballot.tally_id)
+        cache.set(key, ballots, settings.BALLOT_METADATA_CACHE_TIMEOUT)
+
+    return ballots.get(ballot.pk) or BallotMetadata(ballot.pk)
+
+
+def invalidate_ballot_metadata(*tally_ids):
+    """Replace the version of the ballot metadata of tallies in the current
+    transaction, all processes load the metadata again once it commits.
+    """
+    from tally_ho.apps.tally.models.cache_version import CacheVersion
+
+    CacheVersion.replace(*[version_key(tally_id) for tally_id in tally_ids])
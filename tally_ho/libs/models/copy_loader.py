@@ -0,0 +1,111 @@
+from io import StringIO
+import csv
+
+from django.db import connection, transaction
+
+NULL = r'\N'
+STAGING_TABLE = 'import_staging'
+
+
+def copy_supported():
+    """Return True if the database supports loading rows with COPY."""
+    return connection.vendor == 'postgresql'
+
+
+class RowsFile(object):
+    """A read only file of rows as CSV lines, the lines are written as they
+    are read so that COPY streams the rows.
+
+    :param rows: An iterable of tuples, None is written as NULL.
+    """
+    def __init__(self, rows):
+        self.lines = self.csv_lines(rows)
+        self.buffer = ''
+
+    @staticmethod
+    def csv_lines(rows):
+        line = StringIO()
+        writer = csv.writer(line)
+
+        for row in rows:
+            writer.writerow([NULL if value is None else value
+                             for value in row])
+            yield line.getvalue()
+            line.seek(0)
+            line.truncate()
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            try:
+                self.buffer += next(self.lines)
+            except StopIteration:
+                break
+
+        if size < 0:
+            size = len(self.buffer)
+
+        chunk, self.buffer = self.buffer[:size], self.buffer[size:]
+
+        return chunk
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def copy_insert(model, columns, rows, select, joins, template,
+                join_params=None):
+    """Insert rows into the table of a model by copying them into a
+    temporary staging table and inserting them with one INSERT ... SELECT,
+    which resolves foreign keys by joining the staging table with the
+    related tables.
+
+    :param model: The model to insert rows for.
+    :param columns: A list of the (name, SQL type) of the staging table
+        columns.
+    :param rows: An iterable of tuples of the staging table columns.
+    :param select: A dictionary of model field names to SQL expressions over
+        the staging table `s` and the joined tables.
+    :param joins: The SQL joins of the staging table `s`.
+    :param template: An unsaved model instance with the values of the fields
+        that are not selected.
+    :param join_params: The parameters of the joins.
+
+    :returns: A list of the ids of the inserted rows.
+    """
+    quote = connection.ops.quote_name
+    fields = [field for field in model._meta.concrete_fields
+              if not field.primary_key]
+    expressions = []
+    params = []
+
+    for field in fields:
+        if field.name in select:
+            expressions.append(select[field.name])
+        else:
+            expressions.append('%s')
+            params.append(field.get_db_prep_save(
+                field.pre_save(template, True), connection))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('DROP TABLE IF EXISTS %s' % STAGING_TABLE)
+        cursor.execute('CREATE TEMPORARY TABLE %s (%s) ON COMMIT DROP' % (
+            STAGING_TABLE,
+            ', '.join('%s %s' % (name, sql_type)
+                      for name, sql_type in columns)))
+        cursor.copy_expert(
+            "COPY %s (%s) FROM STDIN WITH (FORMAT csv, NULL '%s')" % (
+                STAGING_TABLE, ', '.join(name for name, _ in columns), NULL),
+            RowsFile(rows))
+        cursor.execute(
+            'INSERT INTO %s (%s) SELECT %s FROM %s s %s RETURNING %s' % (
+                quote(model._meta.db_table),
+                ', '.join(quote(field.column) for field in fields),
+                ', '.join(expressions),
+                STAGING_TABLE,
+                joins,
+                quote(model._meta.pk.column)),
+            params + (join_params or []))
+        ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute('DROP TABLE %s' % STAGING_TABLE)
+
+    return ids
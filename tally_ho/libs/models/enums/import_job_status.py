@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class ImportJobStatus(Enum):
+    PENDING = 0
+    RUNNING = 1
+    COMPLETE = 2
+    FAILED = 3
+    CANCELLED = 4
@@ -0,0 +1,30 @@
+from collections import Counter, OrderedDict
+
+
+def duplicate_votes(forms_and_votes):
+    """Find the forms with the same votes as another form in their center.
+
+    The ordered vote vector of each form is used once as a fingerprint and
+    forms are counted by center and fingerprint in a dictionary, so finding
+    the duplicates is linear in the number of forms.
+
+    :param forms_and_votes: An iterable of (center, form, votes) tuples, where
+        votes is a tuple of the final votes per candidate in candidate order.
+
+    :returns: A list of (center, form, votes) tuples for the forms with votes
+        cast that share their votes with another form in the same center,
+        grouped by center in the order the centers and forms were passed.
+    """
+    centers_to_forms = OrderedDict()
+    fingerprints = Counter()
+
+    for center, form, votes in forms_and_votes:
+        centers_to_forms.setdefault(center, []).append((form, votes))
+
+        if sum(votes) > 0:
+            fingerprints[center, votes] += 1
+
+    return [(center, form, votes)
+            for center, forms in centers_to_forms.items()
+            for form, votes in forms
+            if fingerprints[center, votes] > 1]
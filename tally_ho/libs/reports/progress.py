@@ -1,9 +1,22 @@
+from django.db import transaction
+from django.db.models import Count, Q, Sum
 from django.db.models.query import QuerySet
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import ugettext as _
 
+from tally_ho.apps.tally.models.ballot import (
+    Ballot,
+    document_name,
+    form_ballot_numbers,
+    race_type_name,
+    sub_constituency,
+)
+from tally_ho.apps.tally.models.form_state_count import FormStateCount
+from tally_ho.apps.tally.models.office import Office
 from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.apps.tally.models.sub_constituency import SubConstituency
 from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.utils.collections import flatten
 
 
 def rounded_percent(numerator, denominator):
@@ -11,10 +24,258 @@ def rounded_percent(numerator, denominator):
         denominator > 0 else 0
 
 
-class ProgressReport(object):
+def tally_form_state_counts(tally_id=None):
+    """Return the stored form state counts, optionally of one tally."""
+    counts = FormStateCount.objects.filter(count__gt=0)
+
+    return counts.filter(tally__id=tally_id) if tally_id else counts
+
+
+def form_state_counts(tally_id=None):
+    """Count the distinct result forms in each form state.
+
+    :param tally_id: The tally to count result forms for.
+
+    :returns: A dict mapping every form state to the number of distinct
+        result forms in that state, read from the stored form state counts.
+    """
+    counts = {form_state: 0 for form_state in FormState}
+
+    for form_state, count in tally_form_state_counts(tally_id).values_list(
+            'form_state').annotate(Sum('count')).order_by():
+        counts[FormState(form_state)] = count
+
+    return counts
+
+
+def counted_form_states(tally_id=None):
+    """Count the distinct result forms for each tally, office of their
+    center, ballot and form state.
+
+    :param tally_id: The tally to count result forms for, or None for all.
+
+    :returns: A dict mapping form state count keys to numbers of forms.
+    """
+    rows = ResultForm.objects.filter(
+        id__in=ResultForm.distinct_form_pks(tally_id)).values_list(
+        'tally', 'center__office', 'ballot', 'form_state').annotate(
+        Count('id')).order_by()
+
+    return {(tally, office, ballot, FormState(form_state)): count
+            for tally, office, ballot, form_state, count in rows}
+
+
+def stored_form_state_counts(tally_id=None):
+    """Return the form state counts stored in the form state count table,
+    summed over duplicate keys.
+    """
+    counts = FormStateCount.objects.all()
+
+    if tally_id:
+        counts = counts.filter(tally__id=tally_id)
+
+    rows = counts.values_list(
+        'tally', 'office', 'ballot', 'form_state').annotate(
+        Sum('count')).order_by()
+
+    return {(tally, office, ballot, FormState(form_state)): count
+            for tally, office, ballot, form_state, count in rows if count}
+
+
+def form_state_count_drift(tally_id=None):
+    """Compare the stored form state counts to the result forms.
+
+    :param tally_id: The tally to compare counts for, or None for all.
+
+    :returns: A dict mapping the keys that differ to a tuple of the stored
+        and the actual count.
+    """
+    stored = stored_form_state_counts(tally_id)
+    actual = counted_form_states(tally_id)
+
+    return {key: (stored.get(key, 0), actual.get(key, 0))
+            for key in set(stored) | set(actual)
+            if stored.get(key, 0) != actual.get(key, 0)}
+
+
+def rebuild_form_state_counts(tally_id=None):
+    """Replace the stored form state counts with counts of the result forms.
+
+    :param tally_id: The tally to rebuild counts for, or None for all.
+    """
+    with transaction.atomic():
+        counts = FormStateCount.objects.all()
+
+        if tally_id:
+            counts = counts.filter(tally__id=tally_id)
+
+        counts.delete()
+        FormStateCount.objects.bulk_create([
+            FormStateCount(tally_id=tally,
+                           office_id=office,
+                           ballot_id=ballot,
+                           form_state=form_state,
+                           count=count)
+            for (tally, office, ballot, form_state), count in
+            counted_form_states(tally_id).items()])
+
+
+def office_progress(tally_id):
+    """Count the intaken, not intaken and archived distinct result forms for
+    each office of a tally from the stored form state counts.
+
+    :param tally_id: The tally to count result forms for.
+
+    :returns: A list of dicts with the office name and number and the form
+        counts, ordered by office number.
+    """
+    unsubmitted = Q(form_state=FormState.UNSUBMITTED)
+    rows = tally_form_state_counts(tally_id).values('office').annotate(
+        intaken=Sum('count', filter=~unsubmitted),
+        not_intaken=Sum('count', filter=unsubmitted),
+        archived=Sum('count', filter=Q(form_state=FormState.ARCHIVED))
+    ).order_by()
+    offices_to_counts = {row['office']: row for row in rows}
+
+    data = []
+
+    for office in Office.objects.filter(
+            tally__id=tally_id).order_by('number'):
+        counts = offices_to_counts.get(office.id, {})
+        data.append({
+            'office': office.name,
+            'number': office.number,
+            'intaken': counts.get('intaken') or 0,
+            'not_intaken': counts.get('not_intaken') or 0,
+            'archived': counts.get('archived') or 0,
+        })
+
+    return data
+
+
+def race_ballots(tally_id):
+    """Return the ballots of a tally that belong to a sub constituency.
+
+    :param tally_id: The tally to return ballots for.
+
+    :returns: A queryset of ballots ordered by number.
+    """
+    return Ballot.objects.filter(
+        Q(sc_general__isnull=False) |
+        Q(sc_women__isnull=False) |
+        Q(sc_component__isnull=False),
+        tally__id=tally_id).distinct().order_by('number')
+
+
+def race_progress(tally_id, ballots=None):
+    """Count the expected and archived distinct result forms for each race.
+
+    The forms of a component ballot are those of its general ballots, see
+    `form_ballot_numbers`.  The forms are read from the stored form state
+    counts grouped by ballot number and the sub constituencies are loaded in
+    one query.
+
+    :param tally_id: The tally to count result forms for.
+    :param ballots: The ballots to return progress for, e.g. a page of
+        ballots, defaults to all race ballots of the tally.
+
+    :returns: A list of dicts with the race details and progress.
+    """
+    if ballots is None:
+        ballots = race_ballots(tally_id)
+
+    ballots = list(ballots)
+    ballot_ids = [ballot.id for ballot in ballots]
+
+    sc_general, sc_women, sc_component = {}, {}, {}
+
+    for sc in SubConstituency.objects.filter(
+            Q(ballot_general__in=ballot_ids) |
+            Q(ballot_women__in=ballot_ids) |
+            Q(ballot_component__in=ballot_ids)).select_related(
+            'ballot_component').order_by('id'):
+        sc_general.setdefault(sc.ballot_general_id, sc)
+        sc_women.setdefault(sc.ballot_women_id, sc)
+        sc_component.setdefault(sc.ballot_component_id, sc)
+
+    numbers = set(flatten(
+        [form_ballot_numbers(ballot.number) for ballot in ballots]))
+    rows = tally_form_state_counts(tally_id).filter(
+        ballot__number__in=numbers).values('ballot__number').annotate(
+        expected=Sum('count'),
+        complete=Sum('count', filter=Q(form_state=FormState.ARCHIVED))
+    ).order_by()
+    numbers_to_counts = {row['ballot__number']: row for row in rows}
+
+    data = []
+
+    for ballot in ballots:
+        sc = sub_constituency(sc_component.get(ballot.id),
+                              sc_women.get(ballot.id),
+                              sc_general.get(ballot.id))
+
+        if not sc:
+            continue
+
+        counts = [numbers_to_counts.get(number, {})
+                  for number in form_ballot_numbers(ballot.number)]
+        expected = sum(count.get('expected') or 0 for count in counts)
+        complete = sum(count.get('complete') or 0 for count in counts)
+
+        data.append({
+            'ballot': ballot.number,
+            'district': sc.code,
+            'race_type': race_type_name(ballot.race_type,
+                                        sc_general.get(ballot.id)),
+            'document': ballot.document.name,
+            'document_name': document_name(ballot.document.name),
+            'expected': expected,
+            'complete': complete,
+            'percentage': rounded_percent(complete, expected)
+            if expected > 0 else _(u"No results"),
+            'id': ballot.id,
+            'active': ballot.active,
+        })
+
+    return data
+
+
+class ProgressSummary(object):
+    """The form state counts for a tally, shared by its progress reports so
+    that the counts are only queried once.
+    """
 
     def __init__(self, tally_id):
         self.tally_id = tally_id
+        self._counts = None
+
+    @property
+    def counts(self):
+        if self._counts is None:
+            self._counts = form_state_counts(self.tally_id)
+
+        return self._counts
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def count(self, form_states=None):
+        """Return the number of forms in the form states, or all forms if
+        form states is None.
+        """
+        if form_states is None:
+            return self.total
+
+        return sum(self.counts[form_state] for form_state in form_states)
+
+
+class ProgressReport(object):
+    form_states = None
+
+    def __init__(self, tally_id, summary=None):
+        self.tally_id = tally_id
+        self.summary = summary or ProgressSummary(tally_id)
         self.filtered_queryset = self.queryset = \
             ResultForm.distinct_forms(tally_id)
 
@@ -34,7 +295,7 @@ class ProgressReport(object):
 
     def numerator(self, filtered_queryset=None):
         if not filtered_queryset:
-            return self.get_filtered_queryset().count()
+            return self.summary.count(self.form_states)
 
         return filtered_queryset.count()
 
@@ -42,7 +303,7 @@ class ProgressReport(object):
 
     def denominator(self, queryset=None):
         if not queryset:
-            return self.get_queryset().count()
+            return self.summary.total
 
         return queryset.count()
 
@@ -87,17 +348,19 @@ class ProgressReport(object):
 class ExpectedProgressReport(ProgressReport):
     label = _(u"Expected")
 
-    def __init__(self, tally_id):
-        super(ExpectedProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(ExpectedProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.distinct_forms(self.tally_id)
 
 
 class IntakenProgressReport(ProgressReport):
     label = _(u"Intaken")
+    form_states = tuple(form_state for form_state in FormState
+                        if form_state != FormState.UNSUBMITTED)
 
-    def __init__(self, tally_id):
-        super(IntakenProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(IntakenProgressReport, self).__init__(tally_id, summary)
 
         pks = ResultForm.distinct_form_pks(self.tally_id)
 
@@ -107,9 +370,10 @@ class IntakenProgressReport(ProgressReport):
 
 class ArchivedProgressReport(ProgressReport):
     label = _(u"Archived")
+    form_states = (FormState.ARCHIVED,)
 
-    def __init__(self, tally_id):
-        super(ArchivedProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(ArchivedProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.ARCHIVED, tally_id=self.tally_id)
@@ -117,9 +381,10 @@ class ArchivedProgressReport(ProgressReport):
 
 class IntakeProgressReport(ProgressReport):
     label = _(u"Intake")
+    form_states = (FormState.INTAKE,)
 
-    def __init__(self, tally_id):
-        super(IntakeProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(IntakeProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.INTAKE, tally_id=self.tally_id)
@@ -127,9 +392,10 @@ class IntakeProgressReport(ProgressReport):
 
 class ClearanceProgressReport(ProgressReport):
     label = _(u"Clearance")
+    form_states = (FormState.CLEARANCE,)
 
-    def __init__(self, tally_id):
-        super(ClearanceProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(ClearanceProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.CLEARANCE, tally_id=self.tally_id)
@@ -137,9 +403,10 @@ class ClearanceProgressReport(ProgressReport):
 
 class DataEntry1ProgressReport(ProgressReport):
     label = _(u"Data Entry 1")
+    form_states = (FormState.DATA_ENTRY_1,)
 
-    def __init__(self, tally_id):
-        super(DataEntry1ProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(DataEntry1ProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.DATA_ENTRY_1, tally_id=self.tally_id)
@@ -147,9 +414,10 @@ class DataEntry1ProgressReport(ProgressReport):
 
 class DataEntry2ProgressReport(ProgressReport):
     label = _(u"Data Entry 2")
+    form_states = (FormState.DATA_ENTRY_2,)
 
-    def __init__(self, tally_id):
-        super(DataEntry2ProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(DataEntry2ProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.DATA_ENTRY_2, tally_id=self.tally_id)
@@ -157,9 +425,10 @@ class DataEntry2ProgressReport(ProgressReport):
 
 class CorrectionProgressReport(ProgressReport):
     label = _(u"Correction")
+    form_states = (FormState.CORRECTION,)
 
-    def __init__(self, tally_id):
-        super(CorrectionProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(CorrectionProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.CORRECTION, tally_id=self.tally_id)
@@ -167,9 +436,10 @@ class CorrectionProgressReport(ProgressReport):
 
 class QualityControlProgressReport(ProgressReport):
     label = _(u"Quality Control")
+    form_states = (FormState.QUALITY_CONTROL,)
 
-    def __init__(self, tally_id):
-        super(QualityControlProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(QualityControlProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.QUALITY_CONTROL, tally_id=self.tally_id)
@@ -177,9 +447,10 @@ class QualityControlProgressReport(ProgressReport):
 
 class AuditProgressReport(ProgressReport):
     label = _(u"Audit")
+    form_states = (FormState.AUDIT,)
 
-    def __init__(self, tally_id):
-        super(AuditProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(AuditProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.AUDIT, tally_id=self.tally_id)
@@ -187,9 +458,10 @@ class AuditProgressReport(ProgressReport):
 
 class NotRecievedProgressReport(ProgressReport):
     label = _(u"Not Received")
+    form_states = (FormState.UNSUBMITTED,)
 
-    def __init__(self, tally_id):
-        super(NotRecievedProgressReport, self).__init__(tally_id)
+    def __init__(self, tally_id, summary=None):
+        super(NotRecievedProgressReport, self).__init__(tally_id, summary)
 
         self.filtered_queryset = ResultForm.forms_in_state(
             FormState.UNSUBMITTED, tally_id=self.tally_id)
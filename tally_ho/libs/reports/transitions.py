@@ -0,0 +1,119 @@
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import Trunc
+
+from tally_ho.apps.tally.models.form_state_transition import\
+    FormStateTransition
+from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.libs.models.enums.form_state import FormState
+
+PERCENTILES = [0.5, 0.9, 0.99]
+
+TIME_IN_STATE_SQL = """
+SELECT state, count(*), percentile_cont(%%s::float8[]) WITHIN GROUP (
+    ORDER BY seconds)
+FROM (
+    SELECT t.to_state AS state,
+           extract(epoch FROM lead(t.created_date) OVER (
+               PARTITION BY t.result_form_id
+               ORDER BY t.created_date, t.id) - t.created_date) AS seconds
+    FROM %(transitions)s t
+    JOIN %(result_forms)s f ON f.id = t.result_form_id
+    WHERE f.tally_id = %%s
+) AS durations
+WHERE seconds IS NOT NULL
+GROUP BY state
+"""
+
+CLERK_PRODUCTIVITY_SQL = """
+SELECT user_id, count(*), count(DISTINCT result_form_id),
+       percentile_cont(0.5) WITHIN GROUP (ORDER BY seconds)
+FROM (
+    SELECT t.user_id, t.result_form_id,
+           extract(epoch FROM t.created_date - lag(t.created_date) OVER (
+               PARTITION BY t.user_id
+               ORDER BY t.created_date, t.id)) AS seconds
+    FROM %(transitions)s t
+    JOIN %(result_forms)s f ON f.id = t.result_form_id
+    WHERE f.tally_id = %%s AND t.user_id IS NOT NULL
+          AND t.created_date >= %%s
+) AS intervals
+GROUP BY user_id
+"""
+
+
+def tables():
+    return {
+        'transitions': FormStateTransition._meta.db_table,
+        'result_forms': ResultForm._meta.db_table,
+    }
+
+
+def transitions(tally_id, since=None):
+    qs = FormStateTransition.objects.filter(result_form__tally__id=tally_id)
+
+    return qs.filter(created_date__gte=since) if since else qs
+
+
+def throughput(tally_id, since=None):
+    """Count the result forms that left each form state per hour.
+
+    :param tally_id: The tally to count transitions for.
+    :param since: Only count transitions at or after this time.
+
+    :returns: A list of dicts with the hour, the state left and the number
+        of forms, ordered by hour.
+    """
+    rows = transitions(tally_id, since).filter(
+        from_state__isnull=False).annotate(
+        hour=Trunc('created_date', 'hour')).values(
+        'hour', 'from_state').annotate(forms=Count('id')).order_by(
+        'hour', 'from_state')
+
+    return [{'hour': row['hour'],
+             'state': FormState(row['from_state']),
+             'forms': row['forms']} for row in rows]
+
+
+def time_in_state(tally_id, percentiles=PERCENTILES):
+    """Compute percentiles of the time result forms spent in each state.
+
+    The time in a state is the time from a transition into the state to the
+    next transition of the same result form, using a window over the
+    transitions of each form.  Forms still in a state are not included.
+
+    :param tally_id: The tally to compute times for.
+    :param percentiles: The percentiles to compute, as fractions.
+
+    :returns: A dict mapping form states to dicts with the number of
+        completed stays and a dict mapping percentiles to seconds.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(TIME_IN_STATE_SQL % tables(),
+                       [list(percentiles), tally_id])
+        rows = cursor.fetchall()
+
+    return {FormState(state): {'count': count,
+                               'seconds': dict(zip(percentiles, seconds))}
+            for state, count, seconds in rows}
+
+
+def clerk_productivity(tally_id, since=None):
+    """Compute the number of transitions and result forms handled by each
+    user, and the median time between consecutive transitions of the user.
+
+    :param tally_id: The tally to compute productivity for.
+    :param since: Only include transitions at or after this time.
+
+    :returns: A dict mapping user ids to dicts with the number of
+        transitions, the number of forms and the median interval in seconds.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(CLERK_PRODUCTIVITY_SQL % tables(),
+                       [tally_id, since or '-infinity'])
+        rows = cursor.fetchall()
+
+    return {user_id: {'transitions': num_transitions,
+                      'forms': forms,
+                      'median_seconds': median}
+            for user_id, num_transitions, forms, median in rows}
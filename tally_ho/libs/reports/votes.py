@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+from django.db.models import Count, Q, Sum
+
+from tally_ho.libs.models.enums.entry_version import EntryVersion
+from tally_ho.libs.models.enums.form_state import FormState
+
+
+CandidateVotes = namedtuple('CandidateVotes', [
+    'num_results',
+    'votes',
+    'quarantine_votes',
+    'all_votes',
+])
+
+NO_VOTES = CandidateVotes(0, 0, 0, 0)
+
+ARCHIVED = Q(result_form__form_state=FormState.ARCHIVED)
+QUARANTINED = Q(result_form__form_state=FormState.AUDIT)
+
+
+def final_results(results):
+    """Restrict results to active final results in archived or quarantined
+    forms.
+
+    Only one result per candidate and result form is kept, as if the results
+    were made distinct on the result form for each candidate.
+
+    :param results: A queryset of results to restrict.
+
+    :returns: A queryset of results.
+    """
+    results = results.filter(
+        ARCHIVED | QUARANTINED,
+        entry_version=EntryVersion.FINAL,
+        active=True)
+
+    return results.filter(id__in=results.order_by(
+        'candidate', 'result_form', 'id').distinct(
+        'candidate', 'result_form').values('id'))
+
+
+def candidate_votes(results):
+    """Compute the vote totals for all candidates in a single grouped query.
+
+    For each candidate the number of archived forms with results, the votes in
+    archived forms, the votes in quarantined forms and the sum of both are
+    computed using conditional sums.
+
+    :param results: A queryset of results to compute totals over, e.g. the
+        results for the forms in a tally.
+
+    :returns: A dict mapping candidate ids to `CandidateVotes`.  Candidates
+        without final results are not included, use `NO_VOTES` for them.
+    """
+    rows = final_results(results).values('candidate').annotate(
+        archived_forms=Count('result_form', filter=ARCHIVED, distinct=True),
+        archived_votes=Sum('votes', filter=ARCHIVED),
+        quarantined_votes=Sum('votes', filter=QUARANTINED)).order_by()
+
+    totals = {}
+
+    for row in rows:
+        votes = row['archived_votes'] or 0
+        quarantine_votes = row['quarantined_votes'] or 0
+
+        totals[row['candidate']] = CandidateVotes(
+            row['archived_forms'], votes, quarantine_votes,
+            votes + quarantine_votes)
+
+    return totals
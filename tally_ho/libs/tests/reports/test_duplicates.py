@@ -0,0 +1,25 @@
+from django.test import TestCase
+
+from tally_ho.libs.reports.duplicates import duplicate_votes
+
+
+class TestDuplicates(TestCase):
+    def test_duplicate_votes(self):
+        forms_and_votes = [
+            (1, 'a', (1, 2)),
+            (2, 'b', (1, 2)),
+            (1, 'c', (2, 1)),
+            (1, 'd', (1, 2)),
+            (2, 'e', (0, 0)),
+            (2, 'f', (0, 0)),
+            (2, 'g', (2, 1)),
+        ]
+
+        self.assertEqual(duplicate_votes(forms_and_votes), [
+            (1, 'a', (1, 2)),
+            (1, 'd', (1, 2)),
+        ])
+
+    def test_duplicate_votes_none(self):
+        self.assertEqual(duplicate_votes([]), [])
+        self.assertEqual(duplicate_votes([(1, 'a', (1, 2))]), [])
@@ -0,0 +1,113 @@
+from tally_ho.apps.tally.models.sub_constituency import SubConstituency
+from tally_ho.apps.tally.views.reports.offices import getOverviews
+from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.reports import progress
+from tally_ho.libs.tests.test_base import create_ballot, create_center,\
+    create_office, create_result_form, create_tally, TestBase
+
+
+class TestProgress(TestBase):
+    def setUp(self):
+        self.tally = create_tally()
+        ballot = create_ballot(tally=self.tally)
+        center = create_center(tally=self.tally)
+        center.office = create_office(tally=self.tally)
+        center.save()
+
+        for i, form_state in enumerate([FormState.ARCHIVED,
+                                        FormState.ARCHIVED,
+                                        FormState.AUDIT,
+                                        FormState.UNSUBMITTED]):
+            create_result_form(
+                barcode=i, serial_number=i, station_number=i,
+                form_state=form_state, ballot=ballot, center=center,
+                tally=self.tally)
+
+        # a replacement form for the same station is not counted twice
+        create_result_form(
+            barcode=4, serial_number=4, station_number=0,
+            form_state=FormState.INTAKE, ballot=ballot, center=center,
+            tally=self.tally)
+
+    def test_form_state_counts(self):
+        with self.assertNumQueries(1):
+            counts = progress.form_state_counts(self.tally.pk)
+
+        self.assertEqual(counts[FormState.ARCHIVED], 2)
+        self.assertEqual(counts[FormState.AUDIT], 1)
+        self.assertEqual(counts[FormState.UNSUBMITTED], 1)
+        self.assertEqual(counts[FormState.INTAKE], 0)
+        self.assertEqual(len(counts), len(FormState))
+
+    def test_overviews(self):
+        overviews = getOverviews(self.tally.pk)
+
+        with self.assertNumQueries(1):
+            values = {overview.label: (overview.numerator(),
+                                       overview.percentage)
+                      for overview in overviews}
+
+        self.assertEqual(values[progress.ExpectedProgressReport.label],
+                         (4, 100.0))
+        self.assertEqual(values[progress.ArchivedProgressReport.label],
+                         (2, 50.0))
+        self.assertEqual(values[progress.AuditProgressReport.label],
+                         (1, 25.0))
+        self.assertEqual(values[progress.IntakeProgressReport.label],
+                         (0, 0.0))
+
+    def test_intaken(self):
+        report = progress.IntakenProgressReport(self.tally.pk)
+
+        self.assertEqual(report.number, 3)
+        self.assertEqual(report.total, 4)
+
+    def test_office_progress(self):
+        create_office('empty', tally=self.tally)
+
+        with self.assertNumQueries(2):
+            data = progress.office_progress(self.tally.pk)
+
+        self.assertEqual(len(data), 2)
+        counts = {row['office']: (row['intaken'], row['not_intaken'],
+                                  row['archived']) for row in data}
+        self.assertEqual(counts['office'], (3, 1, 2))
+        self.assertEqual(counts['empty'], (0, 0, 0))
+
+
+class TestRaceProgress(TestBase):
+    def setUp(self):
+        self.tally = create_tally()
+        general = create_ballot(tally=self.tally, number=34)
+        component = create_ballot(tally=self.tally, number=57)
+        create_ballot(tally=self.tally, number=99)
+        SubConstituency.objects.create(code=2, field_office='1',
+                                       ballot_general=general,
+                                       ballot_component=component)
+        center = create_center(tally=self.tally)
+
+        for i, form_state in enumerate([FormState.ARCHIVED,
+                                        FormState.INTAKE]):
+            create_result_form(
+                barcode=i, serial_number=i, station_number=i,
+                form_state=form_state, ballot=general, center=center,
+                tally=self.tally)
+
+    def test_race_ballots(self):
+        self.assertEqual(
+            [ballot.number for ballot in progress.race_ballots(
+                self.tally.pk)], [34, 57])
+
+    def test_race_progress(self):
+        with self.assertNumQueries(3):
+            data = progress.race_progress(self.tally.pk)
+
+        self.assertEqual([row['ballot'] for row in data], [34, 57])
+        self.assertEqual(data[0]['race_type'], 'General and Component')
+
+        # the component race counts the forms of its general ballot
+        for row in data:
+            self.assertEqual(row['district'], 2)
+            self.assertEqual(row['expected'], 2)
+            self.assertEqual(row['complete'], 1)
+            self.assertEqual(row['percentage'], 50.0)
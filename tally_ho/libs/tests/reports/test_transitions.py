@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from tally_ho.apps.tally.models.form_state_transition import\
+    FormStateTransition
+from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.reports import transitions
+from tally_ho.libs.tests.test_base import create_ballot, create_center,\
+    create_result_form, create_tally, TestBase
+
+
+class TestTransitions(TestBase):
+    def setUp(self):
+        self._create_and_login_user()
+        self.tally = create_tally()
+        ballot = create_ballot(tally=self.tally)
+        center = create_center(tally=self.tally)
+        self.start = timezone.now().replace(minute=0, second=0,
+                                            microsecond=0) - timedelta(days=1)
+
+        # each form spends i + 1 minutes in data entry 1
+        for i in range(3):
+            result_form = create_result_form(
+                barcode=i, serial_number=i, station_number=i,
+                form_state=FormState.DATA_ENTRY_1, ballot=ballot,
+                center=center, tally=self.tally, user=self.user)
+            result_form.form_state = FormState.DATA_ENTRY_2
+            result_form.save()
+
+            for j, transition in enumerate(result_form.transitions.order_by(
+                    'id')):
+                FormStateTransition.objects.filter(pk=transition.pk).update(
+                    created_date=self.start + timedelta(minutes=j * (i + 1)))
+
+    def test_log_transitions(self):
+        result_form = FormStateTransition.objects.first().result_form
+        result_form.save()
+
+        self.assertEqual(
+            list(result_form.transitions.order_by('id').values_list(
+                'from_state', 'to_state', 'user')),
+            [(None, FormState.DATA_ENTRY_1, self.user.pk),
+             (FormState.DATA_ENTRY_1, FormState.DATA_ENTRY_2, self.user.pk)])
+
+    def test_throughput(self):
+        rows = transitions.throughput(self.tally.pk)
+
+        self.assertEqual(rows, [{'hour': self.start,
+                                 'state': FormState.DATA_ENTRY_1,
+                                 'forms': 3}])
+        self.assertEqual(transitions.throughput(
+            self.tally.pk, since=self.start + timedelta(hours=1)), [])
+
+    def test_time_in_state(self):
+        times = transitions.time_in_state(self.tally.pk, [0.5, 1.0])
+
+        self.assertEqual(list(times.keys()), [FormState.DATA_ENTRY_1])
+        self.assertEqual(times[FormState.DATA_ENTRY_1],
+                         {'count': 3, 'seconds': {0.5: 120.0, 1.0: 180.0}})
+
+    def test_clerk_productivity(self):
+        productivity = transitions.clerk_productivity(self.tally.pk)
+
+        self.assertEqual(productivity[self.user.pk]['transitions'], 6)
+        self.assertEqual(productivity[self.user.pk]['forms'], 3)
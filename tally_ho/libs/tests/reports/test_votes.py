@@ -0,0 +1,43 @@
+from tally_ho.apps.tally.models.result import Result
+from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.reports.votes import candidate_votes, CandidateVotes
+from tally_ho.libs.tests.test_base import create_ballot, create_candidate,\
+    create_center, create_result, create_result_form, create_tally, TestBase
+
+
+class TestVotes(TestBase):
+    def setUp(self):
+        self._create_and_login_user()
+        self.tally = create_tally()
+        ballot = create_ballot(tally=self.tally)
+        center = create_center(tally=self.tally)
+        self.candidates = [create_candidate(ballot, 'candidate %s' % i)
+                           for i in range(3)]
+
+        for i, form_state in enumerate([FormState.ARCHIVED,
+                                        FormState.AUDIT,
+                                        FormState.CORRECTION]):
+            result_form = create_result_form(
+                barcode=i, serial_number=i, station_number=i,
+                form_state=form_state, ballot=ballot, center=center,
+                tally=self.tally)
+
+            for votes, candidate in enumerate(self.candidates[:2]):
+                create_result(result_form, candidate, self.user, votes + 1)
+
+    def test_candidate_votes(self):
+        results = Result.objects.filter(result_form__tally=self.tally)
+
+        with self.assertNumQueries(1):
+            totals = candidate_votes(results)
+
+        self.assertEqual(totals, {
+            self.candidates[0].pk: CandidateVotes(1, 1, 1, 2),
+            self.candidates[1].pk: CandidateVotes(1, 2, 2, 4),
+        })
+
+    def test_candidate_votes_other_tally(self):
+        other_tally = create_tally(name='other')
+        results = Result.objects.filter(result_form__tally=other_tally)
+
+        self.assertEqual(candidate_votes(results), {})
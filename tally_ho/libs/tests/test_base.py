@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User, Group, AnonymousUser
 from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.cache import cache
 from django.test import TestCase
 from django.test import RequestFactory
 from django.utils import timezone
@@ -272,6 +273,11 @@ def result_form_data(result_form):
 
 
 class TestBase(TestCase):
+    def _pre_setup(self):
+        super(TestBase, self)._pre_setup()
+        # cached rows of rolled back tests must not leak into the next test
+        cache.clear()
+
     @classmethod
     def _create_user(cls, username='bob', password='bob'):
         return UserProfile.objects.create(username=username, password=password)
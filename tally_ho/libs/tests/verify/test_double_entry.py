@@ -0,0 +1,92 @@
+from tally_ho.apps.tally.models.result import Result
+from tally_ho.libs.models.enums.entry_version import EntryVersion
+from tally_ho.libs.models.enums.race_type import RaceType
+from tally_ho.libs.verify.double_entry import compare_entries
+from tally_ho.libs.tests.test_base import create_candidate,\
+    create_reconciliation_form, create_recon_forms, create_result_form,\
+    TestBase
+
+
+class TestDoubleEntry(TestBase):
+    def setUp(self):
+        self._create_and_login_user()
+        self.result_form = create_result_form()
+        self.general = create_candidate(self.result_form.ballot, 'general')
+        self.women = create_candidate(self.result_form.ballot, 'women',
+                                      race_type=RaceType.WOMEN)
+        self.component = create_candidate(
+            self.result_form.ballot, 'component',
+            race_type=RaceType.COMPONENT_AMAZIGH)
+
+    def create_result(self, candidate, entry_version, votes):
+        return Result.objects.create(result_form=self.result_form,
+                                     user=self.user,
+                                     candidate=candidate,
+                                     votes=votes,
+                                     entry_version=entry_version)
+
+    def create_entries(self, candidate, votes1, votes2):
+        self.create_result(candidate, EntryVersion.DATA_ENTRY_1, votes1)
+        self.create_result(candidate, EntryVersion.DATA_ENTRY_2, votes2)
+
+    def test_compare_entries(self):
+        self.create_entries(self.general, 2, 2)
+        self.create_entries(self.women, 1, 3)
+        self.create_entries(self.component, 4, 4)
+        self.create_result(self.general, EntryVersion.FINAL, 2)
+        create_recon_forms(self.result_form, self.user)
+
+        with self.assertNumQueries(2):
+            diff = compare_entries(self.result_form)
+
+        with self.assertNumQueries(0):
+            general = diff.race(RaceType.GENERAL)
+            self.assertEqual(len(general.results), 3)
+            self.assertTrue(general.double_entered)
+            self.assertTrue(general.counts_match)
+            self.assertEqual(len(general.matches), 1)
+            self.assertEqual(general.no_match, [])
+
+            women = diff.race(RaceType.WOMEN)
+            self.assertEqual([r.votes for r in women.no_match], [3])
+            entries = women.candidates[0]
+            self.assertEqual(entries.candidate, self.women)
+            self.assertEqual((entries.result1.votes, entries.result2.votes),
+                             (1, 3))
+            self.assertFalse(entries.match)
+
+            self.assertIs(diff.race(RaceType.COMPONENT_TEBU), diff.race(None))
+            self.assertTrue(diff.race(None).candidates[0].match)
+
+            self.assertEqual(len(diff.all.results_v2), 3)
+            self.assertEqual(len(diff.all.no_match), 1)
+            self.assertEqual(diff.recon_mismatches, [])
+            self.assertTrue(diff.reconciliation_match)
+
+    def test_compare_entries_missing_entry(self):
+        self.create_entries(self.general, 2, 2)
+        self.create_result(self.women, EntryVersion.DATA_ENTRY_1, 1)
+
+        diff = compare_entries(self.result_form)
+        women = diff.race(RaceType.WOMEN)
+
+        self.assertFalse(women.double_entered)
+        self.assertFalse(diff.all.counts_match)
+        self.assertIsNone(women.candidates[0].result2)
+        self.assertFalse(women.candidates[0].match)
+        self.assertIsNone(diff.recon_mismatches)
+        self.assertFalse(diff.reconciliation_match)
+
+    def test_compare_entries_recon_mismatch(self):
+        create_reconciliation_form(self.result_form, self.user,
+                                   entry_version=EntryVersion.DATA_ENTRY_1)
+        create_reconciliation_form(self.result_form, self.user,
+                                   entry_version=EntryVersion.DATA_ENTRY_2,
+                                   number_sorted_and_counted=2,
+                                   is_stamped=False)
+
+        diff = compare_entries(self.result_form)
+
+        self.assertEqual(sorted(diff.recon_mismatches),
+                         ['is_stamped', 'number_sorted_and_counted'])
+        self.assertFalse(diff.reconciliation_match)
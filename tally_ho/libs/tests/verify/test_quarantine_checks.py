@@ -1,5 +1,9 @@
+from django.core.cache.backends.locmem import LocMemCache
+from mock import patch
+
 from tally_ho.libs.verify.quarantine_checks import\
-    create_quarantine_checks, pass_overvote, pass_tampering
+    create_quarantine_checks, failed_quarantine_checks, pass_overvote,\
+    pass_tampering, quarantine_check, quarantine_checks
 from tally_ho.libs.tests.test_base import create_candidates,\
     create_center, create_reconciliation_form, create_result_form,\
     create_station, TestBase
@@ -77,3 +81,53 @@ class TestQuarantineChecks(TestBase):
                                    number_ballots_inside_box=250,
                                    number_unstamped_ballots=0)
         self.assertEqual(pass_tampering(result_form), True)
+
+    def test_failed_quarantine_checks(self):
+        center = create_center()
+        station = create_station(center=center, registrants=1)
+        overvoted = create_result_form(
+            center=center,
+            station_number=station.station_number)
+        create_reconciliation_form(overvoted,
+                                   self.user,
+                                   number_unstamped_ballots=11)
+        no_recon = create_result_form(barcode='2', serial_number=2)
+        passed = create_result_form(barcode='3', serial_number=3)
+        create_candidates(passed, self.user, num_results=1)
+        create_reconciliation_form(passed,
+                                   self.user,
+                                   number_ballots_inside_box=250,
+                                   number_unstamped_ballots=0)
+
+        with self.assertNumQueries(5):
+            failed = failed_quarantine_checks([overvoted, no_recon, passed])
+
+        self.assertEqual([check.method for check in failed[overvoted.pk]],
+                         ['pass_overvote', 'pass_tampering'])
+        self.assertEqual(failed[no_recon.pk], [])
+        self.assertEqual(failed[passed.pk], [])
+
+    def test_quarantine_checks_cached(self):
+        with self.assertNumQueries(2):
+            quarantine_checks()
+
+        # only the version of the checks is read
+        with self.assertNumQueries(1):
+            check = quarantine_check('pass_overvote')
+
+        check.value = 20
+        check.save()
+
+        self.assertEqual(quarantine_check('pass_overvote').value, 20)
+
+    def test_quarantine_checks_changed_in_other_process(self):
+        quarantine_checks()
+        check = quarantine_check('pass_overvote')
+        check.value = 20
+
+        # the other process has its own cache
+        with patch('tally_ho.apps.tally.models.quarantine_check.cache',
+                   LocMemCache('other', {})):
+            check.save()
+
+        self.assertEqual(quarantine_check('pass_overvote').value, 20)
@@ -0,0 +1,251 @@
+import csv
+import os
+from tempfile import NamedTemporaryFile
+
+from django.test import RequestFactory, override_settings
+
+from tally_ho.apps.tally.models.export_fragment import ExportFragment
+from tally_ho.apps.tally.models.result_export import ResultExport
+from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.apps.tally.models.station import Station
+from tally_ho.apps.tally.models.sub_constituency import SubConstituency
+from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.models.enums.gender import Gender
+from tally_ho.libs.tests.test_base import create_ballot, create_candidate,\
+    create_center, create_result, create_result_form, create_tally, TestBase
+from tally_ho.libs.views.exports import (
+    ALL_CANDIDATES_EXPORT,
+    RESULTS_EXPORT,
+    export_candidate_votes,
+    export_file_response,
+    export_is_stale,
+    result_form_rows,
+    save_barcode_results,
+)
+
+
+def read_csv(file_name):
+    with open(file_name) as f:
+        return list(csv.DictReader(f))
+
+
+class TestExports(TestBase):
+    def setUp(self):
+        self._create_and_login_user()
+        self.tally = create_tally()
+        self.ballot = create_ballot(tally=self.tally)
+        SubConstituency.objects.create(code=1, field_office='1',
+                                       ballot_general=self.ballot)
+        center = create_center(tally=self.tally)
+        self.candidates = [create_candidate(self.ballot, 'candidate %s' % i)
+                           for i in range(2)]
+
+        for i, form_state in enumerate([FormState.ARCHIVED,
+                                        FormState.AUDIT]):
+            Station.objects.create(center=center, station_number=i,
+                                   gender=Gender.MALE, registrants=10,
+                                   tally=self.tally)
+            result_form = create_result_form(
+                barcode=i, serial_number=i, station_number=i,
+                form_state=form_state, ballot=self.ballot, center=center,
+                tally=self.tally)
+
+            for votes, candidate in enumerate(self.candidates):
+                create_result(result_form, candidate, self.user, votes + 1)
+
+        self.result_form = ResultForm.objects.get(barcode=0)
+
+    def test_export_candidate_votes(self):
+        rows = read_csv(export_candidate_votes(output_to_file=False,
+                                               tally_id=self.tally.pk))
+
+        self.assertEqual(len(rows), 1)
+        row = rows[0]
+        self.assertEqual(row['ballot number'], str(self.ballot.number))
+        self.assertEqual(row['stations'], '2')
+        self.assertEqual(row['stations completed'], '1')
+        self.assertEqual(row['candidate 1 name'], 'candidate 1')
+        self.assertEqual(row['candidate 1 votes'], '2')
+        self.assertEqual(row['candidate 1 votes included quarantine'], '4')
+        self.assertEqual(row['candidate 2 name'], 'candidate 0')
+        self.assertEqual(row['candidate 2 votes'], '1')
+        self.assertEqual(row['candidate 2 votes included quarantine'], '2')
+
+    def test_export_candidate_votes_form_results(self):
+        rows = read_csv(export_candidate_votes(save_barcodes=True,
+                                               output_duplicates=False,
+                                               output_to_file=False,
+                                               tally_id=self.tally.pk))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual([row['barcode'] for row in rows], ['0', '0'])
+        self.assertEqual([row['votes'] for row in rows], ['1', '2'])
+        self.assertEqual(rows[0]['number registrants'], '10')
+
+    @override_settings(RESULT_EXPORT_OVERLAP_SECONDS=0,
+                       RESULT_EXPORT_CHECK_SECONDS=0)
+    def test_export_candidate_votes_incremental(self):
+        export_candidate_votes(save_barcodes=True, output_duplicates=False,
+                               output_to_file=False, tally_id=self.tally.pk,
+                               incremental=True)
+        result_exports = ResultExport.objects.filter(tally=self.tally)
+
+        self.assertEqual(result_exports.count(), 2)
+        self.assertFalse(export_is_stale(self.tally.pk,
+                                         ALL_CANDIDATES_EXPORT))
+
+        # unchanged ballots and forms are read from the stored fragments
+        ExportFragment.objects.filter(
+            result_export__name=ALL_CANDIDATES_EXPORT).update(
+            rows=[{'ballot number': 'stored'}])
+        ExportFragment.objects.filter(
+            result_export__name=RESULTS_EXPORT).update(
+            rows=[{'barcode': 'stored', 'votes': 0, 'center': 1,
+                   'ballot': 1, 'station': 1}])
+
+        rows = read_csv(export_candidate_votes(output_to_file=False,
+                                               tally_id=self.tally.pk,
+                                               incremental=True))
+        self.assertEqual(rows[0]['ballot number'], 'stored')
+        rows = read_csv(save_barcode_results(
+            ['0'], output_to_file=False, tally_id=self.tally.pk,
+            incremental=True))
+        self.assertEqual(rows[0]['barcode'], 'stored')
+
+        # changed results are rebuilt
+        result = self.result_form.results.first()
+        result.votes = 5
+        result.save()
+
+        self.assertTrue(export_is_stale(self.tally.pk,
+                                        ALL_CANDIDATES_EXPORT))
+        rows = read_csv(export_candidate_votes(output_to_file=False,
+                                               tally_id=self.tally.pk,
+                                               incremental=True))
+        self.assertEqual(rows[0]['ballot number'], str(self.ballot.number))
+        rows = read_csv(save_barcode_results(
+            ['0'], output_to_file=False, tally_id=self.tally.pk,
+            incremental=True))
+        self.assertEqual(rows[0]['barcode'], '0')
+
+        # forms that are no longer complete are removed
+        rows = read_csv(save_barcode_results(
+            [], output_to_file=False, tally_id=self.tally.pk,
+            incremental=True))
+        self.assertEqual(rows, [])
+
+    def test_export_overlaps_last_run(self):
+        export_candidate_votes(output_to_file=False, tally_id=self.tally.pk,
+                               incremental=True)
+        result_export = ResultExport.objects.get(
+            tally=self.tally, name=ALL_CANDIDATES_EXPORT)
+        ExportFragment.objects.filter(result_export=result_export).update(
+            rows=[{'ballot number': 'stored'}])
+
+        # a result saved before the last run started, in a transaction that
+        # committed after it
+        self.result_form.results.update(
+            votes=5, modified_date=result_export.watermark)
+
+        with override_settings(RESULT_EXPORT_CHECK_SECONDS=0):
+            self.assertTrue(export_is_stale(self.tally.pk,
+                                            ALL_CANDIDATES_EXPORT))
+
+        rows = read_csv(export_candidate_votes(output_to_file=False,
+                                               tally_id=self.tally.pk,
+                                               incremental=True))
+        self.assertEqual(rows[0]['ballot number'], str(self.ballot.number))
+
+    def test_export_is_stale_checked(self):
+        export_candidate_votes(output_to_file=False, tally_id=self.tally.pk,
+                               incremental=True)
+
+        # an export found up to date is not checked again for a while
+        with self.assertNumQueries(1):
+            self.assertFalse(export_is_stale(self.tally.pk,
+                                             ALL_CANDIDATES_EXPORT))
+
+        # deleting exported data rebuilds the export
+        Station.objects.get(station_number=1).delete()
+
+        self.assertTrue(export_is_stale(self.tally.pk,
+                                        ALL_CANDIDATES_EXPORT))
+        self.assertIsNone(ResultExport.objects.get(
+            tally=self.tally, name=ALL_CANDIDATES_EXPORT).watermark)
+
+    def test_result_form_rows(self):
+        with self.assertNumQueries(5):
+            barcodes_to_rows = result_form_rows(
+                ResultForm.objects.filter(tally=self.tally))
+
+        self.assertEqual(sorted(barcodes_to_rows.keys()), ['0', '1'])
+        rows = barcodes_to_rows['0']
+        self.assertEqual([row['name'] for row in rows],
+                         ['candidate 0', 'candidate 1'])
+        self.assertEqual([row['votes'] for row in rows], [1, 2])
+        self.assertEqual(rows[0]['gender'], 'MALE')
+        self.assertEqual(rows[0]['voting district'], 1)
+        self.assertEqual(rows[0]['number registrants'], 10)
+        self.assertEqual(
+            [row['votes'] for row in barcodes_to_rows['1']], [0, 0])
+
+
+class TestExportFileResponse(TestBase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        csv_file = NamedTemporaryFile(delete=False, suffix='.csv')
+
+        with csv_file as f:
+            f.write(b'0123456789')
+
+        self.path = csv_file.name
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_export_file_response(self):
+        response = export_file_response(self.factory.get('/'), self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_export_file_response_not_modified(self):
+        response = export_file_response(self.factory.get('/'), self.path)
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH=response['ETag'])
+        response = export_file_response(request, self.path)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_export_file_response_range(self):
+        request = self.factory.get('/', HTTP_RANGE='bytes=2-5')
+        response = export_file_response(request, self.path)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+
+        request = self.factory.get('/', HTTP_RANGE='bytes=-3')
+        response = export_file_response(request, self.path)
+
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+
+    def test_export_file_response_range_not_satisfiable(self):
+        request = self.factory.get('/', HTTP_RANGE='bytes=20-')
+        response = export_file_response(request, self.path)
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_export_file_response_accel_redirect(self):
+        with override_settings(EXPORT_ACCEL_REDIRECT_PREFIX='/protected/',
+                               MEDIA_ROOT=os.path.dirname(self.path)):
+            response = export_file_response(self.factory.get('/'), self.path)
+
+        self.assertEqual(response['X-Accel-Redirect'],
+                         '/protected/' + os.path.basename(self.path))
+        self.assertEqual(response.content, b'')
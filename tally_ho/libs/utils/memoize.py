@@ -0,0 +1,43 @@
+from functools import wraps
+
+MEMO_ATTRIBUTE = '_memo'
+
+
+def memoized_property(method):
+    """A property whose value is computed once per instance.
+
+    The value is stored on the instance until it is removed with
+    `invalidate_memo`.  Memoize values such as numbers and model instances,
+    not querysets, which would keep their results or query again anyway.
+    """
+    name = method.__name__
+
+    @property
+    @wraps(method)
+    def wrapper(self):
+        memo = self.__dict__.setdefault(MEMO_ATTRIBUTE, {})
+
+        if name not in memo:
+            memo[name] = method(self)
+
+        return memo[name]
+
+    return wrapper
+
+
+def invalidate_memo(instance, *names):
+    """Remove memoized property values from an instance.
+
+    :param instance: The instance to remove values from.
+    :param names: The names of the properties to remove, all if empty.
+    """
+    memo = instance.__dict__.get(MEMO_ATTRIBUTE)
+
+    if not memo:
+        return
+
+    if not names:
+        memo.clear()
+
+    for name in names:
+        memo.pop(name, None)
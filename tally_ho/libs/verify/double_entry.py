@@ -0,0 +1,182 @@
+from collections import Counter, OrderedDict
+
+from django.forms.models import model_to_dict
+
+from tally_ho.libs.models.enums.entry_version import EntryVersion
+from tally_ho.libs.models.enums.race_type import RaceType
+
+# reconciliation form fields that differ between the entries
+RECON_IGNORED_FIELDS = {'id', 'entry_version'}
+
+
+def race_key(race_type):
+    """Return the race a candidate race type is compared in, all component
+    race types are compared together under None.
+    """
+    return race_type if race_type in (RaceType.GENERAL, RaceType.WOMEN)\
+        else None
+
+
+class CandidateEntries(object):
+    """The data entry 1 and 2 results of a candidate."""
+    def __init__(self, candidate):
+        self.candidate = candidate
+        self.result1 = None
+        self.result2 = None
+
+    @property
+    def match(self):
+        return self.result1 is not None and self.result2 is not None and\
+            self.result1.votes == self.result2.votes
+
+
+class RaceDiff(object):
+    """The comparison of the data entry 1 and 2 results of a race.
+
+    Results are joined on candidate with dictionaries, so comparing is linear
+    in the number of results.
+    """
+    def __init__(self):
+        self.results = []
+        self.results_v1 = []
+        self.results_v2 = []
+        self.entries = OrderedDict()
+
+    def add(self, result):
+        self.results.append(result)
+
+        if result.entry_version == EntryVersion.FINAL:
+            return
+
+        entries = self.entries.get(result.candidate_id)
+
+        if entries is None:
+            entries = self.entries[result.candidate_id] = CandidateEntries(
+                result.candidate)
+
+        if result.entry_version == EntryVersion.DATA_ENTRY_1:
+            self.results_v1.append(result)
+            entries.result1 = entries.result1 or result
+        else:
+            self.results_v2.append(result)
+            entries.result2 = entries.result2 or result
+
+    @property
+    def double_entered(self):
+        return bool(self.results_v1) and bool(self.results_v2)
+
+    @property
+    def counts_match(self):
+        return len(self.results_v1) == len(self.results_v2)
+
+    def compare(self):
+        """Split the data entry 2 results into results with the same
+        candidate and votes as a data entry 1 result, and the others.
+
+        :returns: A list of matched and a list of unmatched data entry 2
+            results.
+        """
+        unmatched_v1 = Counter((result.candidate_id, result.votes)
+                               for result in self.results_v1)
+        matches, no_match = [], []
+
+        for result in self.results_v2:
+            key = result.candidate_id, result.votes
+
+            if unmatched_v1[key]:
+                unmatched_v1[key] -= 1
+                matches.append(result)
+            else:
+                no_match.append(result)
+
+        return matches, no_match
+
+    @property
+    def matches(self):
+        return self.compare()[0]
+
+    @property
+    def no_match(self):
+        return self.compare()[1]
+
+    @property
+    def matched(self):
+        """True if the race has no results, or both entries have the same
+        results.
+        """
+        return not self.results or (self.double_entered and
+                                    self.counts_match and
+                                    not self.no_match)
+
+    @property
+    def candidates(self):
+        """The entries of each candidate in candidate order."""
+        return sorted(self.entries.values(), key=lambda entries: (
+            entries.candidate.race_type.value, entries.candidate.order))
+
+
+class DoubleEntryDiff(object):
+    """The comparison of the data entry 1 and 2 results and reconciliation
+    forms of a result form.
+
+    :param results: The active results of the result form with their
+        candidates.
+    :param recon_forms: The active reconciliation forms of the result form.
+    """
+    def __init__(self, results, recon_forms):
+        self.all = RaceDiff()
+        self.races = {}
+        self.recon_forms = list(recon_forms)
+
+        for result in results:
+            self.all.add(result)
+            self.race(result.candidate.race_type).add(result)
+
+    def race(self, race_type):
+        """Return the comparison of a race.
+
+        :param race_type: The race type to compare, None for the component
+            races.
+        """
+        return self.races.setdefault(race_key(race_type), RaceDiff())
+
+    @property
+    def recon_mismatches(self):
+        """The names of the fields that differ between the two active
+        reconciliation forms, None unless there are exactly two.
+        """
+        if len(self.recon_forms) != 2:
+            return None
+
+        v1, v2 = [model_to_dict(recon) for recon in self.recon_forms]
+
+        return [k for k, v in v1.items()
+                if k not in RECON_IGNORED_FIELDS and v != v2[k]]
+
+    @property
+    def reconciliation_match(self):
+        return self.recon_mismatches == []
+
+    @property
+    def matched(self):
+        """True if the general and women results and the reconciliation
+        forms pass corrections without changes.
+        """
+        return (self.race(RaceType.GENERAL).matched and
+                self.race(RaceType.WOMEN).matched and
+                (not self.recon_forms or self.reconciliation_match))
+
+
+def compare_entries(result_form):
+    """Load the active results and reconciliation forms of a result form and
+    compare the data entry 1 and 2 entries.
+
+    :param result_form: The result form to compare entries for.
+
+    :returns: A `DoubleEntryDiff`.
+    """
+    results = result_form.results.filter(active=True).select_related(
+        'candidate').order_by('entry_version', 'id')
+    recon_forms = result_form.reconciliationform_set.filter(active=True)
+
+    return DoubleEntryDiff(results, recon_forms)
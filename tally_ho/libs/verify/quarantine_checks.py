@@ -1,7 +1,20 @@
+from django.db.models import Sum
 from django.utils.translation import ugettext as _
 from tally_ho.apps.tally.models.audit import Audit
 from tally_ho.apps.tally.models.quarantine_check import\
     QuarantineCheck
+from tally_ho.apps.tally.models.reconciliation_form import\
+    ReconciliationForm
+from tally_ho.apps.tally.models.result import Result
+from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.libs.models.enums.entry_version import EntryVersion
+
+RECON_FIELDS = [
+    'number_ballots_inside_box',
+    'number_cancelled_ballots',
+    'number_invalid_votes',
+    'number_unstamped_ballots',
+]
 
 
 def create_quarantine_checks():
@@ -16,77 +29,162 @@ def create_quarantine_checks():
             name=name, method=method, value=value, percentage=percentage)
 
 
-def quarantine_checks():
-    """Return tuples of (QuarantineCheck, validation_function)."""
-    methods = [pass_overvote, pass_tampering]
-    checks = QuarantineCheck.objects.all().order_by('pk')
+class QuarantineData(object):
+    """The numbers of a result form the quarantine checks use.
 
-    return zip(methods, checks)
+    :param registrants: The registrants of the station, or None.
+    :param num_votes: The sum of the final active votes.
+    :param recon: A dictionary of the final reconciliation form numbers, or
+        None without a final reconciliation form.
+    """
+    def __init__(self, registrants=None, num_votes=0, recon=None):
+        self.registrants = registrants
+        self.num_votes = num_votes
+        self.recon = recon
 
+    @property
+    def number_ballots_used(self):
+        return (self.recon['number_cancelled_ballots'] +
+                self.recon['number_unstamped_ballots'] +
+                self.recon['number_invalid_votes'] +
+                self.num_votes)
 
-def pass_overvote(result_form):
-    """Check to guard against overvoting.
+    @property
+    def number_ballots_expected(self):
+        return (self.recon['number_ballots_inside_box'] -
+                self.recon['number_unstamped_ballots'] -
+                self.recon['number_invalid_votes'])
 
-    If the `result_form` does not have a `reconciliation_form` this will
-    always return True.
 
-    If the `station` for this `result_form` has an empty `registrants` field
-    this will always return True.
+def quarantine_data(result_forms):
+    """Load the numbers the quarantine checks use for many result forms in
+    three queries.
 
-    Fails if the number of ballots reported to be used in a station exceeds
-    the number of potential voters minus the number of registrants plus N
-    persons to accomodate staff and security.
+    :param result_forms: The result forms to load numbers for.
 
-    :param result_form: The result form to check.
-    :returns: A boolean of true if passed, otherwise false.
+    :returns: A dictionary of result form id to `QuarantineData`.
     """
-    recon_form = result_form.reconciliationform
+    pks = [result_form.pk for result_form in result_forms]
+    data = {pk: QuarantineData(registrants) for pk, registrants in
+            ResultForm.objects.filter(pk__in=pks).values_list(
+                'pk', 'station__registrants')}
+
+    for row in Result.objects.filter(
+            result_form__in=pks, active=True,
+            entry_version=EntryVersion.FINAL).values(
+            'result_form').annotate(votes=Sum('votes')).order_by():
+        data[row['result_form']].num_votes = row['votes'] or 0
+
+    # the first final reconciliation form is used, as in reconciliationform
+    for recon in ReconciliationForm.objects.filter(
+            result_form__in=pks, active=True,
+            entry_version=EntryVersion.FINAL).values(
+            'result_form', *RECON_FIELDS).order_by('-id'):
+        data[recon.pop('result_form')].recon = recon
+
+    return data
 
-    if not recon_form:
-        return True
 
-    registrants = result_form.station.registrants if result_form.station\
-        else None
+def overvote_passed(data, check):
+    """Check to guard against overvoting.
+
+    Passes without a reconciliation form or without registrants. Fails if the
+    number of ballots reported to be used in a station exceeds the number of
+    potential voters minus the number of registrants plus N persons to
+    accomodate staff and security.
 
-    if registrants is None:
+    :param data: The `QuarantineData` of the result form.
+    :param check: The quarantine check with the thresholds.
+    :returns: A boolean of true if passed, otherwise false.
+    """
+    if not data.recon or data.registrants is None:
         return True
 
-    qc = QuarantineCheck.objects.get(method='pass_overvote')
-    max_number_ballots = (qc.percentage / 100) * registrants + qc.value
+    max_number_ballots = (check.percentage / 100) * data.registrants +\
+        check.value
 
-    return recon_form.number_ballots_used <= max_number_ballots
+    return data.number_ballots_used <= max_number_ballots
 
 
-def pass_tampering(result_form):
+def tampering_passed(data, check):
     """Guard against errors and tampering with the form.
 
-    If the `result_form` does not have a `reconciliation_form` this will
-    always return True.
+    Passes without a reconciliation form. Fails if the sum of the results
+    section of the form does not equal the number of ballots expected based
+    on the calculation of the key fields from the reconciliation form with a
+    N% tolerance.
 
-    Fails if the sum of the results section of the form does not equal the
-    number of ballots expected based on the calculation of the key fields from
-    the reconciliation form with a N% tolerance.
-
-    :param result_form: The result form to check.
+    :param data: The `QuarantineData` of the result form.
+    :param check: The quarantine check with the thresholds.
     :returns: A boolean of true if passed, otherwise false.
     """
-    recon_form = result_form.reconciliationform
-
-    if not recon_form:
+    if not data.recon:
         return True
 
-    num_votes = result_form.num_votes
-    number_ballots_expected = recon_form.number_ballots_expected
+    num_votes = data.num_votes
+    number_ballots_expected = data.number_ballots_expected
     diff = abs(num_votes - number_ballots_expected)
-    # TODO Check if 'qc' variable must be QuarantineCheck object with method
-    # 'pass_tampering' or not
-    qc = QuarantineCheck.objects.get(method='pass_tampering')
-    scaled_tolerance = (qc.value / 100) * (
+    scaled_tolerance = (check.value / 100) * (
         num_votes + number_ballots_expected) / 2
 
     return diff <= scaled_tolerance
 
 
+CHECK_METHODS = {
+    'pass_overvote': overvote_passed,
+    'pass_tampering': tampering_passed,
+}
+
+
+def quarantine_checks():
+    """Return tuples of (validation_function, QuarantineCheck) from the
+    cached quarantine checks.
+    """
+    return [(CHECK_METHODS[check.method], check)
+            for check in QuarantineCheck.cached()
+            if check.method in CHECK_METHODS]
+
+
+def quarantine_check(method):
+    """Return the cached quarantine check with a method name."""
+    for check in QuarantineCheck.cached():
+        if check.method == method:
+            return check
+
+    raise QuarantineCheck.DoesNotExist(method)
+
+
+def failed_quarantine_checks(result_forms):
+    """Run the quarantine checks on many result forms.
+
+    The numbers of all result forms are loaded in bulk, so the number of
+    queries does not depend on the number of result forms.
+
+    :param result_forms: The result forms to run quarantine checks on.
+
+    :returns: A dictionary of result form id to the list of failed
+        quarantine checks.
+    """
+    checks = quarantine_checks()
+    data = quarantine_data(result_forms)
+
+    return {pk: [check for passed, check in checks
+                 if not passed(form_data, check)]
+            for pk, form_data in data.items()}
+
+
+def pass_overvote(result_form):
+    """Check a result form against overvoting, see `overvote_passed`."""
+    return overvote_passed(quarantine_data([result_form])[result_form.pk],
+                           quarantine_check('pass_overvote'))
+
+
+def pass_tampering(result_form):
+    """Check a result form against tampering, see `tampering_passed`."""
+    return tampering_passed(quarantine_data([result_form])[result_form.pk],
+                            quarantine_check('pass_tampering'))
+
+
 def check_quarantine(result_form, user):
     """Run quarantine checks.  Create an audit with links to the failed
     quarantine checks if any fail.
@@ -94,18 +192,14 @@ def check_quarantine(result_form, user):
     :param result_form: The result form to run quarantine checks on.
     :param user: The user to associate with an audit if any checks fail.
     """
-    audit = None
+    if result_form.skip_quarantine_checks:
+        return
 
-    if not result_form.skip_quarantine_checks:
-        for passed_check, check in quarantine_checks():
-            if not passed_check(result_form):
-                if not audit:
-                    audit = Audit.objects.create(
-                        user=user,
-                        result_form=result_form)
+    failed = failed_quarantine_checks([result_form])[result_form.pk]
 
-                audit.quarantine_checks.add(check)
+    if failed:
+        audit = Audit.objects.create(user=user, result_form=result_form)
+        audit.quarantine_checks.add(*failed)
 
-    if audit:
         result_form.audited_count += 1
         result_form.save()
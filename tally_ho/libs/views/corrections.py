@@ -1,9 +1,6 @@
-from collections import OrderedDict
-
 from django.forms import ValidationError
 from django.utils.translation import ugettext as _
 
-from tally_ho.apps.tally.models.candidate import Candidate
 from tally_ho.apps.tally.models.result import Result
 from tally_ho.apps.tally.models.result_form import get_matched_results
 from tally_ho.libs.models.enums.entry_version import EntryVersion
@@ -17,80 +14,27 @@ def get_matched_forms(result_form):
 
     :returns: A list of matches and a list is mismatches.
     """
-    results_v1 = Result.objects.filter(
-        active=True,
-        result_form=result_form,
-        entry_version=EntryVersion.DATA_ENTRY_1).values('candidate', 'votes')
-    results_v2 = Result.objects.filter(
-        active=True,
-        result_form=result_form,
-        entry_version=EntryVersion.DATA_ENTRY_2).values('candidate', 'votes')
+    diff = result_form.double_entry_diff.all
 
-    if not results_v1 or not results_v2:
+    if not diff.double_entered:
         raise Exception(_(u"Result Form has no double entries."))
 
-    if results_v1.count() != results_v2.count():
+    if not diff.counts_match:
         return False
 
-    tuple_list = [i.items() for i in results_v1]
-    matches = [rec for rec in results_v2 if rec.items() in tuple_list]
-    no_match = [rec for rec in results_v2 if rec.items() not in tuple_list]
-
-    return matches, no_match
-
-
-def get_candidates(results, num_results=None):
-    """Return ordered tuples of candidates and their results.
-
-    :param num_results: Enforce a particular number of results, default None.
-    :param results: The results to get candidates from.
-
-    :returns: A list of tuples of candidates and the results associated with
-        them.
-    """
-    candidates = OrderedDict()
-
-    for result in results.order_by('candidate__race_type', 'candidate__order',
-                                   'entry_version'):
-        candidate = result.candidate
-
-        if candidates.get(candidate):
-            candidates[candidate].append(result)
-        else:
-            candidates.update({candidate: [result]})
-
-    return [[c] + r[0:num_results] if num_results else r
-            for c, r in candidates.items()]
+    return diff.compare()
 
 
-def get_results_for_race_type(result_form, race_type):
-    """Return the results for a result form and race type.
+def candidate_entries_for_race_type(result_form, race_type):
+    """Return the data entry 1 and 2 results of the candidates of a race.
 
     :param result_form: The result form to return data for.
     :param race_type: The race type to get results for, get component results
         if this is None.
 
-    :returns: A queryset of results.
+    :returns: A list of `CandidateEntries` in candidate order.
     """
-    results = result_form.results.filter(active=True)
-
-    return results.filter(candidate__race_type__gt=RaceType.WOMEN) if\
-        race_type is None else results.filter(candidate__race_type=race_type)
-
-
-def candidate_results_for_race_type(result_form, race_type, num_results=None):
-    """Return the candidates and results for a result form and race type.
-
-    :param result_form: The result form to return data for.
-    :param race_type: The race type to get results for, get component results
-        if this is None.
-    :param num_results: Enforce a particular number of results, default None.
-
-    :returns: A list of tuples containing the candidate and all results for
-        that candidate.
-    """
-    return get_candidates(get_results_for_race_type(result_form, race_type),
-                          num_results)
+    return result_form.double_entry_diff.race(race_type).candidates
 
 
 def save_candidate_results_by_prefix(prefix, result_form, post_data,
@@ -110,29 +54,37 @@ def save_candidate_results_by_prefix(prefix, result_form, post_data,
     prefix = 'candidate_%s_' % prefix
 
     candidate_fields = [f for f in post_data if f.startswith(prefix)]
-    results = get_results_for_race_type(result_form, race_type)
-    no_match = get_matched_results(result_form, results)[1]
+    no_match = get_matched_results(result_form, race_type)[1]
 
     if len(candidate_fields) != len(no_match):
         raise ValidationError(
             _(u"Please select correct results for all mis-matched votes."))
 
-    changed_candidates = []
+    race = result_form.double_entry_diff.race(race_type)
+    candidates = {str(pk): entries.candidate
+                  for pk, entries in race.entries.items()}
+    results = []
 
     for field in candidate_fields:
-        candidate_pk = field.replace(prefix, '')
-        candidate = Candidate.objects.get(pk=candidate_pk)
-        votes = post_data[field]
-        save_result(candidate, result_form, EntryVersion.FINAL, votes, user)
-        changed_candidates.append(candidate)
+        candidate = candidates.get(field.replace(prefix, ''))
+
+        if candidate is None:
+            raise ValidationError(
+                _(u"Please select correct results for all mis-matched "
+                  u"votes."))
+
+        results.append(final_result(candidate, result_form,
+                                    post_data[field], user))
+
+    changed_candidates = {result.candidate_id for result in results}
 
-    results_v2 = results.filter(result_form=result_form,
-                                entry_version=EntryVersion.DATA_ENTRY_2)
+    for result in race.results_v2:
+        if result.candidate_id not in changed_candidates:
+            results.append(final_result(result.candidate, result_form,
+                                        result.votes, user))
 
-    for result in results_v2:
-        if result.candidate not in changed_candidates:
-            save_result(result.candidate, result_form, EntryVersion.FINAL,
-                        result.votes, user)
+    Result.bulk_create_versioned(results)
+    result_form.invalidate_cache()
 
 
 def save_final_results(result_form, user):
@@ -143,11 +95,13 @@ def save_final_results(result_form, user):
     """
     results = Result.objects.filter(
         result_form=result_form,
-        entry_version=EntryVersion.DATA_ENTRY_2, active=True)
+        entry_version=EntryVersion.DATA_ENTRY_2,
+        active=True).select_related('candidate')
 
-    for result in results:
-        save_result(result.candidate, result_form, EntryVersion.FINAL,
-                    result.votes, user)
+    Result.bulk_create_versioned([
+        final_result(result.candidate, result_form, result.votes, user)
+        for result in results])
+    result_form.invalidate_cache()
 
 
 def save_component_results(result_form, post_data, user):
@@ -160,12 +114,12 @@ def save_general_results(result_form, post_data, user):
                                      RaceType.GENERAL, user)
 
 
-def save_result(candidate, result_form, entry_version, votes, user):
-    Result.objects.create(candidate=candidate,
-                          result_form=result_form,
-                          entry_version=entry_version,
-                          votes=votes,
-                          user=user.userprofile)
+def final_result(candidate, result_form, votes, user):
+    return Result(candidate=candidate,
+                  result_form=result_form,
+                  entry_version=EntryVersion.FINAL,
+                  votes=votes,
+                  user=user.userprofile)
 
 
 def save_women_results(result_form, post_data, user):
@@ -1,24 +1,63 @@
 from collections import defaultdict, OrderedDict
 import csv
 import os
+import re
 from tempfile import NamedTemporaryFile
 
+from django.conf import settings
 from django.core.files.base import File
 from django.core.files.storage import default_storage
-from django.http import HttpResponse
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    StreamingHttpResponse,
+)
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.utils.translation import ugettext as _
 
-from tally_ho.apps.tally.models.ballot import Ballot
+from tally_ho.apps.tally.models.ballot import (
+    Ballot,
+    form_ballot_numbers,
+    race_type_name,
+    sub_constituency,
+)
+from tally_ho.apps.tally.models.candidate import Candidate
+from tally_ho.apps.tally.models.export_fragment import ExportFragment
+from tally_ho.apps.tally.models.reconciliation_form import\
+    ReconciliationForm
+from tally_ho.apps.tally.models.result import Result
+from tally_ho.apps.tally.models.result_export import ResultExport
 from tally_ho.apps.tally.models.result_form import ResultForm
+from tally_ho.apps.tally.models.sub_constituency import SubConstituency
+from tally_ho.libs.models.enums.entry_version import EntryVersion
 from tally_ho.libs.models.enums.form_state import FormState
+from tally_ho.libs.reports.duplicates import duplicate_votes
+from tally_ho.libs.reports.votes import candidate_votes, NO_VOTES
+from tally_ho.libs.utils.collections import flatten
 
 
+ALL_CANDIDATES_EXPORT = 'all-candidates'
+ACTIVE_CANDIDATES_EXPORT = 'active-candidates'
+RESULTS_EXPORT = 'formresults'
+REPORT_EXPORTS = {
+    'formresults': RESULTS_EXPORT,
+    'all-candidates': ALL_CANDIDATES_EXPORT,
+    'active-candidates': ACTIVE_CANDIDATES_EXPORT,
+    'duplicates': RESULTS_EXPORT,
+}
+
 OUTPUT_PATH = 'results/all_candidate_votes_%s.csv'
 ACTIVE_OUTPUT_PATH = 'results/active_candidate_votes_%s.csv'
 RESULTS_PATH = 'results/form_results_%s.csv'
 DUPLICATE_RESULTS_PATH = 'results/duplicate_results_%s.csv'
 SPECIAL_BALLOTS = None
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
 
 
 def path_with_timestamp(path):
@@ -34,10 +73,10 @@ def path_with_timestamp(path):
 
 def save_csv_file_and_symlink(csv_file, path):
     new_path = path_with_timestamp(path)
-    default_storage.save(new_path, File(open(csv_file.name)))
-    new_path = os.path.realpath(new_path)
+    new_path = default_storage.save(new_path, File(open(csv_file.name)))
+    new_path = default_storage.path(new_path)
 
-    if os.path.exists(os.path.abspath(path)):
+    if os.path.lexists(os.path.abspath(path)):
         os.unlink(os.path.abspath(path))
 
     os.symlink(new_path, path)
@@ -46,13 +85,12 @@ def save_csv_file_and_symlink(csv_file, path):
 
 
 def write_utf8(w, output):
-    """Encode strings in the dict output as utf8 and write to w.
+    """Write the dict output to w, which must wrap a utf8 encoded file.
 
     :param w: A stream to write a row to.
-    :param output: A dict to encode as utf8.
+    :param output: A dict to write.
     """
-    w.writerow({k: v.encode('utf8') if isinstance(v, str) else v
-                for k, v in output.items()})
+    w.writerow(output)
 
 
 def valid_ballots(tally_id=None):
@@ -77,27 +115,133 @@ def distinct_forms(ballot, tally_id):
     return forms
 
 
-def build_result_and_recon_output(result_form):
+def start_result_export(tally_id, name, incremental=False):
+    """Lock the state of a result export for the duration of a transaction.
+
+    Export runs for the same tally and export are serialized by the lock.  The
+    start of this run becomes the new watermark once it is finished, see
+    `ResultExport.since` for the changes the next run exports.
+
+    :param tally_id: The tally being exported.
+    :param name: The name of the export.
+    :param incremental: Return the watermark of the last run, default False.
+
+    :returns: A tuple of the locked `ResultExport` and the time after which
+        changes must be exported, or None if everything must be exported.
+    """
+    ResultExport.objects.get_or_create(tally_id=tally_id, name=name)
+    result_export = ResultExport.objects.select_for_update().get(
+        tally__id=tally_id, name=name)
+    since = result_export.since if incremental else None
+    result_export.watermark = result_export.checked_date = timezone.now()
+
+    return result_export, since
+
+
+def finish_result_export(result_export):
+    """Save the watermark of a completed export run.
+
+    :param result_export: The `ResultExport` returned by
+        `start_result_export`.
+    """
+    result_export.save()
+
+
+def save_fragments(result_export, keys_to_rows):
+    """Replace the stored fragments of an export.
+
+    :param result_export: The export to save fragments for.
+    :param keys_to_rows: A dict mapping fragment keys to lists of rows.
+    """
+    result_export.fragments.filter(key__in=keys_to_rows.keys()).delete()
+    ExportFragment.objects.bulk_create([
+        ExportFragment(result_export=result_export, key=key, rows=rows)
+        for key, rows in keys_to_rows.items()])
+
+
+def export_changes(tally_id, since):
+    """Find the result forms and ballots whose export rows changed.
+
+    The rows of a result form change with the form, its results, its
+    reconciliation forms, its station and the candidates of its ballot and
+    component ballot.  The row of a ballot changes with its candidates and
+    the result forms used to count its stations and votes.
+
+    Deleted rows are not found, deleting exported data must be followed by
+    `ResultExport.reset`.  Result forms that are no longer complete are
+    removed by `save_barcode_results`.
+
+    :param tally_id: The tally to find changes in.
+    :param since: Find changes made after this time.
+
+    :returns: A tuple of the set of result form ids and the set of ballot ids
+        whose rows must be rebuilt.
+    """
+    forms = ResultForm.objects.filter(tally__id=tally_id)
+    form_ids = set(forms.filter(Q(modified_date__gt=since) | Q(
+        station__modified_date__gt=since)).values_list('id', flat=True))
+    form_ids |= set(Result.objects.filter(
+        result_form__tally__id=tally_id,
+        modified_date__gt=since).values_list('result_form', flat=True))
+    form_ids |= set(ReconciliationForm.objects.filter(
+        result_form__tally__id=tally_id,
+        modified_date__gt=since).values_list('result_form', flat=True))
+
+    ballots = valid_ballots(tally_id)
+    components = dict(SubConstituency.objects.filter(
+        ballot_general__in=ballots,
+        ballot_component__isnull=False).values_list(
+        'ballot_general', 'ballot_component'))
+    candidate_ballot_ids = set(Candidate.objects.filter(
+        ballot__in=ballots,
+        modified_date__gt=since).values_list('ballot', flat=True))
+    candidate_ballot_ids |= {
+        general for general, component in components.items()
+        if component in candidate_ballot_ids}
+
+    form_ids |= set(forms.filter(
+        ballot__in=candidate_ballot_ids).values_list('id', flat=True))
+
+    form_ballot_ids = set(forms.filter(id__in=form_ids).values_list(
+        'ballot', flat=True))
+    form_ballot_ids |= {components[ballot_id] for ballot_id in form_ballot_ids
+                        if ballot_id in components}
+    form_ballot_numbers_changed = set(Ballot.objects.filter(
+        id__in=form_ballot_ids).values_list('number', flat=True))
+
+    ballot_ids = candidate_ballot_ids | form_ballot_ids | {
+        ballot.id for ballot in ballots if set(
+            ballot.form_ballot_numbers) & form_ballot_numbers_changed}
+
+    return form_ids, ballot_ids
+
+
+def build_result_and_recon_output(result_form, station, recon,
+                                  sub_constituency, race_type):
     """Build dict of data from a result form and add reconciliation information
     if it has a reconciliation form.
 
     :param result_form: The result form to build data for.
+    :param station: The station of the result form.
+    :param recon: The final reconciliation form of the result form or None.
+    :param sub_constituency: The sub constituency of the result form ballot.
+    :param race_type: The race type name of the result form ballot.
 
     :returns: A dict of information about this result form.
     """
+    gender = station.gender if station else result_form.gender
+
     output = {
         'ballot': result_form.ballot.number,
         'center': result_form.center.code,
         'station': result_form.station_number,
-        'gender': result_form.gender_name,
+        'gender': _(gender.name),
         'barcode': result_form.barcode,
-        'race type': result_form.ballot_race_type_name,
-        'voting district': result_form.ballot.sub_constituency.code,
-        'number registrants': result_form.station.registrants
+        'race type': race_type,
+        'voting district': sub_constituency.code,
+        'number registrants': station.registrants
     }
 
-    recon = result_form.reconciliationform
-
     if recon:
         output.update({
             'invalid ballots': recon.number_invalid_votes,
@@ -113,139 +257,227 @@ def build_result_and_recon_output(result_form):
     return output
 
 
+def result_form_rows(result_forms):
+    """Build the rows, one per candidate, for a batch of result forms.
+
+    The forms with their stations, the sub constituencies and candidates of
+    their ballots, their final results and their final reconciliation forms
+    are each loaded in a single query and the rows are assembled in memory.
+
+    :param result_forms: A queryset of result forms to build rows for.
+
+    :returns: A dict mapping barcodes to lists of dicts.
+    """
+    result_forms = list(result_forms.select_related(
+        'ballot', 'center', 'station'))
+    form_ids = [result_form.id for result_form in result_forms]
+    ballot_ids = {result_form.ballot_id for result_form in result_forms}
+
+    sc_general, sc_women, sc_component = {}, {}, {}
+
+    for sc in SubConstituency.objects.filter(
+            Q(ballot_general__in=ballot_ids) |
+            Q(ballot_women__in=ballot_ids) |
+            Q(ballot_component__in=ballot_ids)).select_related(
+            'ballot_component').order_by('id'):
+        sc_general.setdefault(sc.ballot_general_id, sc)
+        sc_women.setdefault(sc.ballot_women_id, sc)
+        sc_component.setdefault(sc.ballot_component_id, sc)
+
+    component_ids = {sc.ballot_component_id for sc in sc_general.values()
+                     if sc.ballot_component_id}
+    ballots_to_candidates = defaultdict(list)
+
+    for candidate in Candidate.objects.filter(
+            ballot__in=ballot_ids | component_ids).select_related(
+            'ballot').order_by('race_type', 'order', 'id'):
+        ballots_to_candidates[candidate.ballot_id].append(candidate)
+
+    votes = dict(((result_form, candidate), votes) for
+                 result_form, candidate, votes in Result.objects.filter(
+                     result_form__in=form_ids,
+                     result_form__form_state=FormState.ARCHIVED,
+                     entry_version=EntryVersion.FINAL,
+                     active=True).values_list(
+                     'result_form', 'candidate').annotate(
+                     Sum('votes')).order_by())
+
+    recons = {}
+
+    for recon in ReconciliationForm.objects.filter(
+            result_form__in=form_ids,
+            entry_version=EntryVersion.FINAL,
+            active=True).order_by('id'):
+        recons.setdefault(recon.result_form_id, recon)
+
+    barcodes_to_rows = {}
+
+    for result_form in result_forms:
+        ballot_id = result_form.ballot_id
+        general = sc_general.get(ballot_id)
+        candidates = ballots_to_candidates[ballot_id]
+
+        if general and general.ballot_component_id:
+            candidates = candidates + sorted(
+                ballots_to_candidates[general.ballot_component_id],
+                key=lambda candidate: candidate.order)
+
+        output = build_result_and_recon_output(
+            result_form,
+            result_form.station,
+            recons.get(result_form.id),
+            sub_constituency(general, sc_women.get(ballot_id),
+                             sc_component.get(ballot_id)),
+            race_type_name(result_form.ballot.race_type, general))
+
+        rows = []
+
+        for candidate in candidates:
+            output['order'] = candidate.order
+            output['name'] = candidate.full_name
+            output['votes'] = votes.get((result_form.id, candidate.id), 0)
+            output['race number'] = candidate.ballot.number
+            if candidate.active:
+                output['candidate status'] = 'enabled'
+            else:
+                output['candidate status'] = 'disabled'
+
+            rows.append(dict(output))
+
+        barcodes_to_rows[result_form.barcode] = rows
+
+    return barcodes_to_rows
+
+
 def save_barcode_results(complete_barcodes, output_duplicates=False,
-                         output_to_file=True, tally_id=None):
+                         output_to_file=True, tally_id=None,
+                         incremental=False):
     """Save a list of results for all candidates in all result forms.
 
     :param complete_barcodes: The set of barcodes for result forms.
     :param output_duplicates: Generate list of duplicates after, default False.
     :param output_to_file: Output results as file, default True.
+    :param incremental: Only rebuild the rows for result forms that changed
+        since the last export, default False.
 
     :returns: The name of the temporary file that results were saved to.
     """
-    center_to_votes = defaultdict(list)
-    center_to_forms = defaultdict(list)
-    ballots_to_candidates = {}
-
-    for ballot in valid_ballots(tally_id):
-        ballots_to_candidates[ballot.number] = \
-            ballot.candidates.all().order_by('order')
-
-    csv_file = NamedTemporaryFile(delete=False, suffix='.csv')
-
-    with csv_file as f:
-        header = [
-            'ballot',
-            'race number',
-            'center',
-            'station',
-            'gender',
-            'barcode',
-            'race type',
-            'voting district',
-            'order',
-            'name', 'votes',
-            'invalid ballots',
-            'unstamped ballots',
-            'cancelled ballots',
-            'spoilt ballots',
-            'unused ballots',
-            'number of signatures',
-            'received ballots papers',
-            'valid votes',
-            'number registrants',
-            'candidate status',
-        ]
-
-        w = csv.DictWriter(f, header)
-        w.writeheader()
-
-        result_forms = ResultForm.objects.select_related().filter(
-            barcode__in=complete_barcodes, tally__id=tally_id)
-
-        for result_form in result_forms:
-            # build list of votes for this barcode
-            vote_list = ()
-            output = build_result_and_recon_output(result_form)
-
-            for candidate in result_form.candidates:
-                votes = candidate.num_votes(result_form)
-                vote_list += (votes,)
-
-                output['order'] = candidate.order
-                output['name'] = candidate.full_name
-                output['votes'] = votes
-                output['race number'] = candidate.ballot.number
-                if candidate.active:
-                    output['candidate status'] = 'enabled'
-                else:
-                    output['candidate status'] = 'disabled'
-
-                write_utf8(w, output)
-
-            # store votes for this forms center
-            center = result_form.center
-            center_to_votes[center.code].append(vote_list)
-            center_to_forms[center.code].append(result_form)
+    forms_and_votes = []
+    complete_barcodes = set(complete_barcodes)
+
+    with transaction.atomic():
+        result_export, since = start_result_export(
+            tally_id, RESULTS_EXPORT, incremental)
+        fragments = result_export.fragments
+
+        fragments.exclude(key__in=complete_barcodes).delete()
+        stored_barcodes = set(fragments.values_list('key', flat=True))
+        barcodes = complete_barcodes - stored_barcodes
+
+        if since:
+            form_ids, _ballot_ids = export_changes(tally_id, since)
+            barcodes |= set(ResultForm.objects.filter(
+                id__in=form_ids,
+                barcode__in=complete_barcodes).values_list(
+                'barcode', flat=True))
+        else:
+            barcodes = complete_barcodes
+
+        barcodes = sorted(barcodes)
+
+        for i in range(0, len(barcodes), EXPORT_BATCH_SIZE):
+            save_fragments(result_export, result_form_rows(
+                ResultForm.objects.filter(
+                    barcode__in=barcodes[i:i + EXPORT_BATCH_SIZE],
+                    tally__id=tally_id)))
+
+        csv_file = NamedTemporaryFile(
+            mode='w', encoding='utf-8', delete=False, suffix='.csv')
+
+        with csv_file as f:
+            header = [
+                'ballot',
+                'race number',
+                'center',
+                'station',
+                'gender',
+                'barcode',
+                'race type',
+                'voting district',
+                'order',
+                'name', 'votes',
+                'invalid ballots',
+                'unstamped ballots',
+                'cancelled ballots',
+                'spoilt ballots',
+                'unused ballots',
+                'number of signatures',
+                'received ballots papers',
+                'valid votes',
+                'number registrants',
+                'candidate status',
+            ]
+
+            w = csv.DictWriter(f, header)
+            w.writeheader()
+
+            for rows in fragments.order_by('key').values_list(
+                    'rows', flat=True).iterator():
+                for output in rows:
+                    write_utf8(w, output)
+
+                if rows:
+                    # store votes for this forms center
+                    form = rows[0]
+                    forms_and_votes.append((form['center'], {
+                        'ballot': form['ballot'],
+                        'barcode': form['barcode'],
+                        'state': FormState.ARCHIVED.label,
+                        'station': form['station'],
+                    }, tuple(output['votes'] for output in rows)))
+
+        finish_result_export(result_export)
 
     if output_to_file:
         save_csv_file_and_symlink(csv_file, RESULTS_PATH % tally_id)
 
     if output_duplicates:
-        return save_center_duplicates(center_to_votes,
-                                      center_to_forms,
+        return save_center_duplicates(forms_and_votes,
                                       output_to_file=output_to_file,
                                       tally_id=tally_id)
     return csv_file.name
 
 
-def save_center_duplicates(center_to_votes, center_to_forms,
+def save_center_duplicates(forms_and_votes,
                            output_to_file=True,
                            tally_id=None):
     """Output list of forms with duplicates votes in the same center.
 
-    :param center_to_votes: A dict mapping centers to a list of votes for that
-        center.
-    :param center_to_forms: A dict mapping centers to the result forms for that
-        center
+    :param forms_and_votes: A list of (center, form, votes) tuples, where form
+        is a dict with the ballot, barcode, state and station of the result
+        form and votes is a tuple of its votes per candidate.
     :param output_to_file: Output results to a file, default True.
 
     :returns: The name of the temporary file that results have been output to.
     """
     print('[INFO] Exporting vote duplicate records')
 
-    csv_file = NamedTemporaryFile(delete=False, suffix='.csv')
+    csv_file = NamedTemporaryFile(
+        mode='w', encoding='utf-8', delete=False, suffix='.csv')
 
     with csv_file as f:
         header = ['ballot', 'center', 'barcode', 'state', 'station', 'votes']
         w = csv.DictWriter(f, header)
         w.writeheader()
 
-        for code, vote_lists in center_to_votes.items():
-            votes_cast = sum([sum(l) for l in vote_lists]) > 0
-            num_vote_lists = len(vote_lists)
-            num_distinct_vote_lists = len(set(vote_lists))
-
-            if votes_cast and num_distinct_vote_lists < num_vote_lists:
-                print('[WARNING] Matching votes for center %s, %s vote lists'
-                      % (code, num_vote_lists))
+        for code, form, vote_list in duplicate_votes(forms_and_votes):
+            output = dict(form)
+            output.update({
+                'center': code,
+                'votes': vote_list
+            })
 
-                for i, form in enumerate(center_to_forms[code]):
-                    vote_list = vote_lists[i]
-                    votes_cast = sum(vote_list) > 0
-                    other_vote_lists = vote_lists[:i] + vote_lists[i + 1:]
-
-                    if votes_cast and vote_list in other_vote_lists:
-                        output = {
-                            'ballot': form.ballot.number,
-                            'center': code,
-                            'barcode': form.barcode,
-                            'state': form.form_state_name,
-                            'station': form.station_number,
-                            'votes': vote_list
-                        }
-
-                        write_utf8(w, output)
+            write_utf8(w, output)
 
     if output_to_file:
         return save_csv_file_and_symlink(csv_file,
@@ -254,16 +486,102 @@ def save_center_duplicates(center_to_votes, center_to_forms,
     return csv_file.name
 
 
+def ballot_votes_row(ballot, tally_id, tally_votes, show_disabled_candidates):
+    """Build the row of stations and candidate votes for a ballot.
+
+    :param ballot: The ballot to build the row for.
+    :param tally_votes: A dict mapping candidate ids to `CandidateVotes`.
+    :param show_disabled_candidates: Include disabled candidates.
+
+    :returns: An OrderedDict of information about this ballot.
+    """
+    forms = distinct_forms(ballot, tally_id)
+    final_forms = ResultForm.forms_in_state(
+        FormState.ARCHIVED, pks=[r.pk for r in forms])
+
+    num_stations = forms.count()
+    num_stations_completed = final_forms.count()
+
+    percent_complete = round(
+        100 * num_stations_completed / num_stations, 3) if \
+        num_stations else 0
+
+    output = OrderedDict({
+        'ballot number': ballot.number,
+        'stations': num_stations,
+        'stations completed': num_stations_completed,
+        'stations percent completed': percent_complete})
+
+    candidates_to_votes = {}
+    num_results_ary = []
+
+    candidates = ballot.candidates.all()
+    if not show_disabled_candidates:
+        candidates = candidates.filter(active=True)
+
+    for candidate in candidates:
+        votes = tally_votes.get(candidate.pk, NO_VOTES)
+        candidates_to_votes[candidate.full_name] = [
+            votes.votes, votes.all_votes]
+        num_results_ary.append(votes.num_results)
+
+    assert len(set(num_results_ary)) <= 1
+
+    for num_results in num_results_ary:
+        if num_stations_completed != num_results:
+            print('[WARNING] Number stations complete (%s) not '
+                  'equal to num_results (%s) for ballot %s' % (
+                      num_stations_completed, num_results, ballot.number))
+            output['stations completed'] = num_results
+
+    candidates_to_votes = OrderedDict((sorted(
+        candidates_to_votes.items(), key=lambda t: t[1][0],
+        reverse=True)))
+
+    # Checks changes in candidates positions
+    check_position_changes(candidates_to_votes)
+
+    for i, item in enumerate(candidates_to_votes.items()):
+        candidate, votes = item
+
+        output['candidate %s name' % (i + 1)] = candidate
+        output['candidate %s votes' % (i + 1)] = votes[0]
+        output['candidate %s votes included quarantine' %
+               (i + 1)] = votes[1]
+
+    return output
+
+
+def complete_result_forms(tally_id):
+    """Return the distinct archived result forms for a tally.
+
+    :param tally_id: The tally to return result forms for.
+
+    :returns: A queryset of result forms.
+    """
+    final_forms = ResultForm.forms_in_state(
+        FormState.ARCHIVED, tally_id=tally_id)
+
+    if SPECIAL_BALLOTS:
+        final_forms = final_forms.filter(ballot__number__in=flatten(
+            [form_ballot_numbers(number) for number in SPECIAL_BALLOTS]))
+
+    return final_forms
+
+
 def export_candidate_votes(save_barcodes=False,
                            output_duplicates=True,
                            output_to_file=True,
                            show_disabled_candidates=True,
-                           tally_id=None):
+                           tally_id=None,
+                           incremental=False):
     """Export a spreadsheet of the candidates their votes for each race.
 
     :param save_barcodes: Generate barcode result file, default False.
     :param output_duplicates: Generate duplicates file, default True.
     :param output_to_file: Output to file, default True.
+    :param incremental: Only rebuild the rows for ballots and result forms
+        that changed since the last export, default False.
 
     :returns: The name of the temporary file that results have been output to.
     """
@@ -288,76 +606,48 @@ def export_candidate_votes(save_barcodes=False,
         header.append('candidate %s votes' % i)
         header.append('candidate %s votes included quarantine' % i)
 
-    complete_barcodes = []
-
-    csv_file = NamedTemporaryFile(delete=False, suffix='.csv')
-
-    with csv_file as f:
-        w = csv.DictWriter(f, header)
-        w.writeheader()
-
-        for ballot in valid_ballots():
-            general_ballot = ballot
-            forms = distinct_forms(ballot, tally_id)
-            final_forms = ResultForm.forms_in_state(
-                FormState.ARCHIVED, pks=[r.pk for r in forms])
-
-            if not SPECIAL_BALLOTS or ballot.number in SPECIAL_BALLOTS:
-                complete_barcodes.extend([r.barcode for r in final_forms])
-
-            num_stations = forms.count()
-            num_stations_completed = final_forms.count()
-
-            percent_complete = round(
-                100 * num_stations_completed / num_stations, 3) if \
-                num_stations else 0
-
-            output = OrderedDict({
-                'ballot number': ballot.number,
-                'stations': num_stations,
-                'stations completed': num_stations_completed,
-                'stations percent completed': percent_complete})
-
-            candidates_to_votes = {}
-            num_results_ary = []
-
-            candidates = ballot.candidates.all()
-            if not show_disabled_candidates:
-                candidates = candidates.filter(active=True)
-
-            for candidate in candidates:
-                num_results, votes = candidate.num_votes()
-                all_votes = candidate.num_all_votes
-                candidates_to_votes[candidate.full_name] = [votes, all_votes]
-                num_results_ary.append(num_results)
+    name = ALL_CANDIDATES_EXPORT if show_disabled_candidates else\
+        ACTIVE_CANDIDATES_EXPORT
+
+    with transaction.atomic():
+        result_export, since = start_result_export(
+            tally_id, name, incremental)
+        fragments = result_export.fragments
+        ballots = list(valid_ballots(tally_id))
+        stored_keys = set(fragments.values_list('key', flat=True))
+
+        if since:
+            _form_ids, ballot_ids = export_changes(tally_id, since)
+            ballots_to_build = [
+                ballot for ballot in ballots
+                if ballot.id in ballot_ids or
+                str(ballot.number) not in stored_keys]
+        else:
+            ballots_to_build = ballots
 
-            assert len(set(num_results_ary)) <= 1
+        tally_votes = candidate_votes(Result.objects.filter(
+            result_form__tally__id=tally_id,
+            candidate__ballot__in=ballots_to_build))
 
-            for num_results in num_results_ary:
-                if num_stations_completed != num_results:
-                    print('[WARNING] Number stations complete (%s) not '
-                          'equal to num_results (%s) for ballot %s (general'
-                          ' ballot %s)' % (
-                              num_stations_completed, num_results,
-                              ballot.number, general_ballot.number))
-                    output['stations completed'] = num_results
+        save_fragments(result_export, {
+            str(ballot.number): [ballot_votes_row(
+                ballot, tally_id, tally_votes, show_disabled_candidates)]
+            for ballot in ballots_to_build})
 
-            candidates_to_votes = OrderedDict((sorted(
-                candidates_to_votes.items(), key=lambda t: t[1][0],
-                reverse=True)))
+        rows = dict(fragments.values_list('key', 'rows'))
 
-            # Checks changes in candidates positions
-            check_position_changes(candidates_to_votes)
+        csv_file = NamedTemporaryFile(
+            mode='w', encoding='utf-8', delete=False, suffix='.csv')
 
-            for i, item in enumerate(candidates_to_votes.items()):
-                candidate, votes = item
+        with csv_file as f:
+            w = csv.DictWriter(f, header, extrasaction='ignore')
+            w.writeheader()
 
-                output['candidate %s name' % (i + 1)] = candidate
-                output['candidate %s votes' % (i + 1)] = votes[0]
-                output['candidate %s votes included quarantine' %
-                       (i + 1)] = votes[1]
+            for ballot in ballots:
+                for output in rows.get(str(ballot.number), []):
+                    write_utf8(w, output)
 
-            write_utf8(w, output)
+        finish_result_export(result_export)
 
     if output_to_file:
         if show_disabled_candidates:
@@ -366,10 +656,14 @@ def export_candidate_votes(save_barcodes=False,
             save_csv_file_and_symlink(csv_file, ACTIVE_OUTPUT_PATH % tally_id)
 
     if save_barcodes:
+        complete_barcodes = complete_result_forms(tally_id).values_list(
+            'barcode', flat=True)
+
         return save_barcode_results(complete_barcodes,
                                     output_duplicates=output_duplicates,
                                     output_to_file=output_to_file,
-                                    tally_id=tally_id)
+                                    tally_id=tally_id,
+                                    incremental=incremental)
     return csv_file.name
 
 
@@ -384,8 +678,8 @@ def check_position_changes(candidates_votes):
                         reverse=True)))
 
     # Get first five candidates
-    valid_votes = dict(enumerate(sort_valid_votes.keys()[0:5]))
-    all_votes = dict(enumerate(sort_all_votes.keys()[0:5]))
+    valid_votes = dict(enumerate(list(sort_valid_votes.keys())[0:5]))
+    all_votes = dict(enumerate(list(sort_all_votes.keys())[0:5]))
 
     # If they are not de same, warn the super-admin
     if valid_votes != all_votes:
@@ -393,15 +687,171 @@ def check_position_changes(candidates_votes):
         pass
 
 
-def get_result_export_response(report, tally_id):
+def export_is_stale(tally_id, name):
+    """Return True if an export has not been run or the data it is built
+    from has changed since it was last run.
+
+    An export found up to date is not checked again for
+    RESULT_EXPORT_CHECK_SECONDS.
+
+    :param tally_id: The tally of the export.
+    :param name: The name of the export.
+    """
+    result_export = ResultExport.objects.filter(
+        tally__id=tally_id, name=name).first()
+
+    if not result_export or not result_export.since:
+        return True
+
+    if result_export.recently_checked:
+        return False
+
+    checked_date = timezone.now()
+    form_ids, ballot_ids = export_changes(tally_id, result_export.since)
+
+    if form_ids or ballot_ids:
+        return True
+
+    ResultExport.objects.filter(pk=result_export.pk).update(
+        checked_date=checked_date)
+
+    return False
+
+
+def parse_range(range_header, size):
+    """Parse a single byte range from an HTTP Range header.
+
+    Multiple ranges are not supported and are treated as if no range was
+    requested.
+
+    :param range_header: The value of the Range header.
+    :param size: The size of the file the range applies to.
+
+    :raises: `ValueError` if the range can not be satisfied.
+
+    :returns: A tuple of the first and last byte positions, or None if the
+        whole file should be returned.
+    """
+    match = RANGE_RE.match(range_header or '')
+
+    if not match:
+        return None
+
+    start, end = match.groups()
+
+    if start:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    elif end:
+        start = max(size - int(end), 0)
+        end = size - 1
+    else:
+        return None
+
+    if start > end or start >= size:
+        raise ValueError(range_header)
+
+    return start, end
+
+
+def file_range_iterator(path, start, end, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the bytes from start to end, inclusive, of the file at path.
+
+    :param path: The path of the file to read.
+    :param start: The first byte position to yield.
+    :param end: The last byte position to yield.
+    :param chunk_size: The maximum number of bytes to yield at once.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+
+            if not data:
+                break
+
+            remaining -= len(data)
+
+            yield data
+
+
+def export_file_response(request, path):
+    """Return a response that streams the file at path.
+
+    The response supports conditional requests using an ETag and the last
+    modified time of the file, so repeated polls of an unchanged export only
+    return the headers.  If `EXPORT_ACCEL_REDIRECT_PREFIX` is set and the file
+    is under `MEDIA_ROOT`, sending the file is offloaded to nginx with an
+    X-Accel-Redirect header.  Otherwise the file is streamed in chunks,
+    honouring a single byte range if one is requested.
+
+    :param request: The request to respond to.
+    :param path: The path of the file to send.
+
+    :returns: An HTTP response.
+    """
+    stat = os.stat(path)
+    last_modified = int(stat.st_mtime)
+    etag = '"%x-%x"' % (last_modified, stat.st_size)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+
+    if response is None:
+        accel_prefix = settings.EXPORT_ACCEL_REDIRECT_PREFIX
+        media_root = os.path.realpath(settings.MEDIA_ROOT)
+        real_path = os.path.realpath(path)
+
+        if accel_prefix and real_path.startswith(media_root + os.sep):
+            response = HttpResponse()
+            response['X-Accel-Redirect'] = accel_prefix + os.path.relpath(
+                real_path, media_root)
+        else:
+            try:
+                byte_range = parse_range(
+                    request.META.get('HTTP_RANGE'), stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = 'bytes */%d' % stat.st_size
+
+                return response
+
+            if byte_range:
+                start, end = byte_range
+                response = StreamingHttpResponse(
+                    file_range_iterator(path, start, end), status=206)
+                response['Content-Range'] = 'bytes %d-%d/%d' % (
+                    start, end, stat.st_size)
+                response['Content-Length'] = end - start + 1
+            else:
+                response = FileResponse(open(path, 'rb'))
+                response.block_size = EXPORT_CHUNK_SIZE
+                response['Content-Length'] = stat.st_size
+
+            response['Accept-Ranges'] = 'bytes'
+
+        response['Content-Disposition'] =\
+            'attachment; filename=%s' % os.path.basename(path)
+        response['Content-Type'] = 'text/csv; charset=utf-8'
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+
+    return response
+
+
+def get_result_export_response(report, tally_id, request):
     """Choose the appropriate file to returns as an HTTP Response.
 
     :param report: The type of report to return.
+    :param request: The request for the report, used to answer conditional
+        and range requests.
 
     :returns: An HTTP response.
     """
     filename = 'not_found.csv'
-    path = None
     show_disabled = True
 
     if report == 'formresults':
@@ -417,30 +867,21 @@ def get_result_export_response(report, tally_id):
         filename = os.path.join('results',
                                 'duplicate_results_%d.csv' % tally_id)
 
-    response = HttpResponse(content_type='text/csv')
-
     try:
-        # FIXME: if file it's been already generated,
-        # does not generate new one. correct??
-        if not os.path.exists(filename):
+        if not os.path.exists(filename) or\
+                export_is_stale(tally_id, REPORT_EXPORTS.get(report)):
             export_candidate_votes(save_barcodes=True,
                                    output_duplicates=True,
                                    show_disabled_candidates=show_disabled,
-                                   tally_id=tally_id)
+                                   tally_id=tally_id,
+                                   incremental=True)
 
         path = os.readlink(filename)
-        filename = os.path.basename(path)
-        response['Content-Disposition'] = 'attachment; filename=%s' % filename
-        response['Content-Type'] = 'text/csv; charset=utf-8'
-
-        if path:
-            with open(path, 'rb') as f:
-                response.write(f.read())
-        else:
-            raise Exception(_(u"File Not found!"))
 
+        return export_file_response(request, path)
     except Exception:
+        response = HttpResponse(content_type='text/csv')
         response.write(_(u"Report not found."))
         response.status_code = 404
 
-    return response
+        return response
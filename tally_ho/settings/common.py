@@ -147,6 +147,26 @@ LOGIN_REDIRECT_URL = '/'
 MIN_STATION_VALUE = 1
 MAX_STATION_VALUE = 102
 
+# URL prefix of an internal nginx location aliased to MEDIA_ROOT, result
+# exports are sent with X-Accel-Redirect when set.
+EXPORT_ACCEL_REDIRECT_PREFIX = None
+
+# In seconds, changes made this long before the start of the last run of an
+# incremental result export are exported again, so that transactions that
+# committed after the run started are not missed
+RESULT_EXPORT_OVERLAP_SECONDS = 300
+
+# In seconds, how long a result export found up to date is served without
+# checking for changes again
+RESULT_EXPORT_CHECK_SECONDS = 60
+
+# Load imported stations and result forms with COPY on PostgreSQL
+IMPORT_USE_COPY = True
+
+# In seconds, a running import job that has not saved a batch for this long
+# is claimed again by another `run_import_jobs` worker
+IMPORT_JOB_STALE_SECONDS = 60
+
 # Limit uploads to 10MB
 MAX_FILE_UPLOAD_SIZE = 10485760
 
@@ -157,6 +177,12 @@ CSRF_COOKIE_SECURE = False
 # In minutes
 IDLE_TIMEOUT = 60
 
+# In seconds, ballot metadata and quarantine checks are kept in the default
+# cache under versions stored in the database, so each process can use its
+# own cache
+BALLOT_METADATA_CACHE_TIMEOUT = 60 * 60
+QUARANTINE_CHECKS_CACHE_TIMEOUT = 60 * 60
+
 # Individual pageviews will be tracked
 TRACK_PAGEVIEWS = True
 
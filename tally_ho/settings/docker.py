@@ -12,3 +12,5 @@ DATABASES = {
 }
 
 SITE_NAME = '[DEMO] Tally Ho - HNEC RMS'
+
+EXPORT_ACCEL_REDIRECT_PREFIX = '/protected-media/'
@@ -14,6 +14,7 @@ from tally_ho.apps.tally.views.data import center_list_view, form_list_view,\
     candidate_list_view, race_list_view, user_list_view, tally_list_view
 from tally_ho.apps.tally.views.reports import offices
 from tally_ho.apps.tally.views.reports import races
+from tally_ho.apps.tally.views.reports import transitions
 
 admin.autodiscover()
 
@@ -357,6 +358,15 @@ urlpatterns = [
     re_path(r'^reports/internal/race/(?P<tally_id>(\d+))/$',
             races.RacesReportView.as_view(),
             name='reports-races'),
+    re_path(r'^reports/internal/throughput/(?P<tally_id>(\d+))/$',
+            transitions.ThroughputReportView.as_view(),
+            name='reports-throughput'),
+    re_path(r'^reports/internal/time-in-state/(?P<tally_id>(\d+))/$',
+            transitions.TimeInStateReportView.as_view(),
+            name='reports-time-in-state'),
+    re_path(r'^reports/internal/clerks/(?P<tally_id>(\d+))/$',
+            transitions.ClerkProductivityReportView.as_view(),
+            name='reports-clerks'),
 
     re_path(r'^tally-manager$',
             tally_manager.DashboardView.as_view(), name='tally-manager'),
@@ -384,14 +394,11 @@ urlpatterns = [
             name='tally-files-form'),
     re_path(r'^tally-manager/remove-tally/(?P<tally_id>(\d+))/$',
             tally_manager.TallyRemoveView.as_view(), name='remove-tally'),
-    re_path(r'^tally-manager/create-tally/batch-view/(?P<tally_id>.*)/'
-            r'(?P<subconst_file>.*)/(?P<subconst_file_lines>(\d+))/'
-            r'(?P<centers_file>.*)/(?P<centers_file_lines>(\d+))/'
-            r'(?P<stations_file>.*)/(?P<stations_file_lines>(\d+))/'
-            r'(?P<candidates_file>.*)/(?P<candidates_file_lines>(\d+))/'
-            r'(?P<ballots_order_file>.*)/(?P<ballots_order_file_lines>(\d+))/'
-            r'(?P<result_forms_file>.*)/(?P<result_forms_file_lines>(\d+))/$',
-            tally_manager.BatchView.as_view(), name='batch-view'),
+    re_path(r'^tally-manager/import-job/(?P<job_id>(\d+))/$',
+            tally_manager.ImportJobView.as_view(), name='import-job'),
+    re_path(r'^tally-manager/import-job-status/(?P<job_id>(\d+))/$',
+            tally_manager.ImportJobStatusView.as_view(),
+            name='import-job-status'),
     re_path(r'^tally-manager/data/tally-list$',
             tally_list_view.TallyListView.as_view(),
             name='tally-list'),